@@ -1,4 +1,5 @@
 import heapq
+from array import array
 
 def greedy_scheduler(tasks, num_workers):
     """
@@ -50,3 +51,160 @@ def dynamic_programming_scheduler(tasks, num_workers):
     # Une véritable implémentation de la programmation dynamique serait beaucoup plus complexe.
     return greedy_scheduler(tasks, num_workers)
 
+
+
+def _lpt_makespan(sorted_times, num_workers):
+    """
+    Calcule uniquement le makespan de l'algorithme glouton (LPT) sur des durées déjà triées
+    par ordre décroissant, sans construire les listes de tâches par travailleur.
+    """
+    if num_workers >= len(sorted_times):
+        return sorted_times[0] if sorted_times else 0
+
+    # Les num_workers premières tâches vont chacune sur un travailleur vide
+    worker_heap = sorted_times[:num_workers]
+    heapq.heapify(worker_heap)
+
+    for task_time in sorted_times[num_workers:]:
+        heapq.heapreplace(worker_heap, worker_heap[0] + task_time)
+
+    return max(worker_heap)
+
+
+def _lower_bound(total_time, longest_task, num_workers):
+    """Borne inférieure classique du makespan : max(plus longue tâche, ⌈total / m⌉)."""
+    return max(longest_task, -(-total_time // num_workers))
+
+
+def makespan_lower_bound(tasks, num_workers):
+    """
+    Borne inférieure du makespan optimal pour un ensemble de tâches.
+
+    :param tasks: Un dictionnaire de tâches {nom: temps de traitement}.
+    :param num_workers: Le nombre de travailleurs disponibles.
+    :return: max(plus longue tâche, ⌈somme des temps / num_workers⌉).
+    """
+    times = tasks.values()
+    return _lower_bound(sum(times), max(times, default=0), num_workers)
+
+
+def makespan_curve(tasks, max_workers):
+    """
+    Calcule la courbe makespan = f(m) de l'algorithme glouton pour m = 1..max_workers.
+
+    Les tâches ne sont triées qu'une seule fois pour toute la courbe, mais chaque m refait une passe
+    glouton complète sur le tas (O(n log m), sans construire les listes de tâches) : la courbe
+    n'est pas incrémentale, le glouton pour m + 1 ne se déduit pas de celui pour m. Seuls m = 1
+    (le total) et m ≥ nombre de tâches (la plus longue tâche) sont obtenus sans calcul.
+
+    :param tasks: Un dictionnaire de tâches {nom: temps de traitement}.
+    :param max_workers: Le nombre maximal de travailleurs à évaluer.
+    :return: Une liste de dictionnaires {'num_workers', 'makespan', 'lower_bound'}.
+    """
+    sorted_times = sorted(tasks.values(), reverse=True)
+    total_time = sum(sorted_times)
+    longest_task = sorted_times[0] if sorted_times else 0
+
+    curve = []
+    for num_workers in range(1, max_workers + 1):
+        if num_workers == 1:
+            makespan = total_time
+        elif num_workers >= len(sorted_times):
+            makespan = longest_task
+        else:
+            makespan = _lpt_makespan(sorted_times, num_workers)
+
+        curve.append({
+            'num_workers': num_workers,
+            'makespan': makespan,
+            'lower_bound': _lower_bound(total_time, longest_task, num_workers)
+        })
+
+    return curve
+
+
+def min_workers_for_makespan(tasks, target_makespan, max_workers=None):
+    """
+    Trouve le plus petit nombre de travailleurs pour lequel l'algorithme glouton respecte
+    un makespan cible.
+
+    Aucun nombre de travailleurs inférieur à la borne ⌈total / T⌉ ne peut convenir : la recherche
+    part de cette borne. Le makespan glouton n'étant pas monotone en m (un travailleur de plus
+    peut l'allonger), une dichotomie pourrait manquer le minimum ; les valeurs de m sont donc
+    parcourues une à une depuis la borne. Le glouton étant à moins de 4/3 de l'optimum, le
+    parcours s'arrête en pratique peu après la borne.
+
+    :param tasks: Un dictionnaire de tâches {nom: temps de traitement}.
+    :param target_makespan: Le makespan à ne pas dépasser.
+    :param max_workers: Le nombre maximal de travailleurs autorisés (par défaut, le nombre de tâches).
+    :return: Le nombre minimal de travailleurs (0 s'il n'y a aucune tâche),
+             ou None si la cible est inatteignable.
+    """
+    sorted_times = sorted(tasks.values(), reverse=True)
+    if not sorted_times:
+        # Rien à ordonnancer : aucun travailleur n'est nécessaire
+        return 0
+
+    # Aucune répartition ne peut descendre sous la plus longue tâche
+    if sorted_times[0] > target_makespan:
+        return None
+
+    total_time = sum(sorted_times)
+    if max_workers is None:
+        max_workers = len(sorted_times)
+
+    low = max(1, -(-total_time // target_makespan)) if target_makespan > 0 else 1
+    high = min(max_workers, len(sorted_times))
+
+    for num_workers in range(low, high + 1):
+        if _lpt_makespan(sorted_times, num_workers) <= target_makespan:
+            return num_workers
+
+    return None
+
+
+def greedy_scheduler_compact(times, num_workers):
+    """
+    Algorithme glouton (LPT) sur un tableau de durées, sans noms de tâches.
+
+    Produit exactement la même affectation que greedy_scheduler appliqué aux mêmes tâches
+    dans le même ordre, mais sous forme compacte : pour de très grosses instances,
+    on évite de construire un dictionnaire et des listes de tuples par travailleur.
+
+    :param times: Une séquence de temps de traitement (list ou array), indexée par tâche.
+    :param num_workers: Le nombre de travailleurs disponibles.
+    :return: Un tuple (affectation, debuts, charges, makespan) où affectation (array('l')) donne
+             le travailleur de chaque tâche, debuts (array('q')) sa date de début quand chaque
+             travailleur enchaîne ses tâches dans l'ordre glouton, et charges la liste des temps
+             par travailleur.
+    """
+    # Tri stable : à durée égale, les tâches gardent leur ordre d'arrivée (comme sorted(tasks.items()))
+    order = sorted(range(len(times)), key=times.__getitem__, reverse=True)
+
+    assignment = array('l', bytes(array('l').itemsize * len(times)))
+    starts = array('q', bytes(8 * len(times)))
+    loads = [0] * num_workers
+    worker_heap = [(0, i) for i in range(num_workers)]
+
+    for task_index in order:
+        current_time, worker_index = worker_heap[0]
+        new_time = current_time + times[task_index]
+        assignment[task_index] = worker_index
+        starts[task_index] = current_time
+        loads[worker_index] = new_time
+        heapq.heapreplace(worker_heap, (new_time, worker_index))
+
+    return assignment, starts, loads, max(loads, default=0)
+
+
+# Ordonnanceurs disponibles, par nom (utilisé par l'API et les outils de benchmark)
+SCHEDULERS = {
+    'greedy': greedy_scheduler,
+    'dp': dynamic_programming_scheduler
+}
+
+# Variantes compactes (tableau de durées -> affectation), mêmes noms que SCHEDULERS
+SCHEDULERS_COMPACTS = {
+    'greedy': greedy_scheduler_compact,
+    'dp': greedy_scheduler_compact
+}
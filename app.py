@@ -1,18 +1,122 @@
-from flask import Flask, render_template, request, jsonify
-from algorithms import greedy_scheduler, dynamic_programming_scheduler
+from flask import Flask, render_template, request, jsonify, Response, url_for, send_from_directory
+from contextlib import nullcontext
+import json
+import math
+import mimetypes
+import os
+import zlib
+from algorithms import (
+    greedy_scheduler,
+    makespan_curve, min_workers_for_makespan, SCHEDULERS, SCHEDULERS_COMPACTS
+)
+from ingestion import lire_taches, parser_taches, format_depuis_content_type, FORMATS as FORMATS_INGESTION
+import catalogue
+from catalogue import PLATS_CATALOGUE, estimer_makespans_stations
+from instance_loader import InstanceManager
+from pool_solveurs import PoolSature
+from memoire_partagee import ExecuteurPartage
+from solutions import MagasinSolutions, resoudre_avec_magasin
+from timeline import Timeline
+from lots import normaliser_scenarios, resoudre_paquet, soumettre_lot, flux_resultats
+from cache_http import CacheReponses, etag_contenu, horodatage, non_modifie, reponse_conditionnelle
+from construire_statiques import charger_manifeste, DOSSIER_SORTIE as DOSSIER_STATIQUES
+from reponses import Colonnes, negocier_mode, reponse_ordonnancement
+from travaux import GestionnaireTravaux, FileSaturee, ETATS_FINAUX
+from sessions_cuisine import MoteurSessions, SessionsSaturees, AbonnementsSatures, flux_sse
+from grappe import Coordinateur, GrappeIndisponible
+from metriques import installer_metriques, chronometre_solveur, compter_algorithme
+from profilage import MODES as MODES_PROFILAGE, profiler
 import heapq
 
 app = Flask(__name__)
+installer_metriques(app)
 
-# Catalogue des plats pour le jeu Kitchen Load Balancer
-PLATS_CATALOGUE = {
-    'A': {'nom': 'Salade César', 'prep': 15, 'cuisson': 0, 'dressage': 5, 'priorite': 'normale', 'deadline': 25},
-    'B': {'nom': 'Pizza', 'prep': 10, 'cuisson': 17, 'dressage': 3, 'priorite': 'normale', 'deadline': 30},
-    'C': {'nom': 'Steak grillé', 'prep': 8, 'cuisson': 12, 'dressage': 4, 'priorite': 'elevee', 'deadline': 25},
-    'D': {'nom': 'Plat gastronomique', 'prep': 20, 'cuisson': 25, 'dressage': 10, 'priorite': 'vip', 'deadline': 45},
-    'E': {'nom': 'Burger', 'prep': 7, 'cuisson': 10, 'dressage': 3, 'priorite': 'normale', 'deadline': 20},
-    'F': {'nom': 'Soupe', 'prep': 12, 'cuisson': 18, 'dressage': 4, 'priorite': 'basse', 'deadline': 35}
-}
+# Profilage à la demande (en-tête X-Profile: cprofile | echantillonnage), désactivé par défaut :
+# les profils exposent chemins et détails internes. KITCHEN_PROFILAGE=1 l'active en développement ;
+# serveur_production.py le désactive toujours
+app.config['PROFILAGE_AUTORISE'] = os.environ.get('KITCHEN_PROFILAGE', '0') == '1'
+
+# Source des instances (remplacée par un corpus mappé en mémoire en production)
+app.config['INSTANCES'] = InstanceManager()
+
+# Pool de processus solveurs (configuré par serveur_production.py) et taille
+# d'instance à partir de laquelle une résolution y est déportée
+app.config['POOL_SOLVEURS'] = None
+app.config['SEUIL_POOL'] = 5000
+
+# Magasin des meilleures solutions connues, désactivé par défaut : KITCHEN_SOLUTIONS=instances/solutions.jsonl
+# après l'avoir amorcé (python solutions.py --remplir). Seules les instances amorcées y sont suivies
+FICHIER_SOLUTIONS = os.environ.get('KITCHEN_SOLUTIONS', '')
+app.config['SOLUTIONS'] = MagasinSolutions(FICHIER_SOLUTIONS) if FICHIER_SOLUTIONS else None
+
+# Pool dédié aux lots (/api/batch), un processus par cœur (par worker selon --solveurs sous
+# serveur_production.py), et taille de lot en dessous de laquelle les scénarios sont résolus
+# sur place. Les instances stockées y sont transmises par mémoire partagée (une copie par lot)
+app.config['POOL_LOTS'] = ExecuteurPartage(os.cpu_count() or 2)
+app.config['SEUIL_LOT_POOL'] = 64
+
+# File de travaux asynchrones (/api/jobs), créée au premier usage. Sous serveur_production.py,
+# seul le processus des moteurs l'héberge : les workers lui relaient ces requêtes
+app.config['TRAVAUX'] = None
+app.config['TRAVAUX_PROCESSUS'] = int(os.environ.get('KITCHEN_TRAVAUX_PROCESSUS', '2'))
+app.config['TRAVAUX_CAPACITE'] = int(os.environ.get('KITCHEN_TRAVAUX_CAPACITE', '100'))
+
+# Simulations de cuisine côté serveur (/api/sessions), moteur créé au premier usage (sous
+# serveur_production.py, dans le processus des moteurs). Chaque abonné SSE occupe un thread
+app.config['SESSIONS'] = None
+app.config['SESSIONS_MAX'] = int(os.environ.get('KITCHEN_SESSIONS_MAX', '5000'))
+app.config['SESSIONS_MAX_ABONNES'] = int(os.environ.get('KITCHEN_SESSIONS_MAX_ABONNES', '256'))
+
+# Nœuds solveurs pour /api/simulate/sites (python grappe.py noeud), séparés par des virgules ;
+# sans nœud, les sites sont résolus dans le processus web. Coordinateur créé au premier usage
+app.config['GRAPPE'] = None
+app.config['GRAPPE_NOEUDS'] = [a for a in os.environ.get('KITCHEN_GRAPPE_NOEUDS', '').split(',') if a]
+
+# Algorithmes de load balancing du jeu (les autres valeurs sont comptées comme 'autre')
+ALGORITHMES_JEU = ('least-loaded', 'round-robin', 'shortest-job', 'priority-first')
+
+# Validateurs HTTP du catalogue (constant pendant toute la vie du processus)
+VERSION_CATALOGUE = etag_contenu(json.dumps(PLATS_CATALOGUE, sort_keys=True).encode())
+DATE_CATALOGUE = horodatage(os.path.getmtime(catalogue.__file__))
+
+# Corps JSON des réponses stables, re-sérialisés seulement quand leur version change
+CACHE_REPONSES = CacheReponses()
+
+# Fichiers statiques empreintés (python construire_statiques.py) ; None en développement
+MANIFESTE_STATIQUES = charger_manifeste(app.static_folder)
+
+# Cache d'un an pour les fichiers empreintés : leur nom change avec leur contenu
+CACHE_CONTROL_STATIQUES = 'public, max-age=31536000, immutable'
+
+@app.context_processor
+def urls_statiques():
+    """asset_url('script.js') : version empreintée si les statiques ont été construits."""
+    def asset_url(fichier):
+        if MANIFESTE_STATIQUES and fichier in MANIFESTE_STATIQUES:
+            return url_for('static', filename=MANIFESTE_STATIQUES[fichier])
+        return url_for('static', filename=fichier)
+    return {'asset_url': asset_url}
+
+@app.route(f'/static/{DOSSIER_STATIQUES}/<path:fichier>')
+def statique_compile(fichier):
+    """
+    Sert un fichier empreinté, dans sa variante précompressée (.br ou .gz)
+    si le client l'accepte.
+    """
+    dossier = os.path.join(app.static_folder, DOSSIER_STATIQUES)
+    variante, encodage = fichier, None
+    for extension, nom_encodage in (('.br', 'br'), ('.gz', 'gzip')):
+        if nom_encodage in request.accept_encodings and os.path.isfile(os.path.join(dossier, fichier + extension)):
+            variante, encodage = fichier + extension, nom_encodage
+            break
+
+    reponse = send_from_directory(dossier, variante, max_age=31536000,
+                                  mimetype=mimetypes.guess_type(fichier)[0] or 'application/octet-stream')
+    if encodage:
+        reponse.headers['Content-Encoding'] = encodage
+    reponse.headers['Cache-Control'] = CACHE_CONTROL_STATIQUES
+    reponse.vary.add('Accept-Encoding')
+    return reponse
 
 @app.route('/')
 def index():
@@ -20,8 +124,9 @@ def index():
 
 @app.route('/api/plats', methods=['GET'])
 def get_plats():
-    """Retourne le catalogue des plats disponibles."""
-    return jsonify(PLATS_CATALOGUE)
+    """Retourne le catalogue des plats disponibles (ETag / Last-Modified, 304 si inchangé)."""
+    return reponse_conditionnelle(request, CACHE_REPONSES, 'plats', VERSION_CATALOGUE,
+                                  DATE_CATALOGUE, lambda: PLATS_CATALOGUE)
 
 @app.route('/api/assign', methods=['POST'])
 def assign_plat():
@@ -39,6 +144,7 @@ def assign_plat():
         return jsonify({'error': 'Plat inconnu'}), 400
 
     plat = PLATS_CATALOGUE[plat_id]
+    compter_algorithme(algorithm if algorithm in ALGORITHMES_JEU else 'autre')
 
     # Déterminer l'étape suivante
     etapes = ['preparation', 'cuisson', 'dressage']
@@ -94,69 +200,594 @@ def simulate_schedule():
     if not plats_ids:
         return jsonify({'error': 'Aucun plat fourni'}), 400
 
-    # Construire les tâches pour chaque station
-    prep_tasks = {}
-    cuisson_tasks = {}
-    dressage_tasks = {}
-
-    for i, plat_id in enumerate(plats_ids):
-        if plat_id in PLATS_CATALOGUE:
-            plat = PLATS_CATALOGUE[plat_id]
-            task_name = f"{plat['nom']}_{i}"
-            prep_tasks[task_name] = plat['prep']
-            if plat['cuisson'] > 0:
-                cuisson_tasks[task_name] = plat['cuisson']
-            dressage_tasks[task_name] = plat['dressage']
-
-    # Simuler avec l'algorithme glouton (Least Loaded)
-    results = {
-        'preparation': greedy_scheduler(prep_tasks, 2)[1] if prep_tasks else 0,
-        'cuisson': greedy_scheduler(cuisson_tasks, 1)[1] if cuisson_tasks else 0,
-        'dressage': greedy_scheduler(dressage_tasks, 1)[1] if dressage_tasks else 0
-    }
+    with chronometre_solveur(algorithm if algorithm in ALGORITHMES_JEU else 'autre'), \
+            profil_demande() as profil:
+        results = estimer_makespans_stations(plats_ids)
 
     # Le makespan total est approximatif car les étapes sont séquentielles
     total_makespan = results['preparation'] + results['cuisson'] + results['dressage']
 
-    return jsonify({
+    result = {
         'algorithm': algorithm,
         'station_makespans': results,
         'estimated_total': total_makespan,
         'plats_count': len(plats_ids)
-    })
+    }
+    if profil is not None:
+        result['profile'] = profil.to_dict()
+
+    return jsonify(result)
+
+def profil_demande():
+    """
+    Retourne un contexte de profilage si la requête le demande via l'en-tête X-Profile,
+    sinon un contexte vide. Le profil est disponible dans le 'as' du with.
+    """
+    mode = request.headers.get('X-Profile')
+    if mode in MODES_PROFILAGE and app.config['PROFILAGE_AUTORISE']:
+        return profiler(mode)
+    return nullcontext()
+
+def resoudre(algorithm, tasks, num_workers):
+    """
+    Exécute un ordonnanceur, dans le pool de processus solveurs pour les grosses instances
+    si un pool est configuré (lève PoolSature quand il est plein).
+    """
+    pool = app.config['POOL_SOLVEURS']
+    if pool is not None and len(tasks) >= app.config['SEUIL_POOL']:
+        return pool.resoudre(SCHEDULERS[algorithm], tasks, num_workers)
+    return SCHEDULERS[algorithm](tasks, num_workers)
+
+def resoudre_compact(algorithm, temps, num_workers):
+    """Comme resoudre(), pour un tableau de durées (voir SCHEDULERS_COMPACTS)."""
+    pool = app.config['POOL_SOLVEURS']
+    if pool is not None and len(temps) >= app.config['SEUIL_POOL']:
+        return pool.resoudre(SCHEDULERS_COMPACTS[algorithm], temps, num_workers)
+    return SCHEDULERS_COMPACTS[algorithm](temps, num_workers)
 
 @app.route('/schedule', methods=['POST'])
 def schedule():
-    """Endpoint legacy pour l'ancien formulaire de planification."""
+    """
+    Endpoint legacy pour l'ancien formulaire de planification.
+    Si le magasin de solutions est activé et connaît l'instance, sa meilleure solution est rendue
+    quand elle est prouvée optimale ou meilleure que celle de l'algorithme, et toute amélioration
+    y est enregistrée ('use_store': false pour l'ignorer).
+    """
     data = request.json
     tasks_str = data.get('tasks')
     num_workers = int(data.get('num_workers'))
     algorithm = data.get('algorithm')
 
     # Analyser les tâches à partir de la chaîne de caractères
-    tasks = {}
-    for line in tasks_str.strip().split('\n'):
-        try:
-            name, time = line.split(',')
-            tasks[name.strip()] = int(time.strip())
-        except ValueError:
-            return jsonify({'error': f"Ligne mal formatée : {line}"}), 400
+    try:
+        tasks = parser_taches(tasks_str)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     if not tasks:
         return jsonify({'error': 'Aucune tâche fournie.'}), 400
 
-    if algorithm == 'greedy':
-        workers, makespan = greedy_scheduler(tasks, num_workers)
-    elif algorithm == 'dp':
-        workers, makespan = dynamic_programming_scheduler(tasks, num_workers)
-    else:
+    if algorithm not in SCHEDULERS:
         return jsonify({'error': 'Algorithme non valide.'}), 400
 
-    return jsonify({
+    # Le magasin de solutions et les formats colonnes/binaire passent par l'ordonnanceur
+    # compact : ni dictionnaires ni tuples par tâche à construire puis sérialiser
+    magasin = app.config['SOLUTIONS'] if data.get('use_store', True) else None
+    if magasin is not None and not magasin.connait(len(tasks), num_workers):
+        magasin = None
+    compact = magasin is not None or negocier_mode(request) != 'json'
+
+    try:
+        with chronometre_solveur(algorithm), profil_demande() as profil:
+            if compact:
+                temps = list(tasks.values())
+                (affectation, debuts, charges, makespan), connue, source = resoudre_avec_magasin(
+                    magasin, algorithm, temps, num_workers, resoudre_compact)
+            else:
+                workers, makespan = resoudre(algorithm, tasks, num_workers)
+    except PoolSature:
+        return jsonify({'error': 'Serveur saturé, réessayez plus tard.'}), 503
+
+    result = {} if compact else {
         'workers': workers,
         'makespan': makespan
+    }
+    if compact and connue is not None:
+        # 'source' vaut 'magasin' quand la meilleure solution connue bat (ou remplace) l'algorithme
+        result['source'] = source
+        result['best_known'] = connue.to_dict()
+    if profil is not None:
+        result['profile'] = profil.to_dict()
+
+    if compact:
+        colonnes = Colonnes.depuis_compact(list(tasks), temps, affectation, debuts, charges, makespan)
+        return reponse_ordonnancement(request, result, colonnes)
+    return reponse_ordonnancement(request, result)
+
+@app.route('/schedule/upload', methods=['POST'])
+def schedule_upload():
+    """
+    Planification d'un gros fichier de tâches envoyé tel quel dans le corps de la requête.
+    Le corps est lu en flux, ligne à ligne : CSV "nom, temps" (text/csv) ou NDJSON
+    (application/x-ndjson), éventuellement compressé (Content-Encoding: gzip).
+    num_workers, algorithm et éventuellement entree=csv|ndjson passent dans la query string ;
+    les lignes invalides sont signalées dans 'erreurs' sans interrompre la lecture.
+    La réponse suit le format négocié (voir reponses.py).
+    """
+    algorithm = request.args.get('algorithm', 'greedy')
+    try:
+        num_workers = int(request.args.get('num_workers', 1))
+    except ValueError:
+        return jsonify({'error': 'num_workers doit être un entier.'}), 400
+    format_taches = request.args.get('entree') or format_depuis_content_type(request.content_type)
+    encodage = (request.headers.get('Content-Encoding') or '').lower()
+
+    if algorithm not in SCHEDULERS_COMPACTS:
+        return jsonify({'error': 'Algorithme non valide.'}), 400
+    if num_workers < 1:
+        return jsonify({'error': 'num_workers doit être au moins 1.'}), 400
+    if format_taches not in FORMATS_INGESTION:
+        return jsonify({'error': f'Format inconnu: {format_taches}'}), 400
+    if encodage not in ('', 'identity', 'gzip'):
+        return jsonify({'error': f'Content-Encoding non supporté: {encodage}'}), 415
+
+    try:
+        taches, erreurs, nombre_erreurs = lire_taches(request.stream, format_taches, encodage == 'gzip')
+    except (ValueError, zlib.error) as e:
+        return jsonify({'error': f'Corps illisible : {e}'}), 400
+
+    if not len(taches):
+        return jsonify({'error': 'Aucune tâche valide fournie.', 'erreurs': erreurs,
+                        'lignes_rejetees': nombre_erreurs}), 400
+
+    try:
+        with chronometre_solveur(algorithm), profil_demande() as profil:
+            affectation, debuts, charges, makespan = resoudre_compact(algorithm, taches.temps, num_workers)
+    except PoolSature:
+        return jsonify({'error': 'Serveur saturé, réessayez plus tard.'}), 503
+
+    # Colonnes dans l'ordre du fichier ; le format historique n'est construit que s'il est demandé
+    colonnes = Colonnes.depuis_compact(taches.noms, taches.temps, affectation, debuts, charges, makespan)
+    result = {
+        'nombre_taches': len(taches),
+        'lignes_rejetees': nombre_erreurs,
+        'erreurs': erreurs
+    }
+    if profil is not None:
+        result['profile'] = profil.to_dict()
+
+    return reponse_ordonnancement(request, result, colonnes)
+
+# Nombre maximal de commis d'un diagramme de Gantt (/api/timeline) : un dictionnaire par commis
+MAX_COMMIS_TIMELINE = 10000
+
+def entier_parametre(data, cle, defaut=None):
+    """
+    data[cle] converti en entier (defaut s'il est absent).
+    Lève ValueError avec le message de la réponse 400 si la valeur n'est pas un entier.
+    """
+    valeur = data.get(cle, defaut)
+    if valeur is None:
+        return None
+    try:
+        if isinstance(valeur, bool):
+            raise TypeError
+        return int(valeur)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f'{cle} doit être un entier.')
+
+@app.route('/api/staffing', methods=['POST'])
+def staffing():
+    """
+    Courbe makespan / nombre de commis (m = 1..max_workers) en un seul appel,
+    et, si un makespan cible est fourni, le nombre minimal de commis pour le respecter.
+    Au-delà du nombre de tâches la courbe est plate : max_workers y est ramené
+    (la valeur retenue est renvoyée dans 'max_workers').
+    """
+    data = request.json
+    tasks_str = data.get('tasks', '')
+
+    try:
+        max_workers = entier_parametre(data, 'max_workers', 10)
+        target_makespan = entier_parametre(data, 'target_makespan')
+        tasks = parser_taches(tasks_str)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not tasks:
+        return jsonify({'error': 'Aucune tâche fournie.'}), 400
+    if max_workers < 1:
+        return jsonify({'error': 'max_workers doit être au moins 1.'}), 400
+
+    max_workers = min(max_workers, len(tasks))
+    result = {'curve': makespan_curve(tasks, max_workers), 'max_workers': max_workers}
+
+    if target_makespan is not None:
+        result['target_makespan'] = target_makespan
+        result['min_workers'] = min_workers_for_makespan(tasks, target_makespan, max_workers)
+
+    return jsonify(result)
+
+@app.route('/api/timeline', methods=['POST'])
+def timeline():
+    """
+    Diagramme de Gantt d'un ordonnancement : dates de début/fin de chaque tâche en colonnes,
+    avec requêtes optionnelles (busy_at, idle_longer_than, load_from/load_to).
+    """
+    data = request.json
+    tasks_str = data.get('tasks', '')
+
+    try:
+        num_workers = entier_parametre(data, 'num_workers', 1)
+        busy_at = entier_parametre(data, 'busy_at')
+        idle_longer_than = entier_parametre(data, 'idle_longer_than')
+        load_from = entier_parametre(data, 'load_from')
+        load_to = entier_parametre(data, 'load_to')
+        tasks = parser_taches(tasks_str)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not tasks:
+        return jsonify({'error': 'Aucune tâche fournie.'}), 400
+    if num_workers < 1:
+        return jsonify({'error': 'num_workers doit être au moins 1.'}), 400
+    if num_workers > MAX_COMMIS_TIMELINE:
+        return jsonify({'error': f'num_workers ne peut dépasser {MAX_COMMIS_TIMELINE}.'}), 400
+
+    workers, _ = greedy_scheduler(tasks, num_workers)
+    gantt = Timeline(workers)
+    result = gantt.to_columns()
+
+    if busy_at is not None:
+        result['busy_at'] = gantt.busy_at(busy_at)
+    if idle_longer_than is not None:
+        result['idle_windows'] = gantt.idle_windows(idle_longer_than)
+    if load_from is not None and load_to is not None:
+        result['load'] = gantt.load_between(load_from, load_to)
+        result['total_load'] = gantt.total_load_between(load_from, load_to)
+
+    return jsonify(result)
+
+@app.route('/api/instances', methods=['GET'])
+def lister_instances():
+    """Liste les instances disponibles (référence et test), avec validateurs HTTP."""
+    manager = app.config['INSTANCES']
+    version, date = manager.version()
+    return reponse_conditionnelle(request, CACHE_REPONSES, 'instances', version,
+                                  horodatage(date), manager.lister_instances_disponibles)
+
+@app.route('/api/instances/<nom>', methods=['GET'])
+def obtenir_instance(nom):
+    """Retourne une instance, avec son texte prêt pour le formulaire /schedule."""
+    manager = app.config['INSTANCES']
+    version, date = manager.version()
+    version = etag_contenu(f"{version}:{nom}".encode())
+
+    # Client à jour : ni recherche de l'instance ni sérialisation
+    if non_modifie(request, version, horodatage(date)):
+        return reponse_conditionnelle(request, CACHE_REPONSES, f'instance:{nom}', version,
+                                      horodatage(date), None)
+
+    instance = manager.obtenir_instance_par_nom(nom)
+    if instance is None:
+        return jsonify({'error': 'Instance inconnue'}), 404
+
+    return reponse_conditionnelle(request, CACHE_REPONSES, f'instance:{nom}', version, horodatage(date), lambda: {
+        'instance': instance,
+        'tasks': manager.convertir_instance_pour_affichage(instance),
+        'num_workers': instance['nombre_commis']
     })
 
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """
+    Résout un lot de scénarios en un seul appel. 'instances' est une liste dont chaque
+    élément est un scénario /schedule ({'tasks', 'num_workers', 'algorithm', 'id'}),
+    un scénario /api/simulate ({'plats': [...]}) ou le nom d'une instance stockée.
+    Les résultats sont envoyés en NDJSON (une ligne par scénario, avec son 'index')
+    au fil de leur résolution ; 'details': false n'envoie que makespan et charges.
+    """
+    data = request.json
+    elements = data.get('instances')
+    details = bool(data.get('details', True))
+
+    if not isinstance(elements, list) or not elements:
+        return jsonify({'error': 'Aucune instance fournie.'}), 400
+
+    erreurs = []
+    scenarios = []
+    for index, identifiant, scenario in normaliser_scenarios(elements, app.config['INSTANCES']):
+        if scenario is None:
+            erreurs.append(json.dumps({'index': index, 'id': identifiant, 'error': 'Instance inconnue'}).encode() + b'\n')
+        else:
+            scenarios.append((index, identifiant, scenario))
+
+    pool = app.config['POOL_LOTS']
+    if pool is not None and len(scenarios) >= app.config['SEUIL_LOT_POOL']:
+        try:
+            resultats = flux_resultats(soumettre_lot(scenarios, pool, details))
+        except PoolSature:
+            return jsonify({'error': 'Serveur saturé, réessayez plus tard.'}), 503
+    else:
+        resultats = (resoudre_paquet([scenario], details) for scenario in scenarios)
+
+    def generer():
+        yield from erreurs
+        yield from resultats
+
+    reponse = Response(generer(), mimetype='application/x-ndjson')
+    reponse.headers['X-Batch-Size'] = str(len(elements))
+    return reponse
+
+def coordinateur_grappe():
+    """Retourne le coordinateur des nœuds solveurs du processus courant, ou None sans nœud configuré."""
+    if not app.config['GRAPPE_NOEUDS']:
+        return None
+    coordinateur = app.config['GRAPPE']
+    if coordinateur is None or coordinateur.pid != os.getpid():
+        coordinateur = Coordinateur(app.config['GRAPPE_NOEUDS'])
+        app.config['GRAPPE'] = coordinateur
+    return coordinateur
+
+@app.route('/api/simulate/sites', methods=['POST'])
+def simulate_sites():
+    """
+    Simule plusieurs cuisines en un appel : {'sites': {nom: [plats]}} ou
+    {'sites': [{'id': nom, 'plats': [...]}, ...]}. Chaque site est estimé comme
+    /api/simulate ; avec des nœuds solveurs configurés, les sites sont répartis entre eux.
+    """
+    data = request.json or {}
+    sites = data.get('sites')
+    if isinstance(sites, dict):
+        sites = [{'id': nom, 'plats': plats} for nom, plats in sites.items()]
+    if not isinstance(sites, list) or not sites:
+        return jsonify({'error': 'Aucun site fourni'}), 400
+
+    scenarios = []
+    for index, site in enumerate(sites):
+        if not isinstance(site, dict) or not isinstance(site.get('plats'), list):
+            return jsonify({'error': f'Site {index} invalide : liste de plats attendue'}), 400
+        scenarios.append((index, site.get('id', index), {'plats': site['plats']}))
+
+    coordinateur = coordinateur_grappe()
+    if coordinateur is None:
+        resultats = [json.loads(ligne) for ligne in resoudre_paquet(scenarios).splitlines()]
+        resume = None
+    else:
+        try:
+            resultats, resume = coordinateur.resoudre(scenarios)
+        except GrappeIndisponible:
+            return jsonify({'error': 'Aucun nœud solveur disponible, réessayez plus tard.'}), 503
+
+    for resultat, site in zip(resultats, sites):
+        resultat['plats_count'] = len(site['plats'])
+    reponse = {
+        'sites': resultats,
+        'estimated_total_max': max((r.get('estimated_total', 0) for r in resultats), default=0),
+        'plats_count': sum(len(site['plats']) for site in sites)
+    }
+    if resume is not None:
+        reponse['grappe'] = resume
+    return jsonify(reponse)
+
+def gestionnaire_travaux():
+    """Retourne le gestionnaire de travaux du processus courant (créé paresseusement)."""
+    gestionnaire = app.config['TRAVAUX']
+    if gestionnaire is None or gestionnaire.pid != os.getpid():
+        gestionnaire = GestionnaireTravaux(
+            processus=app.config['TRAVAUX_PROCESSUS'],
+            capacite_file=app.config['TRAVAUX_CAPACITE']
+        )
+        app.config['TRAVAUX'] = gestionnaire
+    return gestionnaire
+
+@app.route('/api/jobs', methods=['POST'])
+def soumettre_travail():
+    """
+    Soumet une résolution en arrière-plan. Le corps reprend celui de /schedule
+    ('tasks' en texte, ou 'instance' pour une instance stockée), avec en option
+    'priority' (0 = plus urgent) et 'time_limit' en secondes.
+    Répond 202 avec l'identifiant du travail, ou 429 si la file est pleine.
+    """
+    data = request.json
+    algorithm = data.get('algorithm', 'greedy')
+
+    if data.get('instance'):
+        manager = app.config['INSTANCES']
+        instance = manager.obtenir_instance_par_nom(data['instance'])
+        if instance is None:
+            return jsonify({'error': 'Instance inconnue'}), 404
+        tasks, num_workers = manager.convertir_instance_pour_algorithme(instance)
+    else:
+        try:
+            tasks = parser_taches(data.get('tasks', ''))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            num_workers = int(data.get('num_workers', 1))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'num_workers doit être un entier.'}), 400
+        if num_workers < 1:
+            return jsonify({'error': 'num_workers doit être au moins 1.'}), 400
+
+    if not tasks:
+        return jsonify({'error': 'Aucune tâche fournie.'}), 400
+    if algorithm not in SCHEDULERS:
+        return jsonify({'error': 'Algorithme non valide.'}), 400
+
+    try:
+        priorite = int(data.get('priority', 5))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'priority doit être un entier.'}), 400
+
+    limite_temps = data.get('time_limit')
+    if limite_temps is not None:
+        try:
+            limite_temps = float(limite_temps)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'time_limit doit être un nombre de secondes.'}), 400
+        if not math.isfinite(limite_temps) or limite_temps <= 0:
+            return jsonify({'error': 'time_limit doit être un nombre de secondes positif.'}), 400
+
+    try:
+        travail = gestionnaire_travaux().soumettre(
+            algorithm, tasks, num_workers, priorite=priorite, limite_temps=limite_temps
+        )
+    except FileSaturee as e:
+        reponse = jsonify({'error': str(e)})
+        reponse.headers['Retry-After'] = '5'
+        return reponse, 429
+
+    reponse = jsonify(travail.to_dict())
+    reponse.headers['Location'] = url_for('etat_travail', travail_id=travail.id)
+    return reponse, 202
+
+@app.route('/api/jobs', methods=['GET'])
+def statistiques_travaux():
+    """Occupation de la file de travaux."""
+    return jsonify(gestionnaire_travaux().statistiques())
+
+@app.route('/api/jobs/<travail_id>', methods=['GET'])
+def etat_travail(travail_id):
+    """État d'un travail (et sa position dans la file s'il attend)."""
+    gestionnaire = gestionnaire_travaux()
+    travail = gestionnaire.obtenir(travail_id)
+    if travail is None:
+        return jsonify({'error': 'Travail inconnu ou expiré'}), 404
+
+    result = travail.to_dict()
+    position = gestionnaire.position(travail_id)
+    if position is not None:
+        result['position'] = position
+    return jsonify(result)
+
+@app.route('/api/jobs/<travail_id>/result', methods=['GET'])
+def resultat_travail(travail_id):
+    """
+    Résultat d'un travail terminé (même format que /schedule).
+    202 s'il n'est pas encore fini, 409 s'il a échoué, expiré ou été annulé.
+    """
+    gestionnaire = gestionnaire_travaux()
+    travail = gestionnaire.obtenir(travail_id)
+    if travail is None:
+        return jsonify({'error': 'Travail inconnu ou expiré'}), 404
+
+    if travail.etat not in ETATS_FINAUX:
+        return jsonify(travail.to_dict()), 202
+
+    donnees = gestionnaire.resultat(travail_id)
+    if donnees is None:
+        return jsonify(travail.to_dict()), 409
+    return Response(donnees, mimetype='application/json')
+
+@app.route('/api/jobs/<travail_id>', methods=['DELETE'])
+def annuler_travail(travail_id):
+    """Annule un travail en attente ou en cours."""
+    travail = gestionnaire_travaux().annuler(travail_id)
+    if travail is None:
+        return jsonify({'error': 'Travail inconnu ou expiré'}), 404
+    return jsonify(travail.to_dict())
+
+def moteur_sessions():
+    """Retourne le moteur de sessions du processus courant (créé et démarré paresseusement)."""
+    moteur = app.config['SESSIONS']
+    if moteur is None or moteur.pid != os.getpid():
+        moteur = MoteurSessions(max_sessions=app.config['SESSIONS_MAX'],
+                                max_abonnes=app.config['SESSIONS_MAX_ABONNES'])
+        moteur.demarrer()
+        app.config['SESSIONS'] = moteur
+    return moteur
+
+@app.route('/api/sessions', methods=['POST'])
+def creer_session():
+    """
+    Ouvre une partie simulée par le serveur (mode automatique). Corps optionnel :
+    'seed' pour rejouer la même suite de commandes, 'speed' (multiplicateur de vitesse).
+    Répond 201 avec l'état initial, ou 429 si le serveur héberge déjà trop de sessions.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        seed = data.get('seed')
+        vitesse = float(data.get('speed', 1.0))
+        if not 0 < vitesse <= 10:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Vitesse invalide (entre 0 et 10)'}), 400
+
+    try:
+        etat = moteur_sessions().creer(seed=seed, vitesse=vitesse)
+    except SessionsSaturees as e:
+        reponse = jsonify({'error': str(e)})
+        reponse.headers['Retry-After'] = '30'
+        return reponse, 429
+
+    reponse = jsonify(etat)
+    reponse.headers['Location'] = url_for('etat_session', session_id=etat['id'])
+    return reponse, 201
+
+@app.route('/api/sessions', methods=['GET'])
+def statistiques_sessions():
+    """Occupation du moteur de sessions (nombre de sessions, de plats, durée du dernier tick)."""
+    return jsonify(moteur_sessions().statistiques())
+
+@app.route('/api/sessions/<session_id>', methods=['GET'])
+def etat_session(session_id):
+    """État complet d'une session."""
+    etat = moteur_sessions().instantane(session_id)
+    if etat is None:
+        return jsonify({'error': 'Session inconnue ou expirée'}), 404
+    return jsonify(etat)
+
+@app.route('/api/sessions/<session_id>', methods=['PATCH'])
+def modifier_session(session_id):
+    """Met en pause ('paused': true), reprend ou change la vitesse ('speed') d'une session."""
+    data = request.get_json(silent=True) or {}
+    vitesse = data.get('speed')
+    try:
+        vitesse = float(vitesse) if vitesse is not None else None
+    except (TypeError, ValueError):
+        vitesse = -1
+    if vitesse is not None and not 0 < vitesse <= 10:
+        return jsonify({'error': 'Vitesse invalide (entre 0 et 10)'}), 400
+
+    pause = data.get('paused')
+    etat = moteur_sessions().modifier(session_id, pause=bool(pause) if pause is not None else None,
+                                      vitesse=vitesse)
+    if etat is None:
+        return jsonify({'error': 'Session inconnue ou expirée'}), 404
+    return jsonify(etat)
+
+@app.route('/api/sessions/<session_id>', methods=['DELETE'])
+def supprimer_session(session_id):
+    """Termine une session et ferme ses flux."""
+    if not moteur_sessions().supprimer(session_id):
+        return jsonify({'error': 'Session inconnue ou expirée'}), 404
+    return '', 204
+
+@app.route('/api/sessions/<session_id>/events', methods=['GET'])
+def flux_session(session_id):
+    """
+    Flux Server-Sent Events d'une session : un événement 'etat' (état complet) à la
+    connexion, puis un 'delta' par tick portant des événements, et une resynchronisation
+    de l'horloge chaque seconde. 503 si le serveur a déjà trop de flux ouverts.
+    """
+    moteur = moteur_sessions()
+    try:
+        abonnement = moteur.abonner(session_id)
+    except AbonnementsSatures as e:
+        reponse = jsonify({'error': str(e)})
+        reponse.headers['Retry-After'] = '30'
+        return reponse, 503
+    if abonnement is None:
+        return jsonify({'error': 'Session inconnue ou expirée'}), 404
+
+    abonne, initial = abonnement
+    reponse = Response(flux_sse(moteur, session_id, abonne, initial), mimetype='text/event-stream')
+    reponse.headers['Cache-Control'] = 'no-cache'
+    # Pas de mise en tampon par un proxy nginx : chaque delta part aussitôt
+    reponse.headers['X-Accel-Buffering'] = 'no'
+    return reponse
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', debug=True)
 
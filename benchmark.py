@@ -0,0 +1,344 @@
+"""
+Banc d'essai des algorithmes d'ordonnancement
+Mesure le temps et la qualité (makespan / borne inférieure) de chaque ordonnanceur,
+et compare les résultats à une référence enregistrée
+
+Usage:
+    python benchmark.py --rapide --comparer benchmarks/baseline.json
+    python benchmark.py --max-plats 1000000 --output benchmarks/resultats.json
+    python benchmark.py --processus 8 --output benchmarks/balayage.json
+    python benchmark.py --rapide --entrepot benchmarks/resultats.sqlite
+
+Avec --processus, les mesures sont réparties sur plusieurs processus : chaque instance
+est publiée une fois en mémoire partagée et mesurée en parallèle pour tous les nombres
+de commis et algorithmes. Les temps sont alors plus bruités (cœurs partagés) : garder
+une exécution séquentielle pour les comparaisons à la référence.
+
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from typing import Dict, List
+
+from algorithms import SCHEDULERS, makespan_lower_bound
+from entrepot import EntrepotResultats, empreinte_instance
+from instance_generator import InstanceGenerator
+from memoire_partagee import ExecuteurPartage, lire_noms, lire_vue
+
+
+TAILLES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+TAILLES_RAPIDES = [10, 100, 1000, 10_000]
+COMMIS = [2, 8, 32]
+COMMIS_RAPIDES = [2, 8]
+PROFILS = ["simple", "equilibree", "difficile", "desequilibree"]
+
+# Colonnes du format de stockage compact (une ligne = un tableau de valeurs)
+COLONNES = [
+    "algorithme", "profil", "nombre_plats", "nombre_commis",
+    "makespan", "borne_inferieure", "ratio",
+    "temps_min_ms", "temps_p50_ms", "temps_p90_ms", "temps_max_ms"
+]
+
+# Tolérances par défaut avant de signaler une régression de vitesse : le temps minimal
+# (la mesure la plus stable) doit dépasser la référence en proportion ET en valeur absolue
+TOLERANCE_TEMPS = 1.0
+SEUIL_TEMPS_MS = 1.0
+
+
+def construire_taches(nombre_plats: int, profil: str, seed: int) -> Dict[str, int]:
+    """
+    Construit les tâches {nom: temps total} d'une instance de benchmark
+
+    Utilise le générateur par blocs, ce qui fonctionne jusqu'à 10^6 plats.
+    """
+    generator = InstanceGenerator(seed=seed)
+    tasks = {}
+    for bloc in generator.iterer_blocs_plats(nombre_plats, profil):
+        for plat in bloc:
+            tasks[plat["nom"]] = plat["temps_epluchage"] + plat["temps_cuisson"]
+    return tasks
+
+
+def percentile(valeurs: List[float], p: float) -> float:
+    """Percentile par la méthode du rang le plus proche (valeurs déjà triées)"""
+    rang = max(1, math.ceil(p / 100 * len(valeurs)))
+    return valeurs[rang - 1]
+
+
+def mesurer(scheduler, tasks: Dict[str, int], nombre_commis: int,
+            repetitions: int, echauffement: int) -> tuple:
+    """
+    Exécute un ordonnanceur plusieurs fois et mesure chaque exécution
+
+    Returns:
+        Tuple (makespan, durées triées en millisecondes)
+    """
+    for _ in range(echauffement):
+        scheduler(tasks, nombre_commis)
+
+    durees = []
+    makespan = None
+    for _ in range(repetitions):
+        debut = time.perf_counter_ns()
+        _, makespan = scheduler(tasks, nombre_commis)
+        durees.append((time.perf_counter_ns() - debut) / 1e6)
+
+    return makespan, sorted(durees)
+
+
+# Dernière instance reconstruite par ce processus de mesure : ((profil, nombre de plats), tâches).
+# Les blocs libérés sont réutilisés pour les instances suivantes : leur nom ne suffit pas comme clé
+_instance_partagee = (None, None)
+
+
+def _mesurer_partage(nom_algo: str, instance: tuple, vue_noms, vue_temps, nombre_commis: int,
+                     repetitions: int, echauffement: int) -> tuple:
+    """Mesure dans un processus solveur une instance publiée en mémoire partagée"""
+    global _instance_partagee
+    if _instance_partagee[0] != instance:
+        _instance_partagee = (None, None)
+        tasks = dict(zip(lire_noms(vue_noms), lire_vue(vue_temps).tolist()))
+        _instance_partagee = (instance, tasks)
+    return mesurer(SCHEDULERS[nom_algo], _instance_partagee[1], nombre_commis, repetitions, echauffement)
+
+
+def executer_benchmark(
+    tailles: List[int],
+    commis: List[int],
+    profils: List[str] = None,
+    algorithmes: List[str] = None,
+    repetitions: int = 5,
+    echauffement: int = 1,
+    seed: int = 42,
+    processus: int = 1
+) -> Dict:
+    """
+    Lance le benchmark sur toutes les combinaisons taille × commis × profil × algorithme
+
+    Les répétitions sont réduites automatiquement pour les très grandes instances
+    (au moins une mesure, sans échauffement au-delà de 10^5 plats).
+
+    Args:
+        processus: Nombre de processus de mesure (1 : tout dans ce processus)
+
+    Returns:
+        Résultats au format compact {"colonnes": [...], "lignes": [[...], ...]}
+    """
+    profils = profils or PROFILS
+    algorithmes = algorithmes or list(SCHEDULERS)
+    combinaisons = len(profils) * len(tailles) * len(commis) * len(algorithmes)
+    executeur = ExecuteurPartage(processus, max_en_cours=combinaisons) if processus > 1 else None
+    attentes = []
+    empreintes = {}
+
+    try:
+        for profil in profils:
+            for nombre_plats in tailles:
+                tasks = construire_taches(nombre_plats, profil, seed)
+                empreintes[(profil, nombre_plats)] = empreinte_instance(tasks.values())
+                reps = repetitions if nombre_plats <= 100_000 else max(1, repetitions // 5)
+                echauf = echauffement if nombre_plats <= 100_000 else 0
+                if executeur is not None:
+                    vues = (executeur.publier_noms(list(tasks)), executeur.publier(tasks.values()))
+                    mesures = []
+
+                for nombre_commis in commis:
+                    borne = makespan_lower_bound(tasks, nombre_commis)
+
+                    for nom_algo in algorithmes:
+                        if executeur is not None:
+                            mesure = executeur.soumettre(_mesurer_partage, nom_algo, (profil, nombre_plats),
+                                                         *vues, nombre_commis, reps, echauf)
+                            mesures.append(mesure)
+                        else:
+                            mesure = mesurer(SCHEDULERS[nom_algo], tasks, nombre_commis, reps, echauf)
+                        attentes.append((nom_algo, profil, nombre_plats, nombre_commis, borne, mesure))
+
+                # Blocs rendus dès la fin des mesures de l'instance, réutilisés par les suivantes
+                if executeur is not None:
+                    executeur.liberer_apres(mesures, *vues)
+
+        lignes = []
+        for nom_algo, profil, nombre_plats, nombre_commis, borne, mesure in attentes:
+            makespan, durees = mesure.result() if executeur is not None else mesure
+            lignes.append([
+                nom_algo, profil, nombre_plats, nombre_commis,
+                makespan, borne, round(makespan / borne, 6) if borne else 1.0,
+                round(durees[0], 4), round(percentile(durees, 50), 4),
+                round(percentile(durees, 90), 4), round(durees[-1], 4)
+            ])
+            print(f"✓ {nom_algo:7s} {profil:14s} n={nombre_plats:<8d} m={nombre_commis:<3d} "
+                  f"ratio={lignes[-1][6]:.4f}  p50={lignes[-1][8]:.3f} ms")
+    finally:
+        if executeur is not None:
+            executeur.fermer()
+
+    return {
+        "metadata": {
+            "seed": seed,
+            "repetitions": repetitions,
+            "echauffement": echauffement,
+            "processus": processus,
+            "python": sys.version.split()[0]
+        },
+        "colonnes": COLONNES,
+        "lignes": lignes,
+        # Non sauvegardé dans le fichier JSON : sert à l'entrepôt (enregistrer_resultats)
+        "empreintes": empreintes
+    }
+
+
+def enregistrer_resultats(resultats: Dict, fichier: str) -> int:
+    """Ajoute les mesures à l'entrepôt SQLite, comme une nouvelle expérience"""
+    empreintes = resultats.get("empreintes", {})
+    with EntrepotResultats(fichier) as entrepot:
+        execution = entrepot.nouvelle_execution("benchmark", resultats["metadata"])
+        mesures = (dict(zip(resultats["colonnes"], ligne)) for ligne in resultats["lignes"])
+        total = entrepot.inserer(execution, ({
+            "instance_hash": empreintes.get((mesure["profil"], mesure["nombre_plats"]), ""),
+            "profil": mesure["profil"],
+            "difficulte": InstanceGenerator.PROFILS[mesure["profil"]]["difficulte"],
+            "n": mesure["nombre_plats"],
+            "m": mesure["nombre_commis"],
+            "algorithme": mesure["algorithme"],
+            "makespan": mesure["makespan"],
+            "borne": mesure["borne_inferieure"],
+            "ratio": mesure["ratio"],
+            "temps_min_ms": mesure["temps_min_ms"],
+            "temps_p50_ms": mesure["temps_p50_ms"],
+            "temps_p90_ms": mesure["temps_p90_ms"],
+            "temps_max_ms": mesure["temps_max_ms"]
+        } for mesure in mesures))
+    print(f"✅ {total} mesure(s) ajoutée(s) à l'entrepôt {fichier} (expérience #{execution})")
+    return total
+
+
+def sauvegarder_resultats(resultats: Dict, fichier: str):
+    """Sauvegarde les résultats (une ligne JSON compacte par mesure)"""
+    with open(fichier, "w", encoding="utf-8") as f:
+        f.write('{"metadata": ' + json.dumps(resultats["metadata"]) + ',\n')
+        f.write(' "colonnes": ' + json.dumps(resultats["colonnes"], ensure_ascii=False) + ',\n')
+        f.write(' "lignes": [\n')
+        f.write(",\n".join("  " + json.dumps(ligne) for ligne in resultats["lignes"]))
+        f.write("\n ]}\n")
+    print(f"✅ {len(resultats['lignes'])} mesure(s) sauvegardée(s) dans {fichier}")
+
+
+def charger_resultats(fichier: str) -> Dict:
+    """Charge un fichier de résultats"""
+    with open(fichier, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _indexer(resultats: Dict) -> Dict[tuple, Dict]:
+    colonnes = resultats["colonnes"]
+    index = {}
+    for ligne in resultats["lignes"]:
+        mesure = dict(zip(colonnes, ligne))
+        cle = (mesure["algorithme"], mesure["profil"], mesure["nombre_plats"], mesure["nombre_commis"])
+        index[cle] = mesure
+    return index
+
+
+def comparer(resultats: Dict, reference: Dict, tolerance_temps: float = TOLERANCE_TEMPS,
+             seuil_ms: float = SEUIL_TEMPS_MS) -> List[str]:
+    """
+    Compare des résultats à une référence
+
+    Une régression de qualité est signalée dès que le ratio makespan / borne augmente ;
+    une régression de vitesse quand le temps minimal dépasse la référence de plus de
+    tolerance_temps (en proportion) et de plus de seuil_ms, pour ne pas signaler le bruit
+    de mesure des instances minuscules. Les mesures absentes de la référence sont ignorées.
+
+    Returns:
+        Liste des régressions détectées (vide si aucune)
+    """
+    index_reference = _indexer(reference)
+    regressions = []
+
+    for cle, mesure in _indexer(resultats).items():
+        ancienne = index_reference.get(cle)
+        if ancienne is None:
+            continue
+
+        nom = "{} {} n={} m={}".format(*cle)
+        if mesure["ratio"] > ancienne["ratio"] + 1e-9:
+            regressions.append(
+                f"{nom}: qualité {ancienne['ratio']:.4f} -> {mesure['ratio']:.4f}"
+            )
+        ecart = mesure["temps_min_ms"] - ancienne["temps_min_ms"]
+        if ecart > ancienne["temps_min_ms"] * tolerance_temps and ecart > seuil_ms:
+            regressions.append(
+                f"{nom}: temps min {ancienne['temps_min_ms']:.3f} ms -> {mesure['temps_min_ms']:.3f} ms"
+            )
+
+    return regressions
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Benchmark des algorithmes d'ordonnancement")
+    parser.add_argument("--rapide", action="store_true",
+                        help="Configuration réduite (n <= 10^4, m dans {2, 8})")
+    parser.add_argument("--max-plats", type=int, default=None,
+                        help="Taille maximale des instances (défaut: 10^6, 10^4 en mode rapide)")
+    parser.add_argument("--commis", type=int, nargs="+", default=None,
+                        help="Nombres de commis à tester")
+    parser.add_argument("--algorithmes", nargs="+", choices=sorted(SCHEDULERS), default=None)
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--echauffement", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processus", type=int, default=1,
+                        help="Processus de mesure en parallèle (défaut: 1, mesures séquentielles)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Fichier de résultats à écrire")
+    parser.add_argument("--entrepot", type=str, default=None,
+                        help="Base SQLite où ajouter les mesures (ex: benchmarks/resultats.sqlite)")
+    parser.add_argument("--comparer", type=str, default=None,
+                        help="Fichier de référence (ex: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance-temps", type=float, default=TOLERANCE_TEMPS,
+                        help="Ralentissement toléré sur le temps minimal (défaut: 1.0 = +100%%)")
+    parser.add_argument("--seuil-ms", type=float, default=SEUIL_TEMPS_MS,
+                        help="Ralentissement absolu ignoré, en millisecondes (défaut: 1.0)")
+    args = parser.parse_args()
+
+    tailles = TAILLES_RAPIDES if args.rapide else TAILLES
+    if args.max_plats is not None:
+        tailles = [n for n in TAILLES if n <= args.max_plats]
+    commis = args.commis or (COMMIS_RAPIDES if args.rapide else COMMIS)
+
+    print("⏱️  Benchmark des ordonnanceurs")
+    print("=" * 70)
+
+    resultats = executer_benchmark(
+        tailles, commis,
+        algorithmes=args.algorithmes,
+        repetitions=args.repetitions,
+        echauffement=args.echauffement,
+        seed=args.seed,
+        processus=args.processus
+    )
+
+    if args.output:
+        sauvegarder_resultats(resultats, args.output)
+
+    if args.entrepot:
+        enregistrer_resultats(resultats, args.entrepot)
+
+    if args.comparer:
+        regressions = comparer(
+            resultats, charger_resultats(args.comparer), args.tolerance_temps, args.seuil_ms
+        )
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.comparer}:")
+            for regression in regressions:
+                print(f"   • {regression}")
+            sys.exit(1)
+        print(f"\n✅ Aucune régression par rapport à {args.comparer}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cache HTTP des réponses stables (catalogue, liste des instances)
+ETag / Last-Modified, requêtes conditionnelles et corps mis en cache par version :
+une revalidation répond 304 sans reconstruire ni re-sérialiser la réponse
+
+"""
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+
+from flask import Response
+
+from reponses import compresser, serialiser_json
+
+
+# Les clients gardent la réponse mais la revalident à chaque usage (304 si inchangée)
+CACHE_CONTROL_API = "no-cache"
+
+
+def etag_contenu(contenu: bytes) -> str:
+    """Version dérivée du contenu"""
+    return hashlib.blake2b(contenu, digest_size=12).hexdigest()
+
+
+def horodatage(mtime: float) -> datetime:
+    """Date de modification (secondes) au format attendu par Last-Modified"""
+    return datetime.fromtimestamp(int(mtime), tz=timezone.utc)
+
+
+def non_modifie(requete, etag: str, derniere_modification: datetime) -> bool:
+    """
+    Vrai si la copie du client est à jour. If-None-Match prime sur If-Modified-Since,
+    comme le prévoit la RFC 9110.
+    """
+    if requete.if_none_match:
+        return requete.if_none_match.contains_weak(etag)
+    if requete.if_modified_since is not None and derniere_modification is not None:
+        return derniere_modification <= requete.if_modified_since
+    return False
+
+
+class CacheReponses:
+    """Corps JSON sérialisés, un par clé, reconstruits seulement quand la version change"""
+
+    def __init__(self):
+        self._corps: Dict[str, Tuple[str, bytes]] = {}
+        self._verrou = threading.Lock()
+
+    def corps(self, cle: str, version: str, construire: Callable) -> bytes:
+        entree = self._corps.get(cle)
+        if entree is not None and entree[0] == version:
+            return entree[1]
+        corps = serialiser_json(construire())
+        with self._verrou:
+            self._corps[cle] = (version, corps)
+        return corps
+
+    def vider(self):
+        with self._verrou:
+            self._corps.clear()
+
+
+def reponse_conditionnelle(requete, cache: CacheReponses, cle: str, version: str,
+                           derniere_modification: datetime, construire: Callable) -> Response:
+    """
+    Réponse JSON avec validateurs HTTP
+
+    Args:
+        requete: La requête Flask
+        cache: Cache des corps sérialisés
+        cle: Identifiant de la ressource dans le cache
+        version: Chaîne qui change dès que la ressource change (sert d'ETag)
+        derniere_modification: Date pour Last-Modified
+        construire: Fonction sans argument qui retourne les données (appelée seulement
+                    si le corps de cette version n'est pas déjà en cache)
+
+    Returns:
+        304 sans corps si le client est à jour, sinon 200 avec le corps
+    """
+    if non_modifie(requete, version, derniere_modification):
+        reponse = Response(status=304)
+    else:
+        reponse = compresser(Response(cache.corps(cle, version, construire),
+                                      mimetype="application/json"), requete)
+
+    # ETag faible : le même contenu peut être servi compressé ou non
+    reponse.set_etag(version, weak=True)
+    reponse.last_modified = derniere_modification
+    reponse.headers["Cache-Control"] = CACHE_CONTROL_API
+    reponse.vary.add("Accept-Encoding")
+    return reponse
@@ -0,0 +1,45 @@
+"""
+Catalogue des plats du jeu Kitchen Load Balancer
+Estimation du makespan de chaque station pour une commande, partagée par l'API,
+les processus solveurs des lots et les nœuds de la grappe (sans charger Flask)
+
+"""
+
+from algorithms import greedy_scheduler
+
+
+# Catalogue des plats pour le jeu Kitchen Load Balancer
+PLATS_CATALOGUE = {
+    'A': {'nom': 'Salade César', 'prep': 15, 'cuisson': 0, 'dressage': 5, 'priorite': 'normale', 'deadline': 25},
+    'B': {'nom': 'Pizza', 'prep': 10, 'cuisson': 17, 'dressage': 3, 'priorite': 'normale', 'deadline': 30},
+    'C': {'nom': 'Steak grillé', 'prep': 8, 'cuisson': 12, 'dressage': 4, 'priorite': 'elevee', 'deadline': 25},
+    'D': {'nom': 'Plat gastronomique', 'prep': 20, 'cuisson': 25, 'dressage': 10, 'priorite': 'vip', 'deadline': 45},
+    'E': {'nom': 'Burger', 'prep': 7, 'cuisson': 10, 'dressage': 3, 'priorite': 'normale', 'deadline': 20},
+    'F': {'nom': 'Soupe', 'prep': 12, 'cuisson': 18, 'dressage': 4, 'priorite': 'basse', 'deadline': 35}
+}
+
+
+def estimer_makespans_stations(plats_ids):
+    """
+    Makespan de chaque station (préparation, cuisson, dressage) pour une liste de plats,
+    chaque station étant ordonnancée avec l'algorithme glouton (Least Loaded).
+    """
+    # Construire les tâches pour chaque station
+    prep_tasks = {}
+    cuisson_tasks = {}
+    dressage_tasks = {}
+
+    for i, plat_id in enumerate(plats_ids):
+        if plat_id in PLATS_CATALOGUE:
+            plat = PLATS_CATALOGUE[plat_id]
+            task_name = f"{plat['nom']}_{i}"
+            prep_tasks[task_name] = plat['prep']
+            if plat['cuisson'] > 0:
+                cuisson_tasks[task_name] = plat['cuisson']
+            dressage_tasks[task_name] = plat['dressage']
+
+    return {
+        'preparation': greedy_scheduler(prep_tasks, 2)[1] if prep_tasks else 0,
+        'cuisson': greedy_scheduler(cuisson_tasks, 1)[1] if cuisson_tasks else 0,
+        'dressage': greedy_scheduler(dressage_tasks, 1)[1] if dressage_tasks else 0
+    }
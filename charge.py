@@ -0,0 +1,346 @@
+"""
+Banc de charge HTTP local pour l'API Flask
+Rejoue un trafic réaliste (jeu /api/assign, lots /api/simulate, gros /schedule)
+avec des clients asynchrones concurrents, sans aucun service extérieur
+
+Sans --url, l'application est servie par serveur_production.py dans un processus
+séparé : le générateur de charge ne partage ni le GIL ni les cœurs du processus
+mesuré avec le serveur (sauf s'il n'y a qu'un cœur).
+
+Usage:
+    python charge.py --clients 32 --duree 20
+    python charge.py --workers 2 --clients 32
+    python charge.py --url http://127.0.0.1:5000 --clients 64 --requetes 20000
+
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Mélange de trafic : (nom, poids)
+MELANGE = [("assign", 0.60), ("simulate", 0.25), ("schedule", 0.15)]
+
+ETAPES = [None, "preparation", "cuisson"]
+ALGORITHMES_JEU = ["least-loaded", "round-robin", "shortest-job", "priority-first"]
+
+
+class GenerateurTrafic:
+    """Construit les requêtes du scénario (corps pré-encodés, tirés avec une graine fixe)"""
+
+    def __init__(self, seed: int = 42, taches_schedule: int = 5000, plats_simulate: int = 40):
+        self.rng = random.Random(seed)
+        self.plats_simulate = plats_simulate
+
+        # Quelques gros corps /schedule pré-construits (textes de plusieurs milliers de lignes)
+        self.corps_schedule = []
+        for variante in range(4):
+            lignes = "\n".join(
+                f"tache_{variante}_{i}, {self.rng.randint(60, 3600)}" for i in range(taches_schedule)
+            )
+            self.corps_schedule.append(json.dumps({
+                "tasks": lignes,
+                "num_workers": 4 + variante * 4,
+                "algorithm": "greedy"
+            }).encode())
+
+        self._noms, poids = zip(*MELANGE)
+        self._cumul = [sum(poids[:i + 1]) for i in range(len(poids))]
+
+    def requete(self) -> Tuple[str, str, bytes]:
+        """Tire la prochaine requête : (endpoint, chemin, corps JSON)"""
+        tirage = self.rng.random() * self._cumul[-1]
+        nom = self._noms[next(i for i, c in enumerate(self._cumul) if tirage < c)]
+
+        if nom == "assign":
+            corps = {
+                "plat_id": self.rng.choice("ABCDEF"),
+                "current_etape": self.rng.choice(ETAPES),
+                "algorithm": self.rng.choice(ALGORITHMES_JEU),
+                "stations_load": {"preparation": self.rng.randint(0, 5), "cuisson": self.rng.randint(0, 3)}
+            }
+            return "/api/assign", "/api/assign", json.dumps(corps).encode()
+
+        if nom == "simulate":
+            corps = {
+                "plats": [self.rng.choice("ABCDEF") for _ in range(self.plats_simulate)],
+                "algorithm": self.rng.choice(ALGORITHMES_JEU)
+            }
+            return "/api/simulate", "/api/simulate", json.dumps(corps).encode()
+
+        return "/schedule", "/schedule", self.rng.choice(self.corps_schedule)
+
+
+class ConnexionHTTP:
+    """Connexion HTTP/1.1 persistante minimale (requêtes POST JSON)"""
+
+    def __init__(self, hote: str, port: int):
+        self.hote = hote
+        self.port = port
+        self.lecteur: Optional[asyncio.StreamReader] = None
+        self.ecrivain: Optional[asyncio.StreamWriter] = None
+
+    async def _ouvrir(self):
+        self.lecteur, self.ecrivain = await asyncio.open_connection(self.hote, self.port)
+
+    async def fermer(self):
+        if self.ecrivain is not None:
+            self.ecrivain.close()
+            try:
+                await self.ecrivain.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.ecrivain = None
+
+    async def post(self, chemin: str, corps: bytes) -> Tuple[int, int]:
+        """
+        Envoie un POST et lit la réponse complète
+
+        Returns:
+            Tuple (code HTTP, taille du corps de réponse)
+        """
+        if self.ecrivain is None:
+            await self._ouvrir()
+
+        self.ecrivain.write(
+            f"POST {chemin} HTTP/1.1\r\nHost: {self.hote}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(corps)}\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode() + corps
+        )
+        await self.ecrivain.drain()
+
+        entete = await self.lecteur.readuntil(b"\r\n\r\n")
+        lignes = entete.decode("latin-1").split("\r\n")
+        code = int(lignes[0].split()[1])
+        en_tetes = {}
+        for ligne in lignes[1:]:
+            if ":" in ligne:
+                cle, valeur = ligne.split(":", 1)
+                en_tetes[cle.strip().lower()] = valeur.strip()
+
+        fin_a_la_fermeture = False
+        if "content-length" in en_tetes:
+            corps_reponse = await self.lecteur.readexactly(int(en_tetes["content-length"]))
+        elif en_tetes.get("transfer-encoding", "").lower() == "chunked":
+            corps_reponse = await self._lire_morceaux()
+        else:
+            # Ni longueur ni découpage : le corps se termine à la fermeture de la connexion
+            corps_reponse = await self.lecteur.read()
+            fin_a_la_fermeture = True
+
+        if fin_a_la_fermeture or en_tetes.get("connection", "").lower() == "close":
+            await self.fermer()
+
+        return code, len(corps_reponse)
+
+    async def _lire_morceaux(self) -> bytes:
+        """Corps en Transfer-Encoding: chunked (les éventuels trailers sont ignorés)"""
+        morceaux = []
+        while True:
+            ligne = await self.lecteur.readuntil(b"\r\n")
+            taille = int(ligne.split(b";", 1)[0].strip(), 16)
+            if taille == 0:
+                while await self.lecteur.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(morceaux)
+            morceaux.append(await self.lecteur.readexactly(taille))
+            if await self.lecteur.readexactly(2) != b"\r\n":
+                raise ValueError("Morceau HTTP mal terminé")
+
+
+class Mesures:
+    """Latences et erreurs par endpoint"""
+
+    def __init__(self):
+        self.latences: Dict[str, List[float]] = {}
+        self.erreurs: Dict[str, int] = {}
+        self.octets: Dict[str, int] = {}
+
+    def ajouter(self, endpoint: str, latence: float, code: int, taille: int):
+        self.latences.setdefault(endpoint, []).append(latence)
+        self.octets[endpoint] = self.octets.get(endpoint, 0) + taille
+        if code >= 400:
+            self.erreurs[endpoint] = self.erreurs.get(endpoint, 0) + 1
+
+    def erreur(self, endpoint: str):
+        self.erreurs[endpoint] = self.erreurs.get(endpoint, 0) + 1
+
+
+def percentile(valeurs: List[float], p: float) -> float:
+    """Percentile par la méthode du rang le plus proche (valeurs déjà triées)"""
+    if not valeurs:
+        return 0.0
+    return valeurs[max(1, math.ceil(p / 100 * len(valeurs))) - 1]
+
+
+async def client(hote: str, port: int, trafic: GenerateurTrafic, mesures: Mesures,
+                 fin: float, compteur: List[int], limite: Optional[int]):
+    """Un client : enchaîne les requêtes sur une connexion persistante jusqu'à la fin du test"""
+    connexion = ConnexionHTTP(hote, port)
+    try:
+        while time.perf_counter() < fin:
+            if limite is not None:
+                if compteur[0] >= limite:
+                    break
+                compteur[0] += 1
+
+            endpoint, chemin, corps = trafic.requete()
+            debut = time.perf_counter()
+            try:
+                code, taille = await connexion.post(chemin, corps)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+                mesures.erreur(endpoint)
+                await connexion.fermer()
+                continue
+            mesures.ajouter(endpoint, time.perf_counter() - debut, code, taille)
+    finally:
+        await connexion.fermer()
+
+
+async def executer_charge(hote: str, port: int, clients: int, duree: float,
+                          requetes: Optional[int], trafic: GenerateurTrafic) -> Tuple[Mesures, float]:
+    """Lance les clients concurrents et attend la fin du test"""
+    mesures = Mesures()
+    compteur = [0]
+    debut = time.perf_counter()
+    fin = debut + duree
+    await asyncio.gather(*(
+        client(hote, port, trafic, mesures, fin, compteur, requetes) for _ in range(clients)
+    ))
+    return mesures, time.perf_counter() - debut
+
+
+def demarrer_serveur_local(workers: int = None, delai: float = 30.0) -> Tuple[str, int, subprocess.Popen]:
+    """
+    Démarre serveur_production.py sur un port libre de 127.0.0.1, dans un processus séparé
+
+    Attend que le serveur annonce son port puis accepte les connexions.
+
+    Args:
+        workers: Nombre de processus web (défaut: celui de serveur_production.py)
+        delai: Temps maximal d'attente du démarrage (secondes)
+
+    Returns:
+        Tuple (hôte, port, processus) ; arreter_serveur_local(processus) pour l'arrêter
+    """
+    commande = [sys.executable, "-u", os.path.join(os.path.dirname(os.path.abspath(__file__)), "serveur_production.py"),
+                "--hote", "127.0.0.1", "--port", "0"]
+    if workers:
+        commande += ["--workers", str(workers)]
+    processus = subprocess.Popen(commande, stdout=subprocess.PIPE, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+    echeance = time.monotonic() + delai
+    try:
+        # Première ligne : "🚀 ... http://127.0.0.1:<port>"
+        annonce = processus.stdout.readline()
+        trouve = re.search(r"http://[^\s:/]+:(\d+)", annonce)
+        if trouve is None:
+            raise RuntimeError(f"Le serveur local n'a pas démarré : {annonce.strip() or 'aucune sortie'}")
+        port = int(trouve.group(1))
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > echeance or processus.poll() is not None:
+                    raise RuntimeError("Le serveur local ne répond pas")
+                time.sleep(0.1)
+    except BaseException:
+        arreter_serveur_local(processus)
+        raise
+    return "127.0.0.1", port, processus
+
+
+def arreter_serveur_local(processus: subprocess.Popen):
+    """Arrête le serveur local (SIGTERM, relayé par le maître à ses workers)"""
+    processus.terminate()
+    try:
+        processus.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        processus.kill()
+        processus.wait()
+
+
+def afficher_rapport(mesures: Mesures, duree: float) -> Dict:
+    """Affiche et retourne le débit et les percentiles de latence par endpoint"""
+    rapport = {}
+    total = sum(len(l) for l in mesures.latences.values())
+    print(f"\n📊 {total} requêtes en {duree:.1f} s — {total / duree:.0f} req/s au total\n")
+    print(f"{'endpoint':15s} {'requêtes':>9s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} "
+          f"{'p99 ms':>8s} {'max ms':>8s} {'erreurs':>8s}")
+
+    for endpoint in sorted(set(mesures.latences) | set(mesures.erreurs)):
+        latences = sorted(mesures.latences.get(endpoint, []))
+        ligne = {
+            "requetes": len(latences),
+            "debit": len(latences) / duree,
+            "p50_ms": percentile(latences, 50) * 1000,
+            "p95_ms": percentile(latences, 95) * 1000,
+            "p99_ms": percentile(latences, 99) * 1000,
+            "max_ms": (latences[-1] if latences else 0.0) * 1000,
+            "erreurs": mesures.erreurs.get(endpoint, 0),
+            "octets_recus": mesures.octets.get(endpoint, 0)
+        }
+        rapport[endpoint] = ligne
+        print(f"{endpoint:15s} {ligne['requetes']:9d} {ligne['debit']:8.1f} {ligne['p50_ms']:8.2f} "
+              f"{ligne['p95_ms']:8.2f} {ligne['p99_ms']:8.2f} {ligne['max_ms']:8.2f} {ligne['erreurs']:8d}")
+
+    return rapport
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Test de charge local de l'API Flask")
+    parser.add_argument("--url", type=str, default=None,
+                        help="Serveur à tester (défaut: démarre serveur_production.py localement)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus web du serveur local (défaut: nombre de cœurs)")
+    parser.add_argument("--clients", type=int, default=16, help="Clients concurrents (défaut: 16)")
+    parser.add_argument("--duree", type=float, default=10.0, help="Durée du test en secondes (défaut: 10)")
+    parser.add_argument("--requetes", type=int, default=None, help="Arrêter après N requêtes")
+    parser.add_argument("--taches-schedule", type=int, default=5000,
+                        help="Nombre de lignes des corps /schedule (défaut: 5000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None, help="Rapport JSON à écrire")
+    args = parser.parse_args()
+
+    serveur = None
+    if args.url:
+        cible = urlsplit(args.url)
+        hote, port = cible.hostname, cible.port or 80
+    else:
+        hote, port, serveur = demarrer_serveur_local(args.workers)
+
+    print(f"🔥 Test de charge sur http://{hote}:{port} — {args.clients} clients, "
+          f"{args.duree:.0f} s" + (f", {args.requetes} requêtes max" if args.requetes else ""))
+
+    trafic = GenerateurTrafic(seed=args.seed, taches_schedule=args.taches_schedule)
+    try:
+        mesures, duree = asyncio.run(
+            executer_charge(hote, port, args.clients, args.duree, args.requetes, trafic)
+        )
+    finally:
+        if serveur is not None:
+            arreter_serveur_local(serveur)
+
+    rapport = afficher_rapport(mesures, duree)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"clients": args.clients, "duree": duree, "endpoints": rapport}, f, indent=2)
+        print(f"\n📁 Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Construction des fichiers statiques de production
+Copie chaque fichier de static/ sous un nom contenant l'empreinte de son contenu
+(static/dist/script.3f2a9c1b0d4e.js), avec ses variantes précompressées .gz et .br,
+et écrit le manifeste utilisé par le template (asset_url)
+
+Usage:
+    python construire_statiques.py
+    python construire_statiques.py --static static --sortie dist
+
+Les fichiers empreintés ne changent jamais de contenu : ils sont servis avec un cache
+d'un an (immutable). Une nouvelle version produit un nouveau nom, référencé par le manifeste.
+La variante brotli n'est produite que si le module brotli est installé.
+
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+
+DOSSIER_SORTIE = "dist"
+MANIFESTE = "manifest.json"
+
+# Fichiers texte : précompressés, et leurs références à d'autres fichiers statiques réécrites
+EXTENSIONS_TEXTE = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+
+LONGUEUR_EMPREINTE = 12
+
+
+def empreinte(contenu: bytes) -> str:
+    """Empreinte courte du contenu (sha256 tronqué)"""
+    return hashlib.sha256(contenu).hexdigest()[:LONGUEUR_EMPREINTE]
+
+
+def nom_empreinte(chemin: str, contenu: bytes) -> str:
+    """'css/style.css' -> 'css/style.<empreinte>.css'"""
+    base, extension = os.path.splitext(chemin)
+    return f"{base}.{empreinte(contenu)}{extension}"
+
+
+def _ecrire(chemin: str, contenu: bytes):
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin, "wb") as f:
+        f.write(contenu)
+
+
+def _ecrire_variantes(chemin: str, contenu: bytes) -> list:
+    """Écrit le fichier et, s'il s'agit de texte, ses versions .gz et .br"""
+    _ecrire(chemin, contenu)
+    ecrits = [chemin]
+    if os.path.splitext(chemin)[1] in EXTENSIONS_TEXTE:
+        # mtime=0 : même entrée, mêmes octets (constructions reproductibles)
+        _ecrire(chemin + ".gz", gzip.compress(contenu, compresslevel=9, mtime=0))
+        ecrits.append(chemin + ".gz")
+        if brotli is not None:
+            _ecrire(chemin + ".br", brotli.compress(contenu, quality=11))
+            ecrits.append(chemin + ".br")
+    return ecrits
+
+
+def construire(dossier_static: str = "static", sortie: str = DOSSIER_SORTIE) -> Dict[str, str]:
+    """
+    Construit static/<sortie> et son manifeste
+
+    Les fichiers binaires sont traités d'abord : les fichiers texte qui les référencent
+    (url('/static/assets/background.jpg') dans style.css) pointent ainsi vers leur nom
+    empreinté. Les fichiers obsolètes des constructions précédentes sont supprimés.
+
+    Returns:
+        Le manifeste {chemin source: chemin empreinté}, relatifs à dossier_static
+    """
+    dossier_sortie = os.path.join(dossier_static, sortie)
+    sources = []
+    for racine, dossiers, fichiers in os.walk(dossier_static):
+        if os.path.abspath(racine) == os.path.abspath(dossier_sortie):
+            dossiers[:] = []
+            continue
+        dossiers[:] = [d for d in dossiers
+                       if os.path.abspath(os.path.join(racine, d)) != os.path.abspath(dossier_sortie)]
+        for fichier in fichiers:
+            chemin = os.path.relpath(os.path.join(racine, fichier), dossier_static).replace(os.sep, "/")
+            sources.append(chemin)
+
+    # Binaires d'abord, puis texte ; ordre stable pour une sortie reproductible
+    sources.sort(key=lambda chemin: (os.path.splitext(chemin)[1] in EXTENSIONS_TEXTE, chemin))
+
+    manifeste: Dict[str, str] = {}
+    produits = set()
+    for chemin in sources:
+        with open(os.path.join(dossier_static, chemin), "rb") as f:
+            contenu = f.read()
+
+        if os.path.splitext(chemin)[1] in EXTENSIONS_TEXTE:
+            for source, cible in manifeste.items():
+                contenu = contenu.replace(f"/static/{source}".encode(), f"/static/{cible}".encode())
+
+        cible = f"{sortie}/{nom_empreinte(chemin, contenu)}"
+        manifeste[chemin] = cible
+        for ecrit in _ecrire_variantes(os.path.join(dossier_static, cible), contenu):
+            produits.add(os.path.abspath(ecrit))
+
+    chemin_manifeste = os.path.join(dossier_sortie, MANIFESTE)
+    _ecrire(chemin_manifeste, json.dumps(manifeste, indent=2, sort_keys=True).encode())
+    produits.add(os.path.abspath(chemin_manifeste))
+
+    for racine, _, fichiers in os.walk(dossier_sortie):
+        for fichier in fichiers:
+            chemin = os.path.abspath(os.path.join(racine, fichier))
+            if chemin not in produits:
+                os.remove(chemin)
+
+    return manifeste
+
+
+def charger_manifeste(dossier_static: str, sortie: str = DOSSIER_SORTIE) -> Optional[Dict[str, str]]:
+    """Manifeste de la dernière construction, ou None si les statiques n'ont pas été construits"""
+    try:
+        with open(os.path.join(dossier_static, sortie, MANIFESTE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Construction des fichiers statiques empreintés")
+    parser.add_argument("--static", type=str, default="static", help="Dossier des fichiers statiques")
+    parser.add_argument("--sortie", type=str, default=DOSSIER_SORTIE,
+                        help="Sous-dossier de sortie (défaut: dist)")
+    args = parser.parse_args()
+
+    manifeste = construire(args.static, args.sortie)
+    for source, cible in sorted(manifeste.items()):
+        print(f"   • {source:30s} -> {cible}")
+    variantes = "gzip + brotli" if brotli is not None else "gzip (brotli non installé)"
+    print(f"✅ {len(manifeste)} fichiers construits dans {os.path.join(args.static, args.sortie)} ({variantes})")
+
+
+if __name__ == "__main__":
+    main()
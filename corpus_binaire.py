@@ -0,0 +1,337 @@
+"""
+Format binaire de corpus d'instances, lisible par mmap
+Évite de re-parser de gros fichiers JSON avant chaque benchmark
+
+Structure du fichier (petit-boutiste, sections alignées sur 8 octets) :
+
+    En-tête         magic "KLBC", version, nombre d'instances, nombre total de plats,
+                    nombre de chaînes, offsets des sections, index de la chaîne metadata
+    Table d'offsets une entrée par instance (chaînes nom/description/difficulté/extra,
+                    nombre de commis, nombre de plats, premier nom de plat, index dans les colonnes)
+    Colonnes        int32 temps_epluchage de tous les plats, puis int32 temps_cuisson
+    Table de chaînes uint64 offsets[nombre_chaines + 1] puis les chaînes UTF-8 concaténées
+
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from instance_generator import Instance
+
+
+MAGIC = b"KLBC"
+VERSION = 1
+
+# magic, version, réservé, nb_instances, nb_plats_total, nb_chaines,
+# offset_table, offset_epluchage, offset_cuisson, offset_chaines, chaine_metadata
+ENTETE = struct.Struct("<4sHHIQQQQQQQ")
+
+# nom, description, difficulte, extra (index de chaînes), nombre_commis,
+# nombre_plats, premier nom de plat (index de chaîne), premier plat dans les colonnes
+ENTREE = struct.Struct("<IIIIIIQQ")
+
+CHAMPS_STANDARD = ("nom", "description", "plats", "nombre_commis", "difficulte", "statistiques")
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _aligner(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def _colonne_int32(valeurs: array) -> bytes:
+    if sys.byteorder != "little":
+        valeurs = array("i", valeurs)
+        valeurs.byteswap()
+    return valeurs.tobytes()
+
+
+def ecrire_corpus(instances: List[Dict], fichier: str, metadata: Dict = None):
+    """
+    Écrit une liste d'instances (format JSON habituel) dans un corpus binaire
+
+    Args:
+        instances: Instances au format dictionnaire (comme dans les fichiers JSON)
+        fichier: Chemin du fichier binaire de sortie
+        metadata: Métadonnées du corpus (conservées pour la conversion inverse)
+    """
+    chaines: List[bytes] = []
+    index_chaines: Dict[str, int] = {}
+
+    def chaine(texte: str) -> int:
+        # Les chaînes répétées (difficultés, noms de plats communs...) ne sont stockées qu'une fois
+        if texte not in index_chaines:
+            index_chaines[texte] = len(chaines)
+            chaines.append(texte.encode("utf-8"))
+        return index_chaines[texte]
+
+    index_metadata = chaine(json.dumps(metadata or {}, ensure_ascii=False))
+
+    epluchage = array("i")
+    cuisson = array("i")
+    entrees = []
+
+    for instance in instances:
+        plats = instance["plats"]
+        extra = {k: v for k, v in instance.items() if k not in CHAMPS_STANDARD}
+        entree = [
+            chaine(instance["nom"]),
+            chaine(instance.get("description", "")),
+            chaine(instance.get("difficulte", "")),
+            chaine(json.dumps(extra, ensure_ascii=False) if extra else ""),
+            instance["nombre_commis"],
+            len(plats),
+            0,
+            len(epluchage)
+        ]
+
+        # Les noms de plats d'une instance sont consécutifs dans la table de chaînes
+        entree[6] = len(chaines)
+        for plat in plats:
+            chaines.append(plat["nom"].encode("utf-8"))
+            for colonne, cle in ((epluchage, "temps_epluchage"), (cuisson, "temps_cuisson")):
+                valeur = plat[cle]
+                if valeur != int(valeur) or not INT32_MIN <= valeur <= INT32_MAX:
+                    raise ValueError(
+                        f"Instance {instance['nom']}, plat {plat['nom']}: "
+                        f"{cle} doit être un entier 32 bits ({valeur})"
+                    )
+                colonne.append(int(valeur))
+
+        entrees.append(ENTREE.pack(*entree))
+
+    nb_plats = len(epluchage)
+    offset_table = _aligner(ENTETE.size)
+    offset_epluchage = _aligner(offset_table + ENTREE.size * len(entrees))
+    offset_cuisson = _aligner(offset_epluchage + 4 * nb_plats)
+    offset_chaines = _aligner(offset_cuisson + 4 * nb_plats)
+
+    offsets_chaines = array("Q", [0])
+    for donnees in chaines:
+        offsets_chaines.append(offsets_chaines[-1] + len(donnees))
+    if sys.byteorder != "little":
+        offsets_chaines.byteswap()
+
+    entete = ENTETE.pack(
+        MAGIC, VERSION, 0, len(entrees), nb_plats, len(chaines),
+        offset_table, offset_epluchage, offset_cuisson, offset_chaines, index_metadata
+    )
+
+    with open(fichier, "wb") as f:
+        def ecrire_a(position: int, donnees: bytes):
+            f.write(b"\0" * (position - f.tell()))
+            f.write(donnees)
+
+        ecrire_a(0, entete)
+        ecrire_a(offset_table, b"".join(entrees))
+        ecrire_a(offset_epluchage, _colonne_int32(epluchage))
+        ecrire_a(offset_cuisson, _colonne_int32(cuisson))
+        ecrire_a(offset_chaines, offsets_chaines.tobytes())
+        f.writelines(chaines)
+
+
+class VueInstance:
+    """
+    Vue sans copie sur une instance d'un corpus binaire
+
+    temps_epluchage et temps_cuisson sont des memoryview int32 directement
+    adossées au fichier mappé en mémoire.
+    """
+
+    def __init__(self, corpus: "CorpusBinaire", index: int):
+        (nom, description, difficulte, extra,
+         self.nombre_commis, self.nombre_plats,
+         self._premier_nom, premier_plat) = corpus._entree(index)
+
+        self._corpus = corpus
+        self.nom = corpus.chaine(nom)
+        self.description = corpus.chaine(description)
+        self.difficulte = corpus.chaine(difficulte)
+        self._extra = extra
+
+        fin = premier_plat + self.nombre_plats
+        self.temps_epluchage = corpus._epluchage[premier_plat:fin]
+        self.temps_cuisson = corpus._cuisson[premier_plat:fin]
+
+    def nom_plat(self, j: int) -> str:
+        """Nom du j-ième plat de l'instance"""
+        return self._corpus.chaine(self._premier_nom + j)
+
+    def convertir_pour_algorithme(self) -> tuple:
+        """Même sortie que InstanceManager.convertir_instance_pour_algorithme"""
+        tasks = {
+            self.nom_plat(j): self.temps_epluchage[j] + self.temps_cuisson[j]
+            for j in range(self.nombre_plats)
+        }
+        return tasks, self.nombre_commis
+
+    def to_dict(self) -> Dict:
+        """Reconstruit l'instance au format JSON habituel (avec statistiques)"""
+        plats = [
+            {
+                "nom": self.nom_plat(j),
+                "temps_epluchage": self.temps_epluchage[j],
+                "temps_cuisson": self.temps_cuisson[j]
+            }
+            for j in range(self.nombre_plats)
+        ]
+        donnees = Instance(
+            nom=self.nom,
+            description=self.description,
+            plats=plats,
+            nombre_commis=self.nombre_commis,
+            difficulte=self.difficulte
+        ).to_dict()
+
+        extra = self._corpus.chaine(self._extra)
+        if extra:
+            donnees.update(json.loads(extra))
+        return donnees
+
+
+class CorpusBinaire:
+    """Lecteur de corpus binaire par mmap : ouverture instantanée, accès O(1) à chaque instance"""
+
+    def __init__(self, fichier: str):
+        """
+        Ouvre un corpus binaire
+
+        Args:
+            fichier: Chemin du fichier écrit par ecrire_corpus
+        """
+        self.fichier = fichier
+        with open(fichier, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._vue = memoryview(self._mmap)
+
+        (magic, version, _, self.nombre_instances, nb_plats, nb_chaines,
+         self._offset_table, offset_epluchage, offset_cuisson, offset_chaines,
+         self._index_metadata) = ENTETE.unpack_from(self._vue, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{fichier} n'est pas un corpus binaire")
+        if version != VERSION:
+            raise ValueError(f"Version de corpus non supportée: {version}")
+        if sys.byteorder != "little":
+            raise ValueError("Le lecteur mmap nécessite une machine petit-boutiste")
+
+        self._epluchage = self._vue[offset_epluchage:offset_epluchage + 4 * nb_plats].cast("i")
+        self._cuisson = self._vue[offset_cuisson:offset_cuisson + 4 * nb_plats].cast("i")
+        fin_offsets = offset_chaines + 8 * (nb_chaines + 1)
+        self._offsets_chaines = self._vue[offset_chaines:fin_offsets].cast("Q")
+        self._debut_texte = fin_offsets
+        self._index_noms: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.nombre_instances
+
+    def __getitem__(self, index: int) -> VueInstance:
+        return self.instance(index)
+
+    def __iter__(self):
+        for index in range(self.nombre_instances):
+            yield VueInstance(self, index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Libère les vues et le mapping mémoire
+
+        Si des VueInstance sont encore utilisées, le mapping reste valide
+        et sera libéré avec la dernière d'entre elles.
+        """
+        for vue in (self._epluchage, self._cuisson, self._offsets_chaines, self._vue):
+            vue.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def _entree(self, index: int) -> tuple:
+        if not 0 <= index < self.nombre_instances:
+            raise IndexError(f"Instance {index} hors du corpus ({self.nombre_instances})")
+        return ENTREE.unpack_from(self._vue, self._offset_table + index * ENTREE.size)
+
+    def chaine(self, index: int) -> str:
+        """Décode la chaîne numéro index de la table de chaînes"""
+        debut = self._debut_texte + self._offsets_chaines[index]
+        fin = self._debut_texte + self._offsets_chaines[index + 1]
+        return str(self._vue[debut:fin], "utf-8")
+
+    @property
+    def metadata(self) -> Dict:
+        return json.loads(self.chaine(self._index_metadata))
+
+    def instance(self, index: int) -> VueInstance:
+        """Vue sans copie sur l'instance numéro index, en O(1)"""
+        return VueInstance(self, index)
+
+    def instance_par_nom(self, nom: str) -> Optional[VueInstance]:
+        """Recherche par nom (l'index des noms est construit au premier appel)"""
+        if self._index_noms is None:
+            self._index_noms = {
+                self.chaine(self._entree(i)[0]): i for i in range(self.nombre_instances)
+            }
+        index = self._index_noms.get(nom)
+        return None if index is None else VueInstance(self, index)
+
+
+def json_vers_corpus(fichier_json: str, fichier_binaire: str) -> int:
+    """
+    Convertit un fichier d'instances JSON en corpus binaire
+
+    Returns:
+        Nombre d'instances converties
+    """
+    with open(fichier_json, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    instances = data.get("instances", [])
+    ecrire_corpus(instances, fichier_binaire, data.get("metadata", {}))
+    return len(instances)
+
+
+def corpus_vers_json(fichier_binaire: str, fichier_json: str) -> int:
+    """
+    Convertit un corpus binaire en fichier JSON (même format que sauvegarder_instances)
+
+    Returns:
+        Nombre d'instances converties
+    """
+    with CorpusBinaire(fichier_binaire) as corpus:
+        data = {
+            "metadata": corpus.metadata,
+            "instances": [vue.to_dict() for vue in corpus]
+        }
+    with open(fichier_json, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return len(data["instances"])
+
+
+def main():
+    """Point d'entrée : conversion JSON <-> binaire"""
+    parser = argparse.ArgumentParser(description="Conversion de corpus d'instances JSON <-> binaire")
+    parser.add_argument("sens", choices=["vers-binaire", "vers-json"])
+    parser.add_argument("entree", help="Fichier source")
+    parser.add_argument("sortie", help="Fichier destination")
+    args = parser.parse_args()
+
+    if args.sens == "vers-binaire":
+        nombre = json_vers_corpus(args.entree, args.sortie)
+    else:
+        nombre = corpus_vers_json(args.entree, args.sortie)
+
+    print(f"✅ {nombre} instance(s) converties: {args.entree} -> {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ VERSION WINDOWS
 import json
 import os
 
+from statistiques import resume_statistiques
+
 # Instance basée sur l'Exemple 1 du sujet
 EXEMPLE_1 = {
     "nom": "exemple_1_sujet",
@@ -109,17 +111,7 @@ def generer_fichier_instances_reference():
     ]
     
     for instance in instances:
-        plats = instance["plats"]
-        temps_totaux = [p["temps_epluchage"] + p["temps_cuisson"] for p in plats]
-        
-        instance["statistiques"] = {
-            "nombre_plats": len(plats),
-            "temps_total_travail": sum(temps_totaux),
-            "temps_moyen_par_plat": sum(temps_totaux) // len(plats) if plats else 0,
-            "temps_max_plat": max(temps_totaux) if temps_totaux else 0,
-            "temps_min_plat": min(temps_totaux) if temps_totaux else 0,
-            "charge_theorique_par_commis": sum(temps_totaux) // instance["nombre_commis"] if instance["nombre_commis"] > 0 else 0
-        }
+        instance["statistiques"] = resume_statistiques(instance["plats"], instance["nombre_commis"])
     
     data = {
         "metadata": {
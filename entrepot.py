@@ -0,0 +1,258 @@
+"""
+Entrepôt local des résultats d'expériences (SQLite)
+Chaque résolution mesurée par benchmark.py ou generate_batch.py y est enregistrée
+(empreinte de l'instance, algorithme, paramètres, makespan, borne, temps), pour
+être interrogée ou exportée en CSV sans rien relancer
+
+Usage:
+    python entrepot.py --executions
+    python entrepot.py --resume --algorithme greedy --n-min 1000
+    python entrepot.py --exporter resultats.csv --difficulte difficile
+
+Le fichier est ouvert en mode WAL : une lecture (requête, export) n'est pas bloquée
+par une expérience en cours d'écriture. Les insertions sont groupées par transactions.
+
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+FICHIER_DEFAUT = os.path.join("benchmarks", "resultats.sqlite")
+
+# Lignes insérées par transaction
+TAILLE_LOT = 10000
+
+COLONNES = [
+    "execution", "instance_hash", "instance", "profil", "difficulte", "n", "m", "algorithme",
+    "makespan", "borne", "ratio", "temps_min_ms", "temps_p50_ms", "temps_p90_ms", "temps_max_ms",
+    "parametres"
+]
+POSITION_RATIO = COLONNES.index("ratio")
+
+# Cache de pages (64 Mio) : les index restent en mémoire pendant les gros imports
+CACHE_KIO = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    parametres TEXT
+);
+CREATE TABLE IF NOT EXISTS resultats (
+    id INTEGER PRIMARY KEY,
+    execution INTEGER NOT NULL REFERENCES executions(id),
+    instance_hash TEXT NOT NULL,
+    instance TEXT,
+    profil TEXT,
+    difficulte TEXT,
+    n INTEGER NOT NULL,
+    m INTEGER NOT NULL,
+    algorithme TEXT NOT NULL,
+    makespan INTEGER NOT NULL,
+    borne INTEGER,
+    ratio REAL,
+    temps_min_ms REAL,
+    temps_p50_ms REAL,
+    temps_p90_ms REAL,
+    temps_max_ms REAL,
+    parametres TEXT
+);
+CREATE INDEX IF NOT EXISTS resultats_algorithme_n_m ON resultats (algorithme, n, m);
+CREATE INDEX IF NOT EXISTS resultats_difficulte ON resultats (difficulte, algorithme);
+CREATE INDEX IF NOT EXISTS resultats_instance ON resultats (instance_hash);
+CREATE INDEX IF NOT EXISTS resultats_execution ON resultats (execution);
+"""
+
+
+def empreinte_instance(temps: Sequence[int]) -> str:
+    """Empreinte des durées d'une instance, indépendante des noms et de l'ordre des tâches"""
+    return hashlib.blake2b(array("q", sorted(temps, reverse=True)).tobytes(), digest_size=16).hexdigest()
+
+
+class EntrepotResultats:
+    """Base SQLite des résultats, une ligne par (instance, algorithme, nombre de commis)"""
+
+    def __init__(self, fichier: str = FICHIER_DEFAUT):
+        dossier = os.path.dirname(fichier)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self.fichier = fichier
+        self.connexion = sqlite3.connect(fichier)
+        self.connexion.row_factory = sqlite3.Row
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        # En WAL, NORMAL ne perd au pire que les dernières transactions en cas de coupure
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.execute(f"PRAGMA cache_size=-{CACHE_KIO}")
+        self.connexion.executescript(SCHEMA)
+
+    def fermer(self):
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def nouvelle_execution(self, source: str, parametres: Dict = None) -> int:
+        """Enregistre une expérience (script et paramètres) et retourne son identifiant"""
+        with self.connexion:
+            curseur = self.connexion.execute(
+                "INSERT INTO executions (date, source, parametres) VALUES (?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"), source,
+                 json.dumps(parametres or {}, sort_keys=True))
+            )
+        return curseur.lastrowid
+
+    def inserer(self, execution: int, resultats: Iterable[Dict]) -> int:
+        """
+        Insère des résultats par transactions de TAILLE_LOT lignes
+
+        Args:
+            execution: Identifiant retourné par nouvelle_execution
+            resultats: Dictionnaires aux clés de COLONNES (hors 'execution') ;
+                       les clés absentes valent NULL, 'parametres' peut être un dict
+
+        Returns:
+            Le nombre de lignes insérées
+        """
+        requete = "INSERT INTO resultats ({}) VALUES ({})".format(
+            ", ".join(COLONNES), ", ".join("?" * len(COLONNES)))
+        champs = COLONNES[1:]
+        total = 0
+        lot = []
+        for resultat in resultats:
+            ligne = [execution]
+            ligne.extend([resultat.get(colonne) for colonne in champs])
+            if ligne[POSITION_RATIO] is None and resultat.get("borne"):
+                ligne[POSITION_RATIO] = round(resultat["makespan"] / resultat["borne"], 6)
+            parametres = ligne[-1]
+            if parametres is not None and not isinstance(parametres, str):
+                ligne[-1] = json.dumps(parametres, sort_keys=True)
+            lot.append(ligne)
+            if len(lot) >= TAILLE_LOT:
+                total += self._inserer_lot(requete, lot)
+                lot = []
+        if lot:
+            total += self._inserer_lot(requete, lot)
+        return total
+
+    def _inserer_lot(self, requete: str, lot: List[list]) -> int:
+        with self.connexion:
+            self.connexion.executemany(requete, lot)
+        return len(lot)
+
+    @staticmethod
+    def _filtres(algorithme: str = None, difficulte: str = None, profil: str = None,
+                 n: int = None, n_min: int = None, n_max: int = None, m: int = None,
+                 execution: int = None, instance_hash: str = None) -> tuple:
+        """Clause WHERE et paramètres (seuls les filtres fournis sont appliqués)"""
+        conditions, valeurs = [], []
+        for colonne, operateur, valeur in (
+            ("algorithme", "=", algorithme), ("difficulte", "=", difficulte), ("profil", "=", profil),
+            ("n", "=", n), ("n", ">=", n_min), ("n", "<=", n_max), ("m", "=", m),
+            ("execution", "=", execution), ("instance_hash", "=", instance_hash)
+        ):
+            if valeur is not None:
+                conditions.append(f"{colonne} {operateur} ?")
+                valeurs.append(valeur)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", valeurs
+
+    def iterer(self, limite: Optional[int] = None, **filtres) -> Iterator[sqlite3.Row]:
+        """Résultats filtrés (voir _filtres), dans l'ordre d'insertion, sans tout charger en mémoire"""
+        clause, valeurs = self._filtres(**filtres)
+        requete = f"SELECT {', '.join(COLONNES)} FROM resultats{clause} ORDER BY id"
+        if limite is not None:
+            requete += " LIMIT ?"
+            valeurs.append(limite)
+        return iter(self.connexion.execute(requete, valeurs))
+
+    def requete(self, limite: Optional[int] = None, **filtres) -> List[Dict]:
+        """Résultats filtrés, sous forme de dictionnaires"""
+        return [dict(ligne) for ligne in self.iterer(limite, **filtres)]
+
+    def resume(self, **filtres) -> List[Dict]:
+        """Agrégats par algorithme et difficulté : nombre, ratio moyen et maximal, temps médian moyen"""
+        clause, valeurs = self._filtres(**filtres)
+        lignes = self.connexion.execute(
+            "SELECT algorithme, difficulte, COUNT(*) AS nombre, AVG(ratio) AS ratio_moyen, "
+            "MAX(ratio) AS ratio_max, AVG(temps_p50_ms) AS temps_p50_moyen_ms "
+            f"FROM resultats{clause} GROUP BY algorithme, difficulte ORDER BY algorithme, difficulte",
+            valeurs
+        )
+        return [dict(ligne) for ligne in lignes]
+
+    def executions(self) -> List[Dict]:
+        """Expériences enregistrées, avec leur nombre de résultats"""
+        lignes = self.connexion.execute(
+            "SELECT e.id, e.date, e.source, e.parametres, "
+            "(SELECT COUNT(*) FROM resultats r WHERE r.execution = e.id) AS resultats "
+            "FROM executions e ORDER BY e.id"
+        )
+        return [dict(ligne) for ligne in lignes]
+
+    def exporter_csv(self, fichier: str, **filtres) -> int:
+        """Exporte les résultats filtrés en CSV (en flux) ; retourne le nombre de lignes"""
+        total = 0
+        with open(fichier, "w", newline="", encoding="utf-8") as f:
+            ecrivain = csv.writer(f)
+            ecrivain.writerow(COLONNES)
+            for ligne in self.iterer(**filtres):
+                ecrivain.writerow(tuple(ligne))
+                total += 1
+        return total
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Interrogation de l'entrepôt des résultats")
+    parser.add_argument("--fichier", type=str, default=FICHIER_DEFAUT)
+    parser.add_argument("--executions", action="store_true", help="Lister les expériences enregistrées")
+    parser.add_argument("--resume", action="store_true", help="Agrégats par algorithme et difficulté")
+    parser.add_argument("--exporter", type=str, default=None, help="Fichier CSV à écrire")
+    parser.add_argument("--algorithme", type=str, default=None)
+    parser.add_argument("--difficulte", type=str, default=None)
+    parser.add_argument("--profil", type=str, default=None)
+    parser.add_argument("--n", type=int, default=None)
+    parser.add_argument("--n-min", type=int, default=None)
+    parser.add_argument("--n-max", type=int, default=None)
+    parser.add_argument("--m", type=int, default=None)
+    parser.add_argument("--execution", type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fichier):
+        print(f"❌ Entrepôt introuvable: {args.fichier}")
+        sys.exit(1)
+
+    filtres = {
+        "algorithme": args.algorithme, "difficulte": args.difficulte, "profil": args.profil,
+        "n": args.n, "n_min": args.n_min, "n_max": args.n_max, "m": args.m, "execution": args.execution
+    }
+    with EntrepotResultats(args.fichier) as entrepot:
+        if args.executions:
+            for execution in entrepot.executions():
+                print(f"   • #{execution['id']} {execution['date']} {execution['source']:15s} "
+                      f"{execution['resultats']} résultat(s)  {execution['parametres']}")
+        if args.resume:
+            for ligne in entrepot.resume(**filtres):
+                temps = ligne["temps_p50_moyen_ms"]
+                print(f"   • {ligne['algorithme']:7s} {str(ligne['difficulte']):10s} {ligne['nombre']:>8d} résultat(s)  "
+                      f"ratio moyen={ligne['ratio_moyen'] or 0:.4f} max={ligne['ratio_max'] or 0:.4f}"
+                      + (f"  p50 moyen={temps:.3f} ms" if temps is not None else ""))
+        if args.exporter:
+            total = entrepot.exporter_csv(args.exporter, **filtres)
+            print(f"✅ {total} ligne(s) exportée(s) dans {args.exporter}")
+
+
+if __name__ == "__main__":
+    main()
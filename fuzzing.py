@@ -0,0 +1,352 @@
+"""
+Fuzzing différentiel des ordonnanceurs
+Tire des instances (InstanceGenerator + mutations), vérifie chaque moteur de algorithms.py
+(validité de l'affectation, cohérence du makespan, bornes inférieures, accord entre
+variantes, optimum exact sur les petites instances) et réduit chaque échec à un
+reproducteur minimal
+
+Usage:
+    python fuzzing.py --iterations 5000 --seed 1
+    python fuzzing.py --iterations 200 --max-plats 40 --sortie echecs.ndjson
+
+Chaque tirage a sa propre graine ("<seed>:<itération>") : un échec se rejoue à l'identique.
+Les moteurs sont lus dans SCHEDULERS et SCHEDULERS_COMPACTS : un nouvel ordonnanceur
+enregistré est vérifié sans modifier ce fichier.
+
+"""
+
+import argparse
+import json
+import random
+import sys
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence
+
+from algorithms import (
+    SCHEDULERS, SCHEDULERS_COMPACTS, greedy_scheduler, makespan_curve,
+    makespan_lower_bound, min_workers_for_makespan
+)
+from instance_generator import InstanceGenerator
+from oracle import MAX_TACHES_ORACLE, optimum_exhaustif
+
+
+# Garanties d'approximation connues, par nom d'ordonnanceur : LPT (Graham 1969)
+# respecte makespan <= (4/3 - 1/(3m)) × optimum
+GARANTIES = {
+    "greedy": lambda makespan, optimum, m: 3 * m * makespan <= (4 * m - 1) * optimum,
+}
+
+GENERATEURS = ["simple", "equilibree", "difficile", "desequilibree"]
+
+# Nombre maximal de candidats essayés pendant la réduction d'un échec
+MAX_ESSAIS_REDUCTION = 20000
+
+
+def en_taches(temps: Sequence[int]) -> Dict[str, int]:
+    """Tâches {nom: temps} dans l'ordre des durées (noms t0, t1, ...)"""
+    return {f"t{i}": t for i, t in enumerate(temps)}
+
+
+def tirer_cas(rng: random.Random, max_plats: int) -> tuple:
+    """
+    Tire un cas de test : une instance de InstanceGenerator, éventuellement mutée
+
+    Les mutations visent les cas limites des implémentations : durées égales (ordre de
+    départage), durées nulles, plus de commis que de tâches, un seul commis, aucune tâche.
+
+    Returns:
+        Tuple (durées, nombre de commis)
+    """
+    nombre_plats = rng.randint(0, max_plats)
+    generateur = InstanceGenerator(seed=rng.getrandbits(32))
+    profil = rng.choice(GENERATEURS)
+    instance = getattr(generateur, f"generer_instance_{profil}")(max(nombre_plats, 1), rng.randint(1, 6))
+    temps = [plat["temps_epluchage"] + plat["temps_cuisson"] for plat in instance.plats][:nombre_plats]
+    nombre_commis = instance.nombre_commis
+
+    mutation = rng.random()
+    if mutation < 0.2:
+        temps = [t // 60 for t in temps]                      # petites valeurs, beaucoup d'égalités
+    elif mutation < 0.3:
+        temps = [rng.choice((0, t)) for t in temps]           # durées nulles
+    elif mutation < 0.4 and temps:
+        temps = [rng.choice(temps[:2]) for _ in temps]        # deux valeurs seulement
+    if rng.random() < 0.15:
+        nombre_commis = rng.choice((1, len(temps) + rng.randint(0, 3) or 1))
+    return temps, nombre_commis
+
+
+def _verifier_workers(workers, makespan, temps, m) -> List[str]:
+    """Validité d'un résultat au format historique ([{'time', 'tasks'}], makespan)"""
+    erreurs = []
+    if len(workers) != m:
+        erreurs.append(f"{len(workers)} travailleurs au lieu de {m}")
+    placees = Counter(tache for worker in workers for tache in worker["tasks"])
+    if placees != Counter(en_taches(temps).items()):
+        erreurs.append("tâches perdues, dupliquées ou altérées")
+    for i, worker in enumerate(workers):
+        somme = sum(t for _, t in worker["tasks"])
+        if worker["time"] != somme:
+            erreurs.append(f"travailleur {i}: time={worker['time']} mais somme des tâches={somme}")
+    attendu = max((worker["time"] for worker in workers), default=0)
+    if makespan != attendu:
+        erreurs.append(f"makespan={makespan} mais charge maximale={attendu}")
+    return erreurs
+
+
+def _verifier_bornes(nom: str, makespan: int, temps, m, optimum: Optional[int]) -> List[str]:
+    erreurs = []
+    borne = makespan_lower_bound(en_taches(temps), m)
+    if makespan < borne:
+        erreurs.append(f"makespan={makespan} sous la borne inférieure {borne}")
+    if optimum is not None:
+        if makespan < optimum:
+            erreurs.append(f"makespan={makespan} sous l'optimum exact {optimum}")
+        garantie = GARANTIES.get(nom)
+        if garantie is not None and not garantie(makespan, optimum, m):
+            erreurs.append(f"makespan={makespan} viole la garantie d'approximation (optimum {optimum})")
+    return erreurs
+
+
+def verifier_ordonnanceur(nom: str) -> Callable:
+    """Vérification d'un ordonnanceur de SCHEDULERS"""
+    def verifier(temps, m, optimum):
+        workers, makespan = SCHEDULERS[nom](en_taches(temps), m)
+        return _verifier_workers(workers, makespan, temps, m) + _verifier_bornes(nom, makespan, temps, m, optimum)
+    return verifier
+
+
+def verifier_compact(nom: str) -> Callable:
+    """Vérification d'un ordonnanceur de SCHEDULERS_COMPACTS, et accord avec sa variante classique"""
+    def verifier(temps, m, optimum):
+        affectation, debuts, charges, makespan = SCHEDULERS_COMPACTS[nom](list(temps), m)
+        erreurs = []
+        if len(affectation) != len(temps) or len(debuts) != len(temps):
+            return [f"{len(affectation)} affectations et {len(debuts)} débuts pour {len(temps)} tâches"]
+        if any(not 0 <= w < m for w in affectation):
+            return ["affectation hors de [0, m)"]
+
+        sommes = [0] * m
+        for w, t in zip(affectation, temps):
+            sommes[w] += t
+        if list(charges) != sommes:
+            erreurs.append(f"charges={list(charges)} mais sommes par travailleur={sommes}")
+        if makespan != max(sommes, default=0):
+            erreurs.append(f"makespan={makespan} mais charge maximale={max(sommes, default=0)}")
+
+        # Les tâches d'un même travailleur s'enchaînent sans chevauchement ni trou
+        intervalles = sorted((affectation[i], debuts[i], debuts[i] + temps[i]) for i in range(len(temps)))
+        fin_precedente = {}
+        for w, debut, fin in intervalles:
+            if debut != fin_precedente.get(w, 0):
+                erreurs.append(f"travailleur {w}: tâche commençant à {debut} au lieu de {fin_precedente.get(w, 0)}")
+                break
+            fin_precedente[w] = fin
+
+        if nom in SCHEDULERS:
+            workers, makespan_classique = SCHEDULERS[nom](en_taches(temps), m)
+            if makespan_classique != makespan:
+                erreurs.append(f"makespan={makespan} mais variante classique={makespan_classique}")
+            if nom == "greedy":
+                classique = {tache: w for w, worker in enumerate(workers) for tache, _ in worker["tasks"]}
+                if [classique[f"t{i}"] for i in range(len(temps))] != list(affectation):
+                    erreurs.append("affectation différente de greedy_scheduler")
+        return erreurs + _verifier_bornes(nom, makespan, temps, m, optimum)
+    return verifier
+
+
+def verifier_courbe(temps, m, optimum):
+    """makespan_curve doit reproduire greedy_scheduler et makespan_lower_bound pour chaque m"""
+    tasks = en_taches(temps)
+    max_workers = m + 2
+    courbe = makespan_curve(tasks, max_workers)
+    if [point["num_workers"] for point in courbe] != list(range(1, max_workers + 1)):
+        return ["points de la courbe incomplets ou désordonnés"]
+    erreurs = []
+    for point in courbe:
+        k = point["num_workers"]
+        attendu = greedy_scheduler(tasks, k)[1]
+        if point["makespan"] != attendu:
+            erreurs.append(f"m={k}: makespan={point['makespan']} mais greedy_scheduler={attendu}")
+        borne = makespan_lower_bound(tasks, k)
+        if point["lower_bound"] != borne:
+            erreurs.append(f"m={k}: lower_bound={point['lower_bound']} mais makespan_lower_bound={borne}")
+        if point["makespan"] < point["lower_bound"]:
+            erreurs.append(f"m={k}: makespan sous la borne inférieure")
+    return erreurs
+
+
+def verifier_min_commis(temps, m, optimum):
+    """min_workers_for_makespan : la cible doit être tenue, par le plus petit nombre de commis"""
+    tasks = en_taches(temps)
+    if not temps:
+        return [] if min_workers_for_makespan(tasks, 0) == 0 else ["0 commis attendu sans tâche"]
+    erreurs = []
+    # Cible déterministe entre la plus longue tâche et le total
+    total, longue = sum(temps), max(temps)
+    for cible in sorted({longue, (longue + total) // 2, total, max(longue - 1, 0)}):
+        resultat = min_workers_for_makespan(tasks, cible)
+        if resultat is None:
+            if longue <= cible and greedy_scheduler(tasks, len(temps))[1] <= cible:
+                erreurs.append(f"cible {cible}: None alors que {len(temps)} commis suffisent")
+            continue
+        makespan = greedy_scheduler(tasks, resultat)[1]
+        if makespan > cible:
+            erreurs.append(f"cible {cible}: {resultat} commis donnent {makespan}")
+        if cible > 0 and resultat < -(-total // cible):
+            erreurs.append(f"cible {cible}: {resultat} commis, sous la borne ⌈total / cible⌉")
+        for moins in range(1, resultat):
+            if greedy_scheduler(tasks, moins)[1] <= cible:
+                erreurs.append(f"cible {cible}: {resultat} commis alors que {moins} suffisent")
+                break
+    return erreurs
+
+
+def verifier_oracle(temps, m, optimum):
+    """L'oracle lui-même : témoin valide, au-dessus de la borne, sous le glouton"""
+    if optimum is None:
+        return []
+    _, affectation = optimum_exhaustif(temps, m)
+    sommes = [0] * m
+    for w, t in zip(affectation, temps):
+        sommes[w] += t
+    erreurs = []
+    if max(sommes, default=0) != optimum:
+        erreurs.append(f"témoin de makespan {max(sommes, default=0)} pour un optimum annoncé {optimum}")
+    if optimum < makespan_lower_bound(en_taches(temps), m):
+        erreurs.append("optimum sous la borne inférieure")
+    if optimum > greedy_scheduler(en_taches(temps), m)[1]:
+        erreurs.append("optimum au-dessus du glouton")
+    return erreurs
+
+
+def verifications() -> Dict[str, Callable]:
+    """Toutes les vérifications, par nom"""
+    resultat = {f"scheduler:{nom}": verifier_ordonnanceur(nom) for nom in SCHEDULERS}
+    resultat.update({f"compact:{nom}": verifier_compact(nom) for nom in SCHEDULERS_COMPACTS})
+    resultat["makespan_curve"] = verifier_courbe
+    resultat["min_workers_for_makespan"] = verifier_min_commis
+    resultat["oracle"] = verifier_oracle
+    return resultat
+
+
+def executer(verification: Callable, temps, m, max_oracle: int) -> List[str]:
+    """Exécute une vérification ; une exception est un échec comme un autre"""
+    try:
+        optimum = optimum_exhaustif(temps, m)[0] if len(temps) <= max_oracle else None
+        return verification(temps, m, optimum)
+    except Exception as e:
+        return [f"exception {type(e).__name__}: {e}"]
+
+
+def reduire(verification: Callable, temps: List[int], m: int, max_oracle: int) -> tuple:
+    """
+    Réduit un cas en échec à un reproducteur minimal
+
+    Essaie, tant que l'échec persiste : retirer une tâche, retirer un commis, puis
+    diminuer chaque durée (0, moitié, moins un). S'arrête quand plus aucun candidat
+    ne conserve l'échec.
+
+    Returns:
+        Tuple (durées, nombre de commis, erreurs du cas réduit)
+    """
+    erreurs = executer(verification, temps, m, max_oracle)
+    essais = 0
+
+    def candidats(temps, m):
+        for i in range(len(temps)):
+            yield temps[:i] + temps[i + 1:], m
+        if m > 1:
+            yield temps, m - 1
+        for i, t in enumerate(temps):
+            for plus_petit in sorted({0, t // 2, t - 1}):
+                if 0 <= plus_petit < t:
+                    yield temps[:i] + [plus_petit] + temps[i + 1:], m
+
+    progres = True
+    while progres and essais < MAX_ESSAIS_REDUCTION:
+        progres = False
+        for candidat, m_candidat in candidats(temps, m):
+            essais += 1
+            erreurs_candidat = executer(verification, candidat, m_candidat, max_oracle)
+            if erreurs_candidat:
+                temps, m, erreurs = candidat, m_candidat, erreurs_candidat
+                progres = True
+                break
+            if essais >= MAX_ESSAIS_REDUCTION:
+                break
+    return temps, m, erreurs
+
+
+def fuzzer(iterations: int, seed: int = 0, max_plats: int = 10, max_oracle: int = 8,
+           selection: List[str] = None, arret: bool = False) -> List[Dict]:
+    """
+    Lance le fuzzing
+
+    Args:
+        iterations: Nombre de cas tirés
+        seed: Graine maître
+        max_plats: Taille maximale des instances tirées
+        max_oracle: Taille maximale pour calculer l'optimum exact
+        selection: Noms des vérifications à exécuter (défaut: toutes)
+        arret: S'arrêter au premier échec
+
+    Returns:
+        Les échecs réduits (une entrée par vérification et par cas)
+    """
+    toutes = verifications()
+    choisies = {nom: toutes[nom] for nom in (selection or toutes)}
+    echecs = []
+
+    for iteration in range(iterations):
+        temps, m = tirer_cas(random.Random(f"{seed}:{iteration}"), max_plats)
+        for nom, verification in choisies.items():
+            if not executer(verification, temps, m, max_oracle):
+                continue
+            temps_reduits, m_reduit, erreurs = reduire(verification, list(temps), m, max_oracle)
+            echecs.append({
+                "verification": nom,
+                "seed": seed,
+                "iteration": iteration,
+                "erreurs": erreurs,
+                "num_workers": m_reduit,
+                "tasks": en_taches(temps_reduits),
+                "taille_initiale": len(temps)
+            })
+            print(f"❌ {nom} (itération {iteration}): {erreurs[0]}")
+            print(f"   reproducteur: m={m_reduit} temps={temps_reduits}")
+            if arret:
+                return echecs
+    return echecs
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Fuzzing différentiel des ordonnanceurs")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plats", type=int, default=10, help="Taille maximale des instances (défaut: 10)")
+    parser.add_argument("--max-oracle", type=int, default=8,
+                        help=f"Taille maximale pour l'optimum exact (défaut: 8, au plus {MAX_TACHES_ORACLE})")
+    parser.add_argument("--verifications", nargs="+", choices=sorted(verifications()), default=None)
+    parser.add_argument("--arret", action="store_true", help="S'arrêter au premier échec")
+    parser.add_argument("--sortie", type=str, default=None, help="Fichier NDJSON des échecs réduits")
+    args = parser.parse_args()
+
+    max_oracle = min(args.max_oracle, MAX_TACHES_ORACLE)
+    print(f"🔎 Fuzzing: {args.iterations} cas, seed {args.seed}, n <= {args.max_plats}, oracle n <= {max_oracle}")
+    echecs = fuzzer(args.iterations, args.seed, args.max_plats, max_oracle, args.verifications, args.arret)
+
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            for echec in echecs:
+                f.write(json.dumps(echec, ensure_ascii=False) + "\n")
+
+    if echecs:
+        print(f"\n❌ {len(echecs)} échec(s)")
+        sys.exit(1)
+    print(f"✅ Aucun écart sur {args.iterations} cas")
+
+
+if __name__ == "__main__":
+    main()
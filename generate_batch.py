@@ -4,17 +4,145 @@ Crée rapidement plusieurs instances de différents types
 
 Usage:
     python generate_batch.py --nombre 20 --output mes_instances.json
+    python generate_batch.py --nombre 1000 --entrepot benchmarks/resultats.sqlite
+
+Avec --entrepot, chaque instance est aussi résolue par tous les ordonnanceurs dans le
+processus qui l'a générée (--repetitions mesures chacune, après un échauffement), et les
+résultats sont ajoutés à l'entrepôt SQLite (entrepot.py).
 
 """
 
 import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from algorithms import SCHEDULERS, makespan_lower_bound
+from benchmark import mesurer, percentile
+from entrepot import EntrepotResultats, empreinte_instance
 from instance_generator import InstanceGenerator
 
 
+# Types d'instances, distribués uniformément dans le lot
+TYPES_INSTANCES = ["simple", "equilibree", "difficile", "desequilibree"]
+
+
+def graine_instance(seed: int, index: int) -> int:
+    """
+    Dérive la graine d'une instance à partir de la graine maître
+    
+    Chaque instance a ainsi son propre flux aléatoire, indépendant de l'ordre
+    et du processus dans lequel elle est générée.
+    """
+    empreinte = hashlib.sha256(f"{seed}:{index}".encode()).digest()
+    return int.from_bytes(empreinte[:8], "big")
+
+
+def parametres_instance(index: int, nombre: int) -> tuple:
+    """
+    Calcule le type, la taille et le nom de l'instance numéro index du lot
+    
+    Returns:
+        Tuple (type_instance, nb_plats, nb_commis, nom)
+    """
+    type_instance = TYPES_INSTANCES[index % len(TYPES_INSTANCES)]
+    
+    # Varier la taille
+    if index < nombre // 3:
+        # Petites instances
+        nb_plats = 3 + (index % 5)
+        nb_commis = 2 + (index % 3)
+    elif index < 2 * nombre // 3:
+        # Instances moyennes
+        nb_plats = 8 + (index % 7)
+        nb_commis = 3 + (index % 4)
+    else:
+        # Grandes instances
+        nb_plats = 15 + (index % 10)
+        nb_commis = 5 + (index % 5)
+    
+    nom = f"batch_{index+1:03d}_{type_instance}_{nb_plats}p_{nb_commis}c"
+    return type_instance, nb_plats, nb_commis, nom
+
+
+def mesurer_instance(instance, profil: str, repetitions: int = 5) -> list:
+    """
+    Résout une instance avec chaque ordonnanceur et mesure chaque résolution
+    
+    Comme benchmark.py : un échauffement puis repetitions mesures, dont on garde
+    le minimum, les percentiles 50 et 90 et le maximum.
+    
+    Returns:
+        Liste de résultats au format de EntrepotResultats.inserer
+    """
+    tasks = {plat["nom"]: plat["temps_epluchage"] + plat["temps_cuisson"] for plat in instance.plats}
+    empreinte = empreinte_instance(tasks.values())
+    borne = makespan_lower_bound(tasks, instance.nombre_commis)
+    
+    mesures = []
+    for nom_algo, scheduler in SCHEDULERS.items():
+        makespan, durees = mesurer(scheduler, tasks, instance.nombre_commis, repetitions, 1)
+        mesures.append({
+            "instance_hash": empreinte,
+            "instance": instance.nom,
+            "profil": profil,
+            "difficulte": instance.difficulte,
+            "n": len(tasks),
+            "m": instance.nombre_commis,
+            "algorithme": nom_algo,
+            "makespan": makespan,
+            "borne": borne,
+            "temps_min_ms": round(durees[0], 4),
+            "temps_p50_ms": round(percentile(durees, 50), 4),
+            "temps_p90_ms": round(percentile(durees, 90), 4),
+            "temps_max_ms": round(durees[-1], 4)
+        })
+    return mesures
+
+
+def generer_instance_serialisee(args: tuple) -> tuple:
+    """
+    Génère une instance et la sérialise au format de sauvegarder_instances
+    
+    Exécutée dans les processus du pool : le processus principal n'a plus qu'à
+    concaténer les fragments JSON, dans l'ordre des index.
+    
+    Args:
+        args: Tuple (index, nombre, seed, repetitions) ; repetitions vaut 0 sans mesure
+    
+    Returns:
+        Tuple (nom, difficulte, nombre_plats, fragment_json, mesures) ;
+        mesures vaut None sans mesure (voir mesurer_instance)
+    """
+    index, nombre, seed, repetitions = args
+    type_instance, nb_plats, nb_commis, nom = parametres_instance(index, nombre)
+    generator = InstanceGenerator(seed=graine_instance(seed, index))
+    
+    # Générer selon le type
+    if type_instance == "simple":
+        instance = generator.generer_instance_simple(nb_plats, nb_commis, nom)
+    elif type_instance == "equilibree":
+        instance = generator.generer_instance_equilibree(nb_plats, nb_commis, nom)
+    elif type_instance == "difficile":
+        instance = generator.generer_instance_difficile(nb_plats, nb_commis, nom)
+    else:  # desequilibree
+        instance = generator.generer_instance_desequilibree(nb_plats, nb_commis, nom)
+    
+    # Même mise en forme que json.dump(indent=2) pour un élément de "instances"
+    fragment = json.dumps(instance.to_dict(), indent=2, ensure_ascii=False)
+    fragment = "\n".join("    " + ligne for ligne in fragment.split("\n"))
+    
+    mesures = mesurer_instance(instance, type_instance, repetitions) if repetitions else None
+    return instance.nom, instance.difficulte, len(instance.plats), fragment, mesures
+
+
 def generer_instances_batch(
     nombre: int = 10,
     output: str = "batch_instances.json",
-    seed: int = 42
+    seed: int = 42,
+    workers: int = None,
+    entrepot: str = None,
+    repetitions: int = 5
 ):
     """
     Génère un lot d'instances variées
@@ -23,70 +151,85 @@ def generer_instances_batch(
         nombre: Nombre d'instances à générer
         output: Nom du fichier de sortie
         seed: Graine pour reproductibilité
+        workers: Nombre de processus (défaut: nombre de cœurs) ; le fichier produit
+                 est identique octet par octet quel que soit ce nombre
+        entrepot: Base SQLite où enregistrer la résolution de chaque instance (optionnel)
+        repetitions: Mesures de chaque résolution enregistrée dans l'entrepôt
     """
+    workers = workers or os.cpu_count() or 1
+    
     print(f"🍳 Génération de {nombre} instances...")
     print(f"📝 Sortie: {output}")
-    print(f"🎲 Seed: {seed}\n")
-    
-    generator = InstanceGenerator(seed=seed)
-    
-    # Générer un mix d'instances
-    instances = []
-    
-    # Distribuer les types uniformément
-    types = ["simple", "equilibree", "difficile", "desequilibree"]
-    
-    for i in range(nombre):
-        type_instance = types[i % len(types)]
-        
-        # Varier la taille
-        if i < nombre // 3:
-            # Petites instances
-            nb_plats = 3 + (i % 5)
-            nb_commis = 2 + (i % 3)
-        elif i < 2 * nombre // 3:
-            # Instances moyennes
-            nb_plats = 8 + (i % 7)
-            nb_commis = 3 + (i % 4)
-        else:
-            # Grandes instances
-            nb_plats = 15 + (i % 10)
-            nb_commis = 5 + (i % 5)
-        
-        nom = f"batch_{i+1:03d}_{type_instance}_{nb_plats}p_{nb_commis}c"
-        
-        # Générer selon le type
-        if type_instance == "simple":
-            instance = generator.generer_instance_simple(nb_plats, nb_commis, nom)
-        elif type_instance == "equilibree":
-            instance = generator.generer_instance_equilibree(nb_plats, nb_commis, nom)
-        elif type_instance == "difficile":
-            instance = generator.generer_instance_difficile(nb_plats, nb_commis, nom)
-        else:  # desequilibree
-            instance = generator.generer_instance_desequilibree(nb_plats, nb_commis, nom)
-        
-        instances.append(instance)
-        print(f"✓ {i+1:2d}/{nombre} - {nom}")
-    
-    # Sauvegarder
-    generator.sauvegarder_instances(instances, output)
-    
-    print(f"\n✅ {len(instances)} instances générées avec succès!")
+    print(f"🎲 Seed: {seed}")
+    print(f"⚙️  Processus: {workers}\n")
+    
+    taches = [(i, nombre, seed, max(1, repetitions) if entrepot is not None else 0) for i in range(nombre)]
+    
+    if workers == 1:
+        resultats = map(generer_instance_serialisee, taches)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        resultats = pool.map(
+            generer_instance_serialisee, taches,
+            chunksize=max(1, nombre // (workers * 8))
+        )
+    
+    metadata = {
+        "nombre_instances": nombre,
+        "generateur": "InstanceGenerator v1.0",
+        "projet": "Ordonnancement Cuisine - Polytech Nice SI4"
+    }
+    entete = json.dumps({"metadata": metadata}, indent=2, ensure_ascii=False)[:-2]
+    
+    types_count = {}
+    total_plats = 0
+    base, execution, mesures_en_attente, total_mesures = None, None, [], 0
+    if entrepot is not None:
+        base = EntrepotResultats(entrepot)
+        execution = base.nouvelle_execution("generate_batch", {"nombre": nombre, "seed": seed,
+                                                                "repetitions": max(1, repetitions)})
+    
+    try:
+        with open(output, 'w', encoding='utf-8') as f:
+            # Reproduit exactement la sortie de InstanceGenerator.sauvegarder_instances
+            f.write(entete + ',\n  "instances": [')
+            
+            for i, (nom, difficulte, nb_plats, fragment, mesures) in enumerate(resultats):
+                f.write(("\n" if i == 0 else ",\n") + fragment)
+                if mesures:
+                    mesures_en_attente.extend(mesures)
+                    if len(mesures_en_attente) >= 10000:
+                        total_mesures += base.inserer(execution, mesures_en_attente)
+                        mesures_en_attente = []
+                types_count[difficulte] = types_count.get(difficulte, 0) + 1
+                total_plats += nb_plats
+                print(f"✓ {i+1:2d}/{nombre} - {nom}")
+            
+            f.write("\n  ]\n}" if nombre else "]\n}")
+        if base is not None:
+            total_mesures += base.inserer(execution, mesures_en_attente)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if base is not None:
+            base.fermer()
+    
+    print(f"✅ {nombre} instance(s) sauvegardée(s) dans {output}")
+    if base is not None:
+        print(f"✅ {total_mesures} résolution(s) ajoutée(s) à l'entrepôt {entrepot} (expérience #{execution})")
+    
+    print(f"\n✅ {nombre} instances générées avec succès!")
     print(f"📁 Fichier: {output}")
     
     # Statistiques
     print("\n📊 Résumé:")
-    types_count = {}
-    for inst in instances:
-        t = inst.difficulte
-        types_count[t] = types_count.get(t, 0) + 1
-    
     for type_diff, count in sorted(types_count.items()):
         print(f"   - {type_diff}: {count} instances")
     
-    total_plats = sum(len(inst.plats) for inst in instances)
     print(f"\n   Total plats générés: {total_plats}")
-    print(f"   Moyenne plats/instance: {total_plats/len(instances):.1f}")
+    if nombre:
+        print(f"   Moyenne plats/instance: {total_plats/nombre:.1f}")
 
 
 def main():
@@ -116,12 +259,65 @@ def main():
         help="Graine pour génération aléatoire (défaut: 42)"
     )
     
+    parser.add_argument(
+        "--plats-massif",
+        type=int,
+        default=None,
+        help="Génère une seule très grande instance de N plats, écrite en flux sur disque"
+    )
+    
+    parser.add_argument(
+        "--profil",
+        type=str,
+        default="simple",
+        choices=sorted(InstanceGenerator.PROFILS),
+        help="Profil de durées de l'instance massive (défaut: simple)"
+    )
+    
+    parser.add_argument(
+        "--commis",
+        type=int,
+        default=10,
+        help="Nombre de commis de l'instance massive (défaut: 10)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre de processus de génération (défaut: nombre de cœurs)"
+    )
+    
+    parser.add_argument(
+        "--entrepot",
+        type=str,
+        default=None,
+        help="Base SQLite où enregistrer la résolution de chaque instance par chaque ordonnanceur"
+    )
+    
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=5,
+        help="Mesures de chaque résolution enregistrée avec --entrepot (défaut: 5)"
+    )
+    
     args = parser.parse_args()
     
+    if args.plats_massif is not None:
+        generator = InstanceGenerator(seed=args.seed)
+        generator.generer_instance_massive(
+            args.output, args.plats_massif, args.commis, args.profil
+        )
+        return
+    
     generer_instances_batch(
         nombre=args.nombre,
         output=args.output,
-        seed=args.seed
+        seed=args.seed,
+        workers=args.workers,
+        entrepot=args.entrepot,
+        repetitions=args.repetitions
     )
 
 
@@ -0,0 +1,524 @@
+"""
+Ordonnancement réparti entre plusieurs nœuds solveurs locaux
+Un coordinateur répartit les cuisines (sites) d'une demande entre N nœuds joints par
+sockets TCP ou Unix, en deux niveaux : les sites sont d'abord affectés aux nœuds par
+l'algorithme glouton sur leur charge agrégée, puis chaque nœud ordonnance localement
+les stations de ses sites (comme /api/simulate). Les résultats sont fusionnés dans
+l'ordre de la demande.
+
+Usage:
+    python grappe.py noeud --adresse 127.0.0.1:7101
+    python grappe.py noeud --adresse unix:/tmp/cuisine-1.sock
+    python grappe.py demo --noeuds 4 --sites 400 --plats 300
+    python grappe.py demo --noeuds 3 --unix --panne
+
+Un nœud qui ne répond pas (connexion refusée, délai dépassé, réponse invalide) est mis
+à l'écart pendant DELAI_REPRISE secondes et sa part est redistribuée aux nœuds restants ;
+sans aucun nœud disponible, le coordinateur résout localement (secours_local).
+
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms import greedy_scheduler
+from catalogue import PLATS_CATALOGUE
+from lots import resoudre_paquet
+
+
+# Trame : longueur (4 octets, gros-boutiste) puis message JSON
+ENTETE_TRAME = struct.Struct(">I")
+MAX_TRAME = 64 * 1024 * 1024
+
+# Délai d'une requête vers un nœud (s), et durée de mise à l'écart d'un nœud en panne
+DELAI_NOEUD = 30.0
+DELAI_REPRISE = 5.0
+
+# Connexions inactives gardées ouvertes par nœud
+CONNEXIONS_PAR_NOEUD = 4
+
+
+class NoeudIndisponible(Exception):
+    """Levée quand un nœud ne répond pas ou répond une erreur"""
+
+
+class GrappeIndisponible(Exception):
+    """Levée quand aucun nœud n'est disponible et que le secours local est désactivé"""
+
+
+def _lire_exactement(connexion: socket.socket, taille: int) -> bytes:
+    morceaux, restant = [], taille
+    while restant:
+        morceau = connexion.recv(min(restant, 1 << 20))
+        if not morceau:
+            raise ConnectionError("Connexion fermée par le pair")
+        morceaux.append(morceau)
+        restant -= len(morceau)
+    return b"".join(morceaux)
+
+
+def envoyer_trame(connexion: socket.socket, message: Dict):
+    """Envoie un message JSON précédé de sa longueur"""
+    donnees = json.dumps(message, separators=(",", ":")).encode()
+    connexion.sendall(ENTETE_TRAME.pack(len(donnees)) + donnees)
+
+
+def recevoir_trame(connexion: socket.socket) -> Optional[Dict]:
+    """Reçoit un message JSON ; None si le pair a fermé la connexion entre deux messages"""
+    entete = connexion.recv(ENTETE_TRAME.size)
+    if not entete:
+        return None
+    if len(entete) < ENTETE_TRAME.size:
+        entete += _lire_exactement(connexion, ENTETE_TRAME.size - len(entete))
+    (taille,) = ENTETE_TRAME.unpack(entete)
+    if taille > MAX_TRAME:
+        raise ValueError(f"Trame trop grande ({taille} octets)")
+    return json.loads(_lire_exactement(connexion, taille))
+
+
+def analyser_adresse(adresse: str) -> Tuple[int, object]:
+    """'127.0.0.1:7101' -> (AF_INET, (hôte, port)) ; 'unix:/chemin' -> (AF_UNIX, chemin)"""
+    if adresse.startswith("unix:"):
+        return socket.AF_UNIX, adresse[len("unix:"):]
+    hote, _, port = adresse.rpartition(":")
+    if not hote or not port.isdigit():
+        raise ValueError(f"Adresse invalide: {adresse} (attendu hôte:port ou unix:/chemin)")
+    return socket.AF_INET, (hote, int(port))
+
+
+# ================================================
+# Nœud solveur
+# ================================================
+
+class _GestionnaireNoeud(socketserver.BaseRequestHandler):
+    """Traite les requêtes d'une connexion jusqu'à sa fermeture"""
+
+    def handle(self):
+        while True:
+            try:
+                message = recevoir_trame(self.request)
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            try:
+                reponse = self.server.traiter(message)
+            except Exception as e:  # la connexion reste utilisable
+                reponse = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                envoyer_trame(self.request, reponse)
+            except OSError:
+                return
+
+
+class _ServeurNoeud:
+    """Opérations d'un nœud, communes aux serveurs TCP et Unix"""
+
+    daemon_threads = True
+    # Ne pas attendre à la fermeture les connexions ouvertes par un coordinateur
+    block_on_close = False
+    allow_reuse_address = True
+
+    def traiter(self, message: Dict) -> Dict:
+        operation = message.get("op")
+        if operation == "ping":
+            return {"ok": True, "pid": os.getpid(), "resolus": self.resolus}
+        if operation == "resoudre":
+            debut = time.perf_counter()
+            paquet = [tuple(element) for element in message.get("scenarios", [])]
+            lignes = resoudre_paquet(paquet, bool(message.get("details", True)))
+            self.resolus += len(paquet)
+            return {"ok": True, "lignes": lignes.decode(),
+                    "duree_ms": round((time.perf_counter() - debut) * 1000, 3)}
+        return {"ok": False, "error": f"Opération inconnue: {operation}"}
+
+
+class _ServeurNoeudTCP(_ServeurNoeud, socketserver.ThreadingTCPServer):
+    pass
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _ServeurNoeudUnix(_ServeurNoeud, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def creer_noeud(adresse: str):
+    """
+    Crée le serveur d'un nœud solveur (à lancer avec serve_forever())
+
+    Args:
+        adresse: 'hôte:port' (port 0 : choisi par le système) ou 'unix:/chemin'
+
+    Returns:
+        Le serveur ; son adresse effective est dans server_address
+    """
+    famille, cible = analyser_adresse(adresse)
+    if famille == socket.AF_UNIX:
+        if os.path.exists(cible):
+            os.unlink(cible)
+        serveur = _ServeurNoeudUnix(cible, _GestionnaireNoeud)
+    else:
+        serveur = _ServeurNoeudTCP(cible, _GestionnaireNoeud)
+    serveur.resolus = 0
+    return serveur
+
+
+# ================================================
+# Coordinateur
+# ================================================
+
+class _Noeud:
+    """Un nœud distant, ses connexions réutilisables et son état de santé"""
+
+    def __init__(self, adresse: str, delai: float):
+        self.adresse = adresse
+        self.famille, self.cible = analyser_adresse(adresse)
+        self.delai = delai
+        self.hors_service_jusqu_a = 0.0
+        self.echecs = 0
+        self._libres: List[socket.socket] = []
+        self._verrou = threading.Lock()
+
+    def disponible(self) -> bool:
+        return time.monotonic() >= self.hors_service_jusqu_a
+
+    def mettre_a_l_ecart(self, duree: float):
+        self.echecs += 1
+        self.hors_service_jusqu_a = time.monotonic() + duree
+        self.fermer()
+
+    def _connecter(self) -> socket.socket:
+        connexion = socket.socket(self.famille, socket.SOCK_STREAM)
+        connexion.settimeout(self.delai)
+        try:
+            connexion.connect(self.cible)
+        except OSError:
+            connexion.close()
+            raise
+        if self.famille == socket.AF_INET:
+            connexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connexion
+
+    def echanger(self, message: Dict) -> Dict:
+        """
+        Envoie une requête et attend la réponse
+
+        Une connexion réutilisée peut avoir été fermée par un nœud redémarré : l'échange
+        est alors retenté une fois sur une connexion neuve.
+        """
+        with self._verrou:
+            connexion = self._libres.pop() if self._libres else None
+        for tentative in range(2):
+            reutilisee = connexion is not None
+            try:
+                if connexion is None:
+                    connexion = self._connecter()
+                envoyer_trame(connexion, message)
+                reponse = recevoir_trame(connexion)
+                if reponse is None:
+                    raise ConnectionError("Connexion fermée par le nœud")
+            except (OSError, ValueError) as e:
+                if connexion is not None:
+                    connexion.close()
+                    connexion = None
+                if reutilisee and tentative == 0:
+                    continue
+                raise NoeudIndisponible(f"{self.adresse}: {e}") from e
+            break
+
+        with self._verrou:
+            if len(self._libres) < CONNEXIONS_PAR_NOEUD:
+                self._libres.append(connexion)
+                connexion = None
+        if connexion is not None:
+            connexion.close()
+
+        if not reponse.get("ok"):
+            raise NoeudIndisponible(f"{self.adresse}: {reponse.get('error')}")
+        return reponse
+
+    def fermer(self):
+        with self._verrou:
+            libres, self._libres = self._libres, []
+        for connexion in libres:
+            connexion.close()
+
+
+def charge_scenario(scenario: Dict, catalogue: Dict) -> int:
+    """
+    Charge agrégée d'un scénario (somme des durées), utilisée pour répartir les sites
+
+    Forme /api/simulate : durées des plats du catalogue ; forme /schedule : somme des
+    durées des tâches (longueur du texte à défaut, comme estimation).
+    """
+    if "plats" in scenario:
+        charge = 0
+        for plat_id in scenario["plats"]:
+            plat = catalogue.get(plat_id)
+            if plat is not None:
+                charge += plat["prep"] + plat["cuisson"] + plat["dressage"]
+        return charge
+    tasks = scenario.get("tasks")
+    if isinstance(tasks, dict):
+        return sum(t for t in tasks.values() if isinstance(t, (int, float)))
+    return len(tasks) if isinstance(tasks, str) else 0
+
+
+class Coordinateur:
+    """
+    Répartit des scénarios (un par cuisine) entre des nœuds solveurs et fusionne les résultats
+
+    Le coordinateur est propre au processus qui le crée (ses connexions ne doivent pas être
+    partagées après un fork) : app.py le crée paresseusement dans chaque worker.
+    """
+
+    def __init__(self, adresses: Sequence[str], delai: float = DELAI_NOEUD,
+                 delai_reprise: float = DELAI_REPRISE, secours_local: bool = True):
+        """
+        Args:
+            adresses: Adresses des nœuds ('hôte:port' ou 'unix:/chemin')
+            delai: Délai maximal d'une requête vers un nœud (s)
+            delai_reprise: Durée de mise à l'écart d'un nœud en panne (s)
+            secours_local: Résoudre dans ce processus si aucun nœud n'est disponible
+        """
+        if not adresses:
+            raise ValueError("Il faut au moins un nœud")
+        self.noeuds = [_Noeud(adresse, delai) for adresse in adresses]
+        self.delai_reprise = delai_reprise
+        self.secours_local = secours_local
+        self.pid = os.getpid()
+        self._executeur = ThreadPoolExecutor(max_workers=2 * len(self.noeuds))
+
+    def repartir(self, scenarios: List[tuple], noeuds: List[_Noeud]) -> List[Tuple[_Noeud, List[tuple]]]:
+        """
+        Premier niveau : affecte les scénarios aux nœuds par l'algorithme glouton (LPT)
+        sur leur charge agrégée
+
+        Returns:
+            Liste de (nœud, scénarios) ; les nœuds sans scénario sont omis
+        """
+        charges = {position: charge_scenario(scenario, PLATS_CATALOGUE)
+                   for position, (_, _, scenario) in enumerate(scenarios)}
+        workers, _ = greedy_scheduler(charges, len(noeuds))
+        parts = []
+        for noeud, worker in zip(noeuds, workers):
+            if worker["tasks"]:
+                positions = sorted(position for position, _ in worker["tasks"])
+                parts.append((noeud, [scenarios[position] for position in positions]))
+        return parts
+
+    def resoudre(self, scenarios: List[tuple], details: bool = True) -> Tuple[List[Dict], Dict]:
+        """
+        Résout des scénarios sur les nœuds, avec reprise des parts des nœuds en panne
+
+        Args:
+            scenarios: Liste de (index, identifiant, scénario), comme pour resoudre_paquet
+            details: Inclure l'affectation complète des tâches (sinon makespan et charges)
+
+        Returns:
+            Tuple (résultats triés par index, résumé : répartition par nœud et reprises)
+        """
+        resultats: Dict[int, Dict] = {}
+        repartition = {noeud.adresse: {"scenarios": 0, "duree_ms": 0.0} for noeud in self.noeuds}
+        pannes: List[str] = []
+        en_panne = set()
+        local = 0
+        restants = list(scenarios)
+        debut = time.perf_counter()
+
+        while restants:
+            # Un nœud tombé pendant cet appel n'est pas réessayé, même si sa mise à l'écart a expiré
+            vivants = [noeud for noeud in self.noeuds
+                       if noeud.disponible() and noeud.adresse not in en_panne]
+            if not vivants:
+                if not self.secours_local:
+                    raise GrappeIndisponible(f"Aucun nœud disponible sur {len(self.noeuds)}")
+                self._fusionner(resoudre_paquet(restants, details).decode(), resultats)
+                local += len(restants)
+                break
+
+            parts = self.repartir(restants, vivants)
+            futures = {self._executeur.submit(noeud.echanger, {
+                "op": "resoudre", "scenarios": [list(element) for element in part], "details": details
+            }): (noeud, part) for noeud, part in parts}
+
+            restants = []
+            for future in as_completed(futures):
+                noeud, part = futures[future]
+                try:
+                    reponse = future.result()
+                except NoeudIndisponible as e:
+                    noeud.mettre_a_l_ecart(self.delai_reprise)
+                    en_panne.add(noeud.adresse)
+                    pannes.append(str(e))
+                    restants.extend(part)
+                    continue
+                self._fusionner(reponse["lignes"], resultats)
+                repartition[noeud.adresse]["scenarios"] += len(part)
+                repartition[noeud.adresse]["duree_ms"] += reponse.get("duree_ms", 0.0)
+
+        resume = {
+            "scenarios": len(scenarios),
+            "noeuds": repartition,
+            "pannes": pannes,
+            "secours_local": local,
+            "duree_ms": round((time.perf_counter() - debut) * 1000, 3)
+        }
+        return [resultats[index] for index in sorted(resultats)], resume
+
+    @staticmethod
+    def _fusionner(lignes: str, resultats: Dict[int, Dict]):
+        for ligne in lignes.splitlines():
+            if ligne:
+                resultat = json.loads(ligne)
+                resultats[resultat["index"]] = resultat
+
+    def ping(self) -> Dict[str, Optional[Dict]]:
+        """État de chaque nœud (None s'il ne répond pas)"""
+        etats = {}
+        for noeud in self.noeuds:
+            try:
+                etats[noeud.adresse] = noeud.echanger({"op": "ping"})
+            except NoeudIndisponible:
+                etats[noeud.adresse] = None
+        return etats
+
+    def fermer(self):
+        """Ferme les connexions (seulement dans le processus qui a créé le coordinateur)"""
+        if self.pid != os.getpid():
+            return
+        for noeud in self.noeuds:
+            noeud.fermer()
+        self._executeur.shutdown(wait=False)
+
+
+# ================================================
+# Démonstration locale
+# ================================================
+
+def generer_sites(nombre: int, plats: int, seed: int) -> List[tuple]:
+    """Sites de taille variable (de plats/4 à plats commandes), forme /api/simulate"""
+
+    rng = random.Random(seed)
+    codes = sorted(PLATS_CATALOGUE)
+    sites = []
+    for index in range(nombre):
+        taille = rng.randint(max(1, plats // 4), plats)
+        sites.append((index, f"site-{index}", {"plats": [rng.choice(codes) for _ in range(taille)]}))
+    return sites
+
+
+def lancer_noeuds(adresses: List[str]) -> List[subprocess.Popen]:
+    """Lance un processus par nœud et attend qu'ils répondent"""
+    processus = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "noeud", "--adresse", adresse],
+                                  stdout=subprocess.DEVNULL)
+                 for adresse in adresses]
+    coordinateur = Coordinateur(adresses, delai=2.0, delai_reprise=0.0)
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        if all(etat is not None for etat in coordinateur.ping().values()):
+            break
+        time.sleep(0.2)
+    else:
+        for p in processus:
+            p.kill()
+        raise RuntimeError("Les nœuds n'ont pas démarré")
+    coordinateur.fermer()
+    return processus
+
+
+def demo(noeuds: int, sites: int, plats: int, seed: int, unix: bool, panne: bool):
+    """Compare la résolution locale et la résolution répartie, avec panne simulée éventuelle"""
+    dossier = tempfile.mkdtemp(prefix="grappe-") if unix else None
+    if unix:
+        adresses = [f"unix:{os.path.join(dossier, f'noeud-{i}.sock')}" for i in range(noeuds)]
+    else:
+        adresses = [f"127.0.0.1:{7101 + i}" for i in range(noeuds)]
+
+    scenarios = generer_sites(sites, plats, seed)
+    print(f"🍳 {sites} sites, {sum(len(s['plats']) for _, _, s in scenarios)} plats, {noeuds} nœud(s)")
+
+    debut = time.perf_counter()
+    reference = [json.loads(ligne) for ligne in resoudre_paquet(scenarios, details=False).splitlines()]
+    duree_locale = time.perf_counter() - debut
+    print(f"   • local     : {duree_locale * 1000:9.1f} ms")
+
+    processus = lancer_noeuds(adresses)
+    coordinateur = Coordinateur(adresses)
+    try:
+        coordinateur.resoudre(scenarios[:noeuds], details=False)  # connexions et imports chauds
+        debut = time.perf_counter()
+        resultats, resume = coordinateur.resoudre(scenarios, details=False)
+        duree = time.perf_counter() - debut
+        print(f"   • réparti   : {duree * 1000:9.1f} ms  (x{duree_locale / duree:.2f})")
+        for adresse, part in resume["noeuds"].items():
+            print(f"       {adresse:40s} {part['scenarios']:5d} site(s)  {part['duree_ms']:8.1f} ms de calcul")
+        print(f"   {'✅' if resultats == reference else '❌'} résultats identiques à la résolution locale")
+
+        if panne:
+            processus[0].kill()
+            processus[0].wait()
+            resultats, resume = coordinateur.resoudre(scenarios, details=False)
+            print(f"   • panne de {adresses[0]} : {len(resume['pannes'])} part(s) redistribuée(s), "
+                  f"{resume['duree_ms']:.1f} ms")
+            print(f"   {'✅' if resultats == reference else '❌'} résultats identiques après reprise")
+    finally:
+        coordinateur.fermer()
+        for p in processus:
+            p.terminate()
+        for p in processus:
+            p.wait()
+        if dossier:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Ordonnancement réparti entre nœuds solveurs")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    noeud = commandes.add_parser("noeud", help="Lancer un nœud solveur")
+    noeud.add_argument("--adresse", type=str, required=True, help="hôte:port ou unix:/chemin")
+
+    demonstration = commandes.add_parser("demo", help="Comparer local et réparti avec des nœuds locaux")
+    demonstration.add_argument("--noeuds", type=int, default=4)
+    demonstration.add_argument("--sites", type=int, default=400)
+    demonstration.add_argument("--plats", type=int, default=300, help="Commandes maximales par site")
+    demonstration.add_argument("--seed", type=int, default=42)
+    demonstration.add_argument("--unix", action="store_true", help="Sockets Unix plutôt que TCP")
+    demonstration.add_argument("--panne", action="store_true", help="Arrêter un nœud et vérifier la reprise")
+    args = parser.parse_args()
+
+    if args.commande == "noeud":
+        serveur = creer_noeud(args.adresse)
+        # SIGTERM : sortie propre (le fichier d'une socket Unix est supprimé)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"🚀 Nœud solveur {args.adresse} (pid {os.getpid()})")
+        try:
+            serveur.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            serveur.server_close()
+            if isinstance(serveur.server_address, str) and os.path.exists(serveur.server_address):
+                os.unlink(serveur.server_address)
+    else:
+        demo(args.noeuds, args.sites, args.plats, args.seed, args.unix, args.panne)
+
+
+if __name__ == "__main__":
+    main()
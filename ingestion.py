@@ -0,0 +1,192 @@
+"""
+Lecture en flux de gros fichiers de tâches (CSV ou NDJSON, éventuellement gzip)
+Le corps de requête est lu par blocs et chaque ligne est analysée dès qu'elle est
+complète : seuls les noms et un tableau compact de durées restent en mémoire.
+Contient aussi l'analyse du texte de tâches des formulaires (parser_taches).
+
+"""
+
+import json
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+
+TAILLE_BLOC = 64 * 1024
+
+# Nombre maximal d'erreurs détaillées dans la réponse (les suivantes sont seulement comptées)
+MAX_ERREURS_DETAILLEES = 100
+
+FORMATS = ("csv", "ndjson")
+
+# En-têtes CSV tolérés en première ligne
+COLONNES_TEMPS = {"temps", "time", "duree", "durée"}
+
+# Plus grande durée représentable dans le tableau compact (array('q'), entier signé 64 bits).
+# La somme des durées y est aussi bornée : débuts, fins et charges ne la dépassent jamais
+TEMPS_MAX = 2 ** 63 - 1
+
+# Longueur maximale d'une ligne (octets) : au-delà, le corps est refusé
+LONGUEUR_MAX_LIGNE = 64 * 1024
+
+
+class TachesCompactes:
+    """Tâches stockées en colonnes : liste des noms et array('q') des durées"""
+
+    def __init__(self):
+        self.noms: List[str] = []
+        self.temps = array("q")
+
+    def ajouter(self, nom: str, temps: int):
+        # La durée d'abord : si elle est refusée, les deux colonnes restent alignées
+        self.temps.append(temps)
+        self.noms.append(nom)
+
+    def __len__(self) -> int:
+        return len(self.temps)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Format {nom: temps} attendu par les ordonnanceurs classiques"""
+        return dict(zip(self.noms, self.temps))
+
+
+def _iterer_blocs(flux, decompresseur, taille_bloc: int) -> Iterator[bytes]:
+    """Blocs lus (et décompressés) d'au plus taille_bloc octets chacun"""
+    while True:
+        bloc = flux.read(taille_bloc)
+        if not bloc:
+            return
+        if decompresseur is None:
+            yield bloc
+            continue
+        # Sortie bornée : une bombe gzip est décompressée bloc par bloc, jamais d'un coup
+        while bloc:
+            donnees = decompresseur.decompress(bloc, taille_bloc)
+            bloc = decompresseur.unconsumed_tail
+            if donnees:
+                yield donnees
+
+
+def iterer_lignes(flux, compresse: bool = False, taille_bloc: int = TAILLE_BLOC,
+                  longueur_max: int = LONGUEUR_MAX_LIGNE) -> Iterator[bytes]:
+    """
+    Découpe un flux binaire en lignes sans jamais le charger en entier
+
+    Args:
+        flux: Objet avec une méthode read(n) (request.stream, fichier ouvert en binaire...)
+        compresse: Le flux est compressé en gzip (Content-Encoding: gzip)
+        taille_bloc: Taille des lectures successives (et de chaque bloc décompressé)
+        longueur_max: Longueur maximale d'une ligne ; au-delà, lève ValueError
+
+    Returns:
+        Itérateur sur les lignes, sans leur fin de ligne
+    """
+    decompresseur = zlib.decompressobj(16 + zlib.MAX_WBITS) if compresse else None
+    reste = b""
+
+    for bloc in _iterer_blocs(flux, decompresseur, taille_bloc):
+        lignes = (reste + bloc).split(b"\n")
+        reste = lignes.pop()
+        if len(reste) > longueur_max:
+            raise ValueError(f"Ligne de plus de {longueur_max} octets")
+        for ligne in lignes:
+            if len(ligne) > longueur_max:
+                raise ValueError(f"Ligne de plus de {longueur_max} octets")
+            yield ligne.rstrip(b"\r")
+
+    if decompresseur is not None:
+        reste += decompresseur.flush()
+        if not decompresseur.eof:
+            raise ValueError("Flux gzip tronqué")
+    if reste.strip():
+        yield reste.rstrip(b"\r")
+
+
+def _analyser_csv(ligne: str) -> tuple:
+    nom, temps = ligne.split(",")
+    return nom.strip(), int(temps.strip())
+
+
+def _analyser_ndjson(ligne: str) -> tuple:
+    objet = json.loads(ligne)
+    if isinstance(objet, list):
+        nom, temps = objet
+    else:
+        nom = objet.get("nom", objet.get("name"))
+        temps = objet.get("temps", objet.get("time"))
+    if not isinstance(nom, str) or isinstance(temps, bool) or not isinstance(temps, int):
+        raise ValueError("attendu {\"nom\": texte, \"temps\": entier} ou [nom, temps]")
+    return nom, temps
+
+
+def parser_taches(tasks_str):
+    """
+    Analyse une liste de tâches au format texte "nom, temps" (une tâche par ligne).
+    Lève ValueError avec un message explicite sur la première ligne mal formatée.
+    """
+    tasks = {}
+    for line in tasks_str.strip().split('\n'):
+        try:
+            name, time = line.split(',')
+            tasks[name.strip()] = int(time.strip())
+        except ValueError:
+            raise ValueError(f"Ligne mal formatée : {line}")
+    return tasks
+
+
+def lire_taches(flux, format: str = "csv", compresse: bool = False,
+                max_erreurs: int = MAX_ERREURS_DETAILLEES) -> tuple:
+    """
+    Lit des tâches ligne à ligne ; une ligne invalide est signalée sans interrompre la lecture
+
+    Formats acceptés :
+        csv    : "nom, temps" (une éventuelle ligne d'en-tête nom,temps est ignorée)
+        ndjson : {"nom": ..., "temps": ...}, {"name": ..., "time": ...} ou [nom, temps]
+
+    Les lignes vides sont ignorées. Chaque ligne valide est une tâche, même si son nom
+    a déjà été vu. Une durée qui porterait la somme des durées au-delà de TEMPS_MAX est
+    refusée comme une ligne invalide. Lève ValueError si le corps est illisible (ligne
+    trop longue, gzip tronqué).
+
+    Returns:
+        Tuple (TachesCompactes, erreurs détaillées [{'ligne', 'erreur'}], nombre total d'erreurs)
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu: {format} (attendu: {', '.join(FORMATS)})")
+
+    analyser = _analyser_csv if format == "csv" else _analyser_ndjson
+    taches = TachesCompactes()
+    erreurs = []
+    nombre_erreurs = 0
+    total = 0
+
+    for numero, brute in enumerate(iterer_lignes(flux, compresse), start=1):
+        if not brute.strip():
+            continue
+        try:
+            ligne = brute.decode("utf-8")
+            nom, temps = analyser(ligne)
+            if temps < 0:
+                raise ValueError("temps négatif")
+            if temps > TEMPS_MAX - total:
+                raise ValueError("somme des temps hors limites (entier 64 bits)")
+        except (ValueError, TypeError, AttributeError) as e:
+            if numero == 1 and format == "csv" and brute.split(b",")[-1].strip().decode(
+                    "utf-8", "replace").lower() in COLONNES_TEMPS:
+                continue
+            nombre_erreurs += 1
+            if len(erreurs) < max_erreurs:
+                erreurs.append({"ligne": numero, "erreur": f"Ligne mal formatée : {brute[:200].decode('utf-8', 'replace')} ({e})"})
+            continue
+        taches.ajouter(nom, temps)
+        total += temps
+
+    return taches, erreurs, nombre_erreurs
+
+
+def format_depuis_content_type(content_type: Optional[str]) -> str:
+    """Déduit le format d'ingestion de l'en-tête Content-Type"""
+    if content_type and ("ndjson" in content_type or "jsonl" in content_type
+                         or "json-seq" in content_type):
+        return "ndjson"
+    return "csv"
@@ -6,8 +6,10 @@ Ordonnancement, Cuisine et approximations
 
 import random
 import json
-from typing import Dict, List, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Tuple
+from dataclasses import dataclass, asdict, field
+
+from statistiques import AccumulateurStatistiques, formater_resume, resume_statistiques
 
 
 @dataclass
@@ -31,6 +33,7 @@ class Instance:
     plats: List[Dict]
     nombre_commis: int
     difficulte: str  # "facile", "moyen", "difficile"
+    _statistiques: Dict = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self):
         """Convertit l'instance en dictionnaire"""
@@ -44,19 +47,10 @@ class Instance:
         }
     
     def calculer_statistiques(self) -> Dict:
-        """Calcule les statistiques de l'instance"""
-        temps_epluchage = [p["temps_epluchage"] for p in self.plats]
-        temps_cuisson = [p["temps_cuisson"] for p in self.plats]
-        temps_totaux = [p["temps_epluchage"] + p["temps_cuisson"] for p in self.plats]
-        
-        return {
-            "nombre_plats": len(self.plats),
-            "temps_total_travail": sum(temps_totaux),
-            "temps_moyen_par_plat": sum(temps_totaux) // len(self.plats) if self.plats else 0,
-            "temps_max_plat": max(temps_totaux) if temps_totaux else 0,
-            "temps_min_plat": min(temps_totaux) if temps_totaux else 0,
-            "charge_theorique_par_commis": sum(temps_totaux) // self.nombre_commis if self.nombre_commis > 0 else 0
-        }
+        """Calcule les statistiques de l'instance (une seule fois : les plats ne changent pas)"""
+        if self._statistiques is None:
+            self._statistiques = resume_statistiques(self.plats, self.nombre_commis)
+        return self._statistiques
 
 
 class InstanceGenerator:
@@ -75,15 +69,42 @@ class InstanceGenerator:
         "champignon", "brocoli", "chou-fleur", "haricot vert"
     ]
     
+    # Profils acceptés par le générateur massif et difficulté associée
+    PROFILS = {
+        "simple": {"difficulte": "facile"},
+        "equilibree": {"difficulte": "moyen"},
+        "difficile": {"difficulte": "difficile"},
+        "desequilibree": {"difficulte": "difficile"},
+    }
+    
     def __init__(self, seed: int = None):
         """
         Initialise le générateur
         
         Args:
             seed: Graine pour la génération aléatoire (pour reproductibilité)
+        
+        Chaque générateur possède son propre flux aléatoire : deux générateurs
+        ne se perturbent pas, même dans le même processus.
         """
-        if seed is not None:
-            random.seed(seed)
+        self.rng = random.Random(seed)
+    
+    def _choisir_ingredients(self, nombre_plats: int) -> List[str]:
+        """
+        Choisit les noms des plats d'une instance
+        
+        Tant que le catalogue suffit, les noms sont tirés sans remise comme avant ;
+        au-delà (plus de 34 plats), ils sont construits synthétiquement.
+        """
+        catalogue = self.FRUITS + self.LEGUMES
+        if nombre_plats <= len(catalogue):
+            return self.rng.sample(catalogue, nombre_plats)
+        return [self._nom_synthetique(i) for i in range(nombre_plats)]
+    
+    def _nom_synthetique(self, index: int) -> str:
+        """Nom unique construit à partir du catalogue : pomme_0, poire_1, ..."""
+        catalogue = self.FRUITS + self.LEGUMES
+        return f"{catalogue[index % len(catalogue)]}_{index}"
     
     def generer_instance_simple(
         self, 
@@ -103,13 +124,13 @@ class InstanceGenerator:
             Instance générée
         """
         plats = []
-        ingredients = random.sample(self.FRUITS + self.LEGUMES, nombre_plats)
+        ingredients = self._choisir_ingredients(nombre_plats)
         
         for i, ingredient in enumerate(ingredients):
             # Temps d'épluchage entre 5 et 20 minutes
-            temps_epluchage = random.randint(5, 20) * 60
+            temps_epluchage = self.rng.randint(5, 20) * 60
             # Temps de cuisson entre 5 et 30 minutes
-            temps_cuisson = random.randint(5, 30) * 60
+            temps_cuisson = self.rng.randint(5, 30) * 60
             
             plats.append({
                 "nom": ingredient,
@@ -146,7 +167,7 @@ class InstanceGenerator:
             Instance générée
         """
         plats = []
-        ingredients = random.sample(self.FRUITS + self.LEGUMES, nombre_plats)
+        ingredients = self._choisir_ingredients(nombre_plats)
         
         # Temps moyens autour desquels on va générer
         temps_moyen_epluchage = 10 * 60  # 10 minutes
@@ -154,11 +175,11 @@ class InstanceGenerator:
         variation = 0.3  # 30% de variation
         
         for ingredient in ingredients:
-            temps_epluchage = int(random.gauss(
+            temps_epluchage = int(self.rng.gauss(
                 temps_moyen_epluchage, 
                 temps_moyen_epluchage * variation
             ))
-            temps_cuisson = int(random.gauss(
+            temps_cuisson = int(self.rng.gauss(
                 temps_moyen_cuisson,
                 temps_moyen_cuisson * variation
             ))
@@ -202,7 +223,7 @@ class InstanceGenerator:
             Instance générée
         """
         plats = []
-        ingredients = random.sample(self.FRUITS + self.LEGUMES, nombre_plats)
+        ingredients = self._choisir_ingredients(nombre_plats)
         
         # Créer quelques plats très longs
         nombre_plats_longs = max(2, nombre_plats // 4)
@@ -210,12 +231,12 @@ class InstanceGenerator:
         for i, ingredient in enumerate(ingredients):
             if i < nombre_plats_longs:
                 # Plats longs
-                temps_epluchage = random.randint(20, 40) * 60
-                temps_cuisson = random.randint(30, 60) * 60
+                temps_epluchage = self.rng.randint(20, 40) * 60
+                temps_cuisson = self.rng.randint(30, 60) * 60
             else:
                 # Plats courts
-                temps_epluchage = random.randint(2, 8) * 60
-                temps_cuisson = random.randint(5, 15) * 60
+                temps_epluchage = self.rng.randint(2, 8) * 60
+                temps_cuisson = self.rng.randint(5, 15) * 60
             
             plats.append({
                 "nom": ingredient,
@@ -224,7 +245,7 @@ class InstanceGenerator:
             })
         
         # Mélanger pour ne pas avoir tous les plats longs au début
-        random.shuffle(plats)
+        self.rng.shuffle(plats)
         
         nom_instance = nom or f"instance_difficile_{nombre_plats}plats_{nombre_commis}commis"
         
@@ -255,11 +276,11 @@ class InstanceGenerator:
             Instance générée
         """
         plats = []
-        ingredients = random.sample(self.FRUITS + self.LEGUMES, nombre_plats)
+        ingredients = self._choisir_ingredients(nombre_plats)
         
         for ingredient in ingredients:
-            temps_epluchage = random.randint(8, 25) * 60
-            temps_cuisson = random.randint(10, 35) * 60
+            temps_epluchage = self.rng.randint(8, 25) * 60
+            temps_cuisson = self.rng.randint(10, 35) * 60
             
             plats.append({
                 "nom": ingredient,
@@ -298,9 +319,9 @@ class InstanceGenerator:
         instances = []
         
         for i in range(nombre_instances):
-            type_instance = random.choice(types)
-            nombre_plats = random.randint(5, 15)
-            nombre_commis = random.randint(2, 6)
+            type_instance = self.rng.choice(types)
+            nombre_plats = self.rng.randint(5, 15)
+            nombre_commis = self.rng.randint(2, 6)
             
             if type_instance == "simple":
                 instance = self.generer_instance_simple(nombre_plats, nombre_commis, f"batch_{i+1}_simple")
@@ -315,6 +336,151 @@ class InstanceGenerator:
         
         return instances
     
+    def _tirer_bloc(self, profil: str, taille: int, longs_restants: int, restants: int) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Tire un bloc de durées (épluchage, cuisson) en secondes pour un profil
+        
+        Pour le profil "difficile", les plats longs sont répartis par échantillonnage
+        séquentiel (chaque position est longue avec probabilité longs_restants / restants),
+        ce qui donne exactement le bon nombre de plats longs sans mélanger toute la liste.
+        
+        Returns:
+            Tuple (durées du bloc, nombre de plats longs restant à placer)
+        """
+        randint = self.rng.randint
+        
+        def uniforme(debut: int, fin: int) -> List[int]:
+            # Tirage d'un bloc entier de minutes uniformes en un seul appel
+            return self.rng.choices(range(debut * 60, (fin + 1) * 60, 60), k=taille)
+        
+        if profil == "simple":
+            return list(zip(uniforme(5, 20), uniforme(5, 30))), 0
+        
+        if profil == "desequilibree":
+            return list(zip(uniforme(8, 25), uniforme(10, 35))), 0
+        
+        if profil == "equilibree":
+            gauss = self.rng.gauss
+            return [
+                (max(60, min(int(gauss(600, 180)), 30 * 60)),
+                 max(60, min(int(gauss(900, 270)), 40 * 60)))
+                for _ in range(taille)
+            ], 0
+        
+        if profil == "difficile":
+            rand = self.rng.random
+            bloc = []
+            for _ in range(taille):
+                if rand() * restants < longs_restants:
+                    bloc.append((randint(20, 40) * 60, randint(30, 60) * 60))
+                    longs_restants -= 1
+                else:
+                    bloc.append((randint(2, 8) * 60, randint(5, 15) * 60))
+                restants -= 1
+            return bloc, longs_restants
+        
+        raise ValueError(f"Profil inconnu: {profil}")
+    
+    def iterer_blocs_plats(
+        self,
+        nombre_plats: int,
+        profil: str = "simple",
+        taille_bloc: int = 8192
+    ) -> Iterator[List[Dict]]:
+        """
+        Génère les plats d'une instance par blocs, sans jamais tout garder en mémoire
+        
+        Args:
+            nombre_plats: Nombre total de plats
+            profil: "simple", "equilibree", "difficile" ou "desequilibree"
+            taille_bloc: Nombre de plats tirés à la fois
+        
+        Yields:
+            Listes d'au plus taille_bloc plats
+        """
+        longs_restants = max(2, nombre_plats // 4) if profil == "difficile" else 0
+        
+        for debut in range(0, nombre_plats, taille_bloc):
+            taille = min(taille_bloc, nombre_plats - debut)
+            durees, longs_restants = self._tirer_bloc(
+                profil, taille, longs_restants, nombre_plats - debut
+            )
+            yield [
+                {
+                    "nom": self._nom_synthetique(debut + i),
+                    "temps_epluchage": epluchage,
+                    "temps_cuisson": cuisson
+                }
+                for i, (epluchage, cuisson) in enumerate(durees)
+            ]
+    
+    def generer_instance_massive(
+        self,
+        fichier: str,
+        nombre_plats: int,
+        nombre_commis: int,
+        profil: str = "simple",
+        nom: str = None,
+        taille_bloc: int = 8192
+    ) -> Dict:
+        """
+        Génère une très grande instance (jusqu'à 10^6 plats et plus) directement sur disque
+        
+        Le fichier a le même format que sauvegarder_instances (une seule instance),
+        en JSON compact. Les statistiques sont calculées au fil de l'eau, la mémoire
+        utilisée ne dépend que de taille_bloc.
+        
+        Args:
+            fichier: Chemin du fichier de sortie
+            nombre_plats: Nombre de plats
+            nombre_commis: Nombre de commis
+            profil: Profil de durées ("simple", "equilibree", "difficile", "desequilibree")
+            nom: Nom de l'instance
+            taille_bloc: Nombre de plats générés et écrits à la fois
+        
+        Returns:
+            Statistiques de l'instance générée
+        """
+        if profil not in self.PROFILS:
+            raise ValueError(f"Profil inconnu: {profil}")
+        
+        nom_instance = nom or f"instance_massive_{profil}_{nombre_plats}plats_{nombre_commis}commis"
+        entete = {
+            "metadata": {
+                "nombre_instances": 1,
+                "generateur": "InstanceGenerator v1.0",
+                "projet": "Ordonnancement Cuisine - Polytech Nice SI4"
+            }
+        }
+        
+        accumulateur = AccumulateurStatistiques(distribution=False)
+        
+        with open(fichier, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(entete, ensure_ascii=False)[:-1])
+            f.write(', "instances": [{')
+            f.write(f'"nom": {json.dumps(nom_instance, ensure_ascii=False)}, ')
+            description = f"Instance massive ({profil}) avec {nombre_plats} plats et {nombre_commis} commis"
+            f.write(f'"description": {json.dumps(description, ensure_ascii=False)}, ')
+            f.write('"plats": [')
+            
+            premier = True
+            for bloc in self.iterer_blocs_plats(nombre_plats, profil, taille_bloc):
+                accumulateur.ajouter_plats(bloc)
+                
+                morceau = json.dumps(bloc, ensure_ascii=False)[1:-1]
+                f.write(morceau if premier else ", " + morceau)
+                premier = False
+            
+            statistiques = formater_resume(accumulateur.resultat(nombre_commis), nombre_commis)
+            
+            f.write(f'], "nombre_commis": {nombre_commis}, ')
+            f.write(f'"difficulte": {json.dumps(self.PROFILS[profil]["difficulte"])}, ')
+            f.write(f'"statistiques": {json.dumps(statistiques)}')
+            f.write('}]}')
+        
+        print(f"✅ Instance massive de {nombre_plats} plats sauvegardée dans {fichier}")
+        return statistiques
+    
     def sauvegarder_instances(self, instances: List[Instance], fichier: str):
         """
         Sauvegarde les instances dans un fichier JSON
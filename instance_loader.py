@@ -4,6 +4,7 @@ Permet de charger et utiliser les instances générées dans l'interface web
 
 """
 
+import hashlib
 import json
 import os
 from typing import List, Dict, Optional
@@ -12,15 +13,22 @@ from typing import List, Dict, Optional
 class InstanceManager:
     """Gestionnaire des instances pour l'application"""
     
-    def __init__(self, instances_dir: str = "instances"):
+    # Fichiers d'instances connus, avec leur source
+    FICHIERS = [("reference_instances.json", "reference"), ("instances_test.json", "test")]
+    
+    def __init__(self, instances_dir: str = "instances", corpus=None):
         """
         Initialise le gestionnaire d'instances
         
         Args:
             instances_dir: Répertoire contenant les fichiers d'instances
+            corpus: CorpusBinaire optionnel (voir preparer_corpus) ; s'il est fourni,
+                    les instances sont lues dans le corpus mappé en mémoire
+                    au lieu de re-parser les fichiers JSON
         """
         self.instances_dir = instances_dir
         self.instances_cache = {}
+        self.corpus = corpus
     
     def charger_fichier_instances(self, fichier: str) -> Dict:
         """
@@ -54,6 +62,18 @@ class InstanceManager:
         """
         instances = []
         
+        if self.corpus is not None:
+            for vue in self.corpus:
+                instances.append({
+                    "nom": vue.nom,
+                    "description": vue.description,
+                    "nombre_plats": vue.nombre_plats,
+                    "nombre_commis": vue.nombre_commis,
+                    "difficulte": vue.difficulte or "non définie",
+                    "source": self.corpus.metadata.get("sources", {}).get(vue.nom, "corpus")
+                })
+            return instances
+        
         # Charger les instances de référence
         ref_data = self.charger_fichier_instances("reference_instances.json")
         for instance in ref_data.get("instances", []):
@@ -80,6 +100,39 @@ class InstanceManager:
         
         return instances
     
+    def version(self) -> tuple:
+        """
+        Version des instances disponibles, pour les validateurs HTTP (ETag / Last-Modified)
+        
+        Calculée à partir de la taille et de la date de modification des fichiers sources
+        (ou du corpus), sans les lire.
+        
+        Returns:
+            Tuple (version, date de dernière modification en secondes)
+        """
+        if self.corpus is not None:
+            chemins = [self.corpus.fichier]
+        else:
+            chemins = [os.path.join(self.instances_dir, nom) for nom, _ in self.FICHIERS]
+        
+        empreintes = []
+        derniere_modification = 0.0
+        for chemin in chemins:
+            try:
+                stat = os.stat(chemin)
+            except FileNotFoundError:
+                continue
+            empreintes.append(f"{os.path.basename(chemin)}:{stat.st_size}:{stat.st_mtime_ns}")
+            derniere_modification = max(derniere_modification, stat.st_mtime)
+        
+        # Un fichier modifié invalide aussi les instances gardées en cache
+        version = hashlib.blake2b("|".join(empreintes).encode(), digest_size=12).hexdigest()
+        if getattr(self, "_version_cache", None) != version:
+            self.instances_cache = {}
+            self._version_cache = version
+        
+        return version, derniere_modification
+    
     def obtenir_instance_par_nom(self, nom: str) -> Optional[Dict]:
         """
         Récupère une instance spécifique par son nom
@@ -94,6 +147,14 @@ class InstanceManager:
         if nom in self.instances_cache:
             return self.instances_cache[nom]
         
+        if self.corpus is not None:
+            vue = self.corpus.instance_par_nom(nom)
+            if vue is None:
+                return None
+            instance = vue.to_dict()
+            self.instances_cache[nom] = instance
+            return instance
+        
         # Chercher dans les fichiers
         for fichier in ["reference_instances.json", "instances_test.json"]:
             data = self.charger_fichier_instances(fichier)
@@ -176,6 +237,51 @@ class InstanceManager:
         return instance.to_dict()
 
 
+def preparer_corpus(instances_dir: str = "instances", fichier: str = "corpus.klbc"):
+    """
+    Construit (si besoin) et ouvre le corpus binaire de toutes les instances connues
+    
+    Le corpus est reconstruit quand un fichier JSON est plus récent que lui. Ouvert avant
+    de forker les workers du serveur, son mapping mémoire en lecture seule est partagé
+    par tous les processus au lieu que chacun parse les fichiers JSON.
+    
+    Args:
+        instances_dir: Répertoire contenant les fichiers d'instances
+        fichier: Nom du corpus binaire dans ce répertoire
+    
+    Returns:
+        CorpusBinaire ouvert
+    """
+    from corpus_binaire import CorpusBinaire, ecrire_corpus
+    
+    chemin = os.path.join(instances_dir, fichier)
+    sources_json = [
+        (os.path.join(instances_dir, nom), source) for nom, source in InstanceManager.FICHIERS
+        if os.path.exists(os.path.join(instances_dir, nom))
+    ]
+    
+    a_jour = os.path.exists(chemin) and all(
+        os.path.getmtime(source) <= os.path.getmtime(chemin) for source, _ in sources_json
+    )
+    
+    if not a_jour:
+        manager = InstanceManager(instances_dir)
+        instances = []
+        sources = {}
+        for source_json, source in sources_json:
+            data = manager.charger_fichier_instances(os.path.basename(source_json))
+            for instance in data.get("instances", []):
+                instances.append(instance)
+                sources[instance["nom"]] = source
+        
+        # Écriture atomique : les processus qui lisent l'ancien corpus ne sont pas perturbés
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        ecrire_corpus(instances, temporaire, {"sources": sources})
+        os.replace(temporaire, chemin)
+    
+    return CorpusBinaire(chemin)
+
+
 # Fonction d'aide pour l'intégration dans Flask
 def preparer_instances_pour_select() -> List[Dict]:
     """
@@ -0,0 +1,214 @@
+"""
+Résolution par lots : des milliers de scénarios en un seul appel HTTP
+Les scénarios sont regroupés en paquets résolus en parallèle dans des processus
+solveurs ; chaque paquet renvoie ses lignes NDJSON déjà sérialisées
+
+"""
+
+import json
+from concurrent.futures import as_completed
+from typing import Dict, Iterator, List, Optional
+
+from algorithms import SCHEDULERS, SCHEDULERS_COMPACTS
+from catalogue import estimer_makespans_stations
+from ingestion import parser_taches
+from reponses import Colonnes
+
+
+# Nombre de paquets par processus : assez pour équilibrer la charge,
+# assez peu pour amortir le coût d'envoi de chaque paquet
+PAQUETS_PAR_PROCESSUS = 4
+
+
+def _ligne(resultat: Dict) -> bytes:
+    return json.dumps(resultat, separators=(",", ":")).encode() + b"\n"
+
+
+def resoudre_scenario(scenario: Dict, details: bool = True) -> Dict:
+    """
+    Résout un scénario de lot
+
+    Args:
+        scenario: Forme /schedule ({'tasks': texte ou dict, 'num_workers', 'algorithm'}),
+                  forme /api/simulate ({'plats': [...]}) ou instance publiée en mémoire
+                  partagée ({'partage': (vue des noms, vue des durées), ...})
+        details: Inclure l'affectation complète des tâches (sinon makespan et charges)
+
+    Returns:
+        Dictionnaire résultat (lève ValueError si le scénario est invalide)
+    """
+    if "plats" in scenario:
+        makespans = estimer_makespans_stations(scenario["plats"])
+        return {"station_makespans": makespans, "estimated_total": sum(makespans.values())}
+
+    algorithm = scenario.get("algorithm", "greedy")
+    if algorithm not in SCHEDULERS:
+        raise ValueError(f"Algorithme non valide: {algorithm}")
+
+    num_workers = int(scenario.get("num_workers", 1))
+    if num_workers < 1:
+        raise ValueError("num_workers doit être au moins 1.")
+
+    if "partage" in scenario:
+        return _resoudre_partage(scenario, algorithm, num_workers, details)
+
+    tasks = scenario.get("tasks")
+    if isinstance(tasks, str):
+        tasks = parser_taches(tasks)
+    if not tasks:
+        raise ValueError("Aucune tâche fournie.")
+    if not isinstance(tasks, dict):
+        raise ValueError("'tasks' doit être un texte ou un dictionnaire {nom: temps}.")
+
+    workers, makespan = SCHEDULERS[algorithm](tasks, num_workers)
+    if details:
+        return {"workers": workers, "makespan": makespan}
+    return {"makespan": makespan, "charges": [w["time"] for w in workers]}
+
+
+def _resoudre_partage(scenario: Dict, algorithm: str, num_workers: int, details: bool) -> Dict:
+    """Résout une instance publiée par soumettre_lot, lue directement en mémoire partagée"""
+    from memoire_partagee import lire_noms, lire_vue
+
+    vue_noms, vue_temps = scenario["partage"]
+    temps = lire_vue(vue_temps)
+    affectation, debuts, charges, makespan = SCHEDULERS_COMPACTS[algorithm](temps, num_workers)
+    if not details:
+        return {"makespan": makespan, "charges": charges}
+    colonnes = Colonnes.depuis_compact(lire_noms(vue_noms), temps, affectation, debuts, charges, makespan)
+    return {"workers": colonnes.to_workers(), "makespan": makespan}
+
+
+def resoudre_paquet(paquet: List[tuple], details: bool = True) -> bytes:
+    """
+    Résout un paquet de scénarios (exécuté dans un processus solveur)
+
+    Args:
+        paquet: Liste de (index, identifiant, scénario)
+
+    Returns:
+        Les lignes NDJSON du paquet, concaténées
+    """
+    lignes = []
+    for index, identifiant, scenario in paquet:
+        # Une erreur ne concerne que sa ligne : le flux NDJSON déjà commencé n'est jamais coupé
+        try:
+            resultat = resoudre_scenario(scenario, details)
+        except (ValueError, TypeError, KeyError) as e:
+            resultat = {"error": str(e)}
+        except Exception as e:
+            resultat = {"error": f"{type(e).__name__}: {e}"}
+        resultat["index"] = index
+        if identifiant is not None:
+            resultat["id"] = identifiant
+        lignes.append(_ligne(resultat))
+    return b"".join(lignes)
+
+
+def normaliser_scenarios(elements: List, manager) -> Iterator[tuple]:
+    """
+    Transforme les éléments d'un lot en (index, identifiant, scénario)
+
+    Un élément est soit un scénario, soit le nom d'une instance stockée
+    (chaîne ou {'instance': nom}) ; les instances sont converties une seule fois
+    par nom. Les références inconnues donnent un scénario None.
+    """
+    instances = {}
+    for index, element in enumerate(elements):
+        nom = element if isinstance(element, str) else (
+            element.get("instance") if isinstance(element, dict) else None)
+
+        if nom is None:
+            if not isinstance(element, dict):
+                yield index, None, None
+                continue
+            yield index, element.get("id"), element
+            continue
+
+        if nom not in instances:
+            instance = manager.obtenir_instance_par_nom(nom)
+            if instance is None:
+                instances[nom] = None
+            else:
+                tasks, num_workers = manager.convertir_instance_pour_algorithme(instance)
+                instances[nom] = {"tasks": tasks, "num_workers": num_workers}
+
+        scenario = instances[nom]
+        if scenario is not None and isinstance(element, dict) and "algorithm" in element:
+            scenario = dict(scenario, algorithm=element["algorithm"])
+        yield index, element.get("id", nom) if isinstance(element, dict) else nom, scenario
+
+
+def decouper(scenarios: List[tuple], nombre_paquets: int) -> List[List[tuple]]:
+    """Découpe la liste en au plus nombre_paquets paquets contigus de tailles voisines"""
+    nombre_paquets = max(1, min(nombre_paquets, len(scenarios)))
+    taille, reste = divmod(len(scenarios), nombre_paquets)
+    paquets, debut = [], 0
+    for i in range(nombre_paquets):
+        fin = debut + taille + (1 if i < reste else 0)
+        paquets.append(scenarios[debut:fin])
+        debut = fin
+    return paquets
+
+
+def publier_instances(scenarios: List[tuple], pool) -> tuple:
+    """
+    Publie une seule fois en mémoire partagée chaque instance stockée du lot
+
+    Les scénarios issus d'une même instance (normaliser_scenarios) partagent le même
+    dictionnaire de tâches : ils ne référencent plus que les vues de ses colonnes,
+    au lieu d'envoyer le dictionnaire à chaque paquet.
+
+    Returns:
+        Tuple (scénarios réécrits, vues à libérer une fois le lot terminé)
+    """
+    publiees, vues, reecrits = {}, [], []
+    for index, identifiant, scenario in scenarios:
+        tasks = scenario.get("tasks") if isinstance(scenario, dict) else None
+        if (isinstance(tasks, dict) and tasks and scenario.get("algorithm", "greedy") in SCHEDULERS_COMPACTS
+                and all(isinstance(temps, int) for temps in tasks.values())):
+            partage = publiees.get(id(tasks))
+            if partage is None:
+                partage = publiees[id(tasks)] = (pool.publier_noms(list(tasks)), pool.publier(tasks.values()))
+                vues.extend(partage)
+            scenario = {key: valeur for key, valeur in scenario.items() if key != "tasks"}
+            scenario["partage"] = partage
+        reecrits.append((index, identifiant, scenario))
+    return reecrits, vues
+
+
+def soumettre_lot(scenarios: List[tuple], pool, details: bool = True) -> Optional[list]:
+    """
+    Soumet tous les paquets d'un lot au pool avant de commencer à répondre
+
+    Si le pool partage sa mémoire (ExecuteurPartage), les instances stockées sont
+    publiées une fois pour tout le lot (voir publier_instances).
+
+    Returns:
+        La liste des futures ; lève PoolSature (après avoir annulé les paquets déjà
+        soumis) si le pool n'a pas assez de places pour tout le lot
+    """
+    vues = []
+    if hasattr(pool, "publier"):
+        scenarios, vues = publier_instances(scenarios, pool)
+
+    paquets = decouper(scenarios, min(pool.max_en_cours, pool.processus * PAQUETS_PAR_PROCESSUS))
+    futures = []
+    try:
+        for paquet in paquets:
+            futures.append(pool.soumettre(resoudre_paquet, paquet, details))
+    except Exception:
+        for future in futures:
+            future.cancel()
+        if vues:
+            pool.liberer_apres(futures, *vues)
+        raise
+    if vues:
+        pool.liberer_apres(futures, *vues)
+    return futures
+
+
+def flux_resultats(futures: list) -> Iterator[bytes]:
+    """Produit les lignes NDJSON paquet par paquet, dans l'ordre de complétion"""
+    for future in as_completed(futures):
+        yield future.result()
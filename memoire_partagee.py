@@ -0,0 +1,161 @@
+"""
+Exécution parallèle sans copie : colonnes d'instances en mémoire partagée
+Les processus solveurs ne reçoivent que des vues (nom de bloc, décalage, longueur) ;
+les blocs sont réutilisés d'un lot à l'autre et libérés à la fermeture du pool
+
+"""
+
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Sequence
+
+from pool_solveurs import PoolSolveurs
+
+
+# Taille minimale d'un bloc : les petits lots partagent la même classe de blocs réutilisables
+TAILLE_MIN_BLOC = 64 * 1024
+
+
+class Vue(NamedTuple):
+    """Référence picklable vers une colonne d'un bloc partagé"""
+    bloc: str
+    decalage: int   # en octets
+    longueur: int   # en éléments
+    code: str       # code de type array/memoryview ('q', 'i', 'B'...)
+
+
+# Nombre de blocs gardés attachés par un processus solveur : au-delà, les moins récemment
+# lus sont détachés (un bloc détruit par le parent reste en mémoire tant qu'il est attaché)
+MAX_ATTACHES = 16
+
+# Blocs attachés par ce processus (côté solveur), par nom, du moins au plus récemment lu
+_attaches: Dict[str, shared_memory.SharedMemory] = OrderedDict()
+# Blocs évincés dont une vue est encore utilisée : détachés à une prochaine lecture
+_a_detacher: List[shared_memory.SharedMemory] = []
+
+
+def _detacher(bloc: shared_memory.SharedMemory) -> bool:
+    """Détache un bloc ; faux si des vues pointent encore dedans"""
+    try:
+        bloc.close()
+        return True
+    except BufferError:
+        return False
+
+
+def lire_vue(vue: Vue) -> memoryview:
+    """Colonne typée (memoryview) pointant directement dans le bloc partagé"""
+    bloc = _attaches.get(vue.bloc)
+    if bloc is None:
+        _a_detacher[:] = [ancien for ancien in _a_detacher if not _detacher(ancien)]
+        while len(_attaches) >= MAX_ATTACHES:
+            _, ancien = _attaches.popitem(last=False)
+            if not _detacher(ancien):
+                _a_detacher.append(ancien)
+        bloc = _attaches[vue.bloc] = shared_memory.SharedMemory(name=vue.bloc)
+    else:
+        _attaches.move_to_end(vue.bloc)
+    taille = vue.longueur * array(vue.code).itemsize
+    return bloc.buf[vue.decalage:vue.decalage + taille].cast(vue.code)
+
+
+def lire_noms(vue: Vue) -> List[str]:
+    """Noms publiés par ExecuteurPartage.publier_noms"""
+    return bytes(lire_vue(vue)).decode("utf-8").split("\n") if vue.longueur else []
+
+
+class ExecuteurPartage(PoolSolveurs):
+    """
+    Pool de processus solveurs dont les données transitent par des blocs de mémoire partagée.
+
+    Le processus parent publie les colonnes (durées, noms) ; les solveurs les lisent
+    directement dans les blocs (lire_vue, lire_noms). Un bloc rendu par liberer() est gardé
+    pour les publications suivantes de taille voisine, ce qui évite de recréer des segments
+    à chaque lot. Comme PoolSolveurs, le pool est créé paresseusement dans chaque processus.
+    """
+
+    def __init__(self, processus: int = None, max_en_cours: int = None):
+        super().__init__(processus or os.cpu_count() or 2, max_en_cours)
+        self._libres: List[shared_memory.SharedMemory] = []
+        self._utilises: Dict[str, shared_memory.SharedMemory] = {}
+        self._verrou_blocs = threading.Lock()
+        self._pid_blocs = os.getpid()
+
+    def _bloc(self, taille: int) -> shared_memory.SharedMemory:
+        """Un bloc libre d'au moins taille octets (au plus 4× plus grand), ou un nouveau bloc"""
+        with self._verrou_blocs:
+            if self._pid_blocs != os.getpid():
+                # Processus forké : les blocs hérités appartiennent au parent
+                self._libres, self._utilises, self._pid_blocs = [], {}, os.getpid()
+            for i, bloc in enumerate(self._libres):
+                if taille <= bloc.size <= 4 * max(taille, TAILLE_MIN_BLOC):
+                    del self._libres[i]
+                    self._utilises[bloc.name] = bloc
+                    return bloc
+            capacite = TAILLE_MIN_BLOC
+            while capacite < taille:
+                capacite *= 2
+            bloc = shared_memory.SharedMemory(create=True, size=capacite)
+            self._utilises[bloc.name] = bloc
+            return bloc
+
+    def publier(self, valeurs: Sequence[int], code: str = "q") -> Vue:
+        """Copie une colonne d'entiers dans un bloc partagé (une seule copie, côté parent)"""
+        colonne = valeurs if isinstance(valeurs, array) and valeurs.typecode == code else array(code, valeurs)
+        octets = memoryview(colonne).cast("B")
+        bloc = self._bloc(max(1, len(octets)))
+        bloc.buf[:len(octets)] = octets
+        return Vue(bloc.name, 0, len(colonne), code)
+
+    def publier_noms(self, noms: Sequence[str]) -> Vue:
+        """Publie des noms (UTF-8 séparés par des retours à la ligne)"""
+        return self.publier(array("B", "\n".join(noms).encode("utf-8")), "B")
+
+    def liberer(self, *vues: Vue):
+        """Rend les blocs des vues au pool (ils ne doivent plus être lus par les solveurs)"""
+        with self._verrou_blocs:
+            for vue in vues:
+                bloc = self._utilises.pop(vue.bloc, None)
+                if bloc is not None:
+                    self._libres.append(bloc)
+
+    def liberer_apres(self, futures: list, *vues: Vue):
+        """Rend les blocs des vues au pool quand toutes les futures sont terminées (ou annulées)"""
+        if not futures:
+            self.liberer(*vues)
+            return
+        restants = [len(futures)]
+        verrou = threading.Lock()
+
+        def termine(_):
+            with verrou:
+                restants[0] -= 1
+                if restants[0]:
+                    return
+            self.liberer(*vues)
+
+        for future in futures:
+            future.add_done_callback(termine)
+
+    def fermer(self):
+        """Arrête les solveurs et détruit tous les blocs partagés"""
+        super().fermer()
+        with self._verrou_blocs:
+            if self._pid_blocs != os.getpid():
+                return
+            for bloc in self._libres + list(self._utilises.values()):
+                bloc.close()
+                try:
+                    bloc.unlink()
+                except FileNotFoundError:
+                    pass
+            self._libres, self._utilises = [], {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
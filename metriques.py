@@ -0,0 +1,313 @@
+"""
+Instrumentation des requêtes de l'application Flask
+Histogrammes de latence et de taille par endpoint, temps solveur / sérialisation,
+compteurs par algorithme, exportés au format texte Prometheus sur /metrics
+
+Sous serveur_production.py, chaque worker publie ses compteurs dans un répertoire
+partagé et /metrics additionne ceux de tous les workers (voir Metriques.partager).
+
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from flask import Response, g, request
+
+
+# Bornes des histogrammes (en secondes et en octets), allouées une fois pour toutes
+BUCKETS_DUREE = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_TAILLE = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HISTOGRAMMES = {
+    "http_request_duration_seconds": ("Durée totale de traitement des requêtes", BUCKETS_DUREE),
+    "http_request_size_bytes": ("Taille des corps de requête", BUCKETS_TAILLE),
+    "http_response_size_bytes": ("Taille des corps de réponse", BUCKETS_TAILLE),
+    "solver_duration_seconds": ("Temps passé dans les algorithmes d'ordonnancement", BUCKETS_DUREE),
+    "serialization_duration_seconds": ("Temps entre la fin du solveur et l'envoi de la réponse", BUCKETS_DUREE),
+}
+
+COMPTEURS = {
+    "http_requests_total": "Nombre de requêtes par endpoint et code HTTP",
+    "algorithm_requests_total": "Nombre d'appels par endpoint et algorithme",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Période de publication des compteurs d'un worker dans le répertoire partagé (s)
+INTERVALLE_PUBLICATION = 1.0
+
+
+class _Fragment:
+    """Compteurs d'un seul thread : aucune synchronisation nécessaire pour les écrire"""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        # (nom, labels) -> [compte par bucket..., compte +Inf, somme, total]
+        self.histogrammes: Dict[Tuple[str, Labels], List[float]] = {}
+        self.compteurs: Dict[Tuple[str, Labels], int] = {}
+
+    def fusionner(self, autre: "_Fragment"):
+        for cle, valeurs in autre.histogrammes.items():
+            cible = self.histogrammes.setdefault(cle, [0] * len(valeurs))
+            for i, valeur in enumerate(valeurs):
+                cible[i] += valeur
+        for cle, valeur in autre.compteurs.items():
+            self.compteurs[cle] = self.compteurs.get(cle, 0) + valeur
+
+    def copie(self) -> "_Fragment":
+        """
+        Copie des compteurs, sûre même si le thread propriétaire continue d'écrire
+
+        dict() copie un dictionnaire d'un seul bloc, sans rendre la main aux autres threads :
+        on n'itère jamais un dictionnaire que son propriétaire peut agrandir.
+        """
+        copie = _Fragment()
+        copie.histogrammes = {cle: list(valeurs) for cle, valeurs in dict(self.histogrammes).items()}
+        copie.compteurs = dict(self.compteurs)
+        return copie
+
+    def vers_json(self) -> Dict:
+        return {
+            "histogrammes": [[nom, labels, valeurs] for (nom, labels), valeurs in self.histogrammes.items()],
+            "compteurs": [[nom, labels, valeur] for (nom, labels), valeur in self.compteurs.items()]
+        }
+
+    @classmethod
+    def depuis_json(cls, donnees: Dict) -> "_Fragment":
+        fragment = cls()
+        for nom, labels, valeurs in donnees["histogrammes"]:
+            fragment.histogrammes[(nom, tuple(tuple(label) for label in labels))] = valeurs
+        for nom, labels, valeur in donnees["compteurs"]:
+            fragment.compteurs[(nom, tuple(tuple(label) for label in labels))] = valeur
+        return fragment
+
+
+class Metriques:
+    """
+    Registre de métriques sans verrou sur le chemin critique.
+
+    Chaque thread écrit dans son propre fragment (threading.local) ; le verrou n'est pris
+    qu'à la première requête d'un thread, pour enregistrer son fragment et replier ceux
+    des threads terminés. L'export additionne des copies des fragments.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._verrou = threading.Lock()
+        self._fragments: List[_Fragment] = []
+        self._archive = _Fragment()
+        # Répertoire partagé entre processus (None : métriques de ce seul processus)
+        self.dossier = None
+        self._publie = None
+
+    def partager(self, dossier: str):
+        """
+        Additionne à l'export les métriques des autres processus (workers préforkés)
+
+        Chaque processus publie ses compteurs dans dossier/metriques-<pid>.json (voir
+        demarrer_publication). Les fichiers des workers terminés sont conservés : les
+        compteurs restent croissants quand le maître relance un worker.
+        """
+        self.dossier = dossier
+
+    def _fichier(self, pid: int) -> str:
+        return os.path.join(self.dossier, f"metriques-{pid}.json")
+
+    def publier(self):
+        """Écrit les compteurs de ce processus dans le répertoire partagé (remplacement atomique)"""
+        if self.dossier is None:
+            return
+        contenu = json.dumps(self._agreger().vers_json())
+        if contenu == self._publie:
+            return
+        fichier = self._fichier(os.getpid())
+        with open(fichier + ".tmp", "w", encoding="utf-8") as f:
+            f.write(contenu)
+        os.replace(fichier + ".tmp", fichier)
+        self._publie = contenu
+
+    def demarrer_publication(self, intervalle: float = INTERVALLE_PUBLICATION):
+        """Publie les compteurs de ce processus toutes les `intervalle` secondes (thread démon)"""
+        def publier_en_boucle():
+            while True:
+                time.sleep(intervalle)
+                try:
+                    self.publier()
+                except OSError:
+                    pass
+
+        threading.Thread(target=publier_en_boucle, name="publication-metriques", daemon=True).start()
+
+    def _fragment(self) -> _Fragment:
+        fragment = getattr(self._local, "fragment", None)
+        if fragment is None:
+            fragment = self._local.fragment = _Fragment()
+            with self._verrou:
+                # Le serveur de développement crée un thread par requête : on replie les
+                # fragments des threads terminés pour que leur nombre reste borné
+                vivants = []
+                for autre in self._fragments:
+                    if autre.thread.is_alive():
+                        vivants.append(autre)
+                    else:
+                        self._archive.fusionner(autre)
+                vivants.append(fragment)
+                self._fragments = vivants
+        return fragment
+
+    def observer(self, nom: str, valeur: float, labels: Labels = ()):
+        """Ajoute une observation à un histogramme"""
+        buckets = HISTOGRAMMES[nom][1]
+        histogrammes = self._fragment().histogrammes
+        cle = (nom, labels)
+        valeurs = histogrammes.get(cle)
+        if valeurs is None:
+            valeurs = histogrammes[cle] = [0] * (len(buckets) + 3)
+        valeurs[bisect_left(buckets, valeur)] += 1
+        valeurs[-2] += valeur
+        valeurs[-1] += 1
+
+    def incrementer(self, nom: str, labels: Labels = (), n: int = 1):
+        """Incrémente un compteur"""
+        compteurs = self._fragment().compteurs
+        cle = (nom, labels)
+        compteurs[cle] = compteurs.get(cle, 0) + n
+
+    def _agreger(self) -> _Fragment:
+        total = _Fragment()
+        # Copies sous le verrou : aucun fragment n'est replié dans l'archive pendant ce temps
+        with self._verrou:
+            copies = [fragment.copie() for fragment in [self._archive] + self._fragments]
+        for copie in copies:
+            total.fusionner(copie)
+        return total
+
+    def _agreger_processus(self) -> _Fragment:
+        """Compteurs de ce processus (à jour) et derniers publiés par les autres"""
+        total = self._agreger()
+        if self.dossier is None:
+            return total
+        propre = self._fichier(os.getpid())
+        for fichier in glob.glob(os.path.join(self.dossier, "metriques-*.json")):
+            if fichier == propre:
+                continue
+            try:
+                with open(fichier, encoding="utf-8") as f:
+                    total.fusionner(_Fragment.depuis_json(json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return total
+
+    def exporter(self) -> str:
+        """Exporte toutes les métriques au format texte Prometheus (version 0.0.4)"""
+        total = self._agreger_processus()
+        lignes = []
+
+        for nom, aide in COMPTEURS.items():
+            lignes.append(f"# HELP {nom} {aide}")
+            lignes.append(f"# TYPE {nom} counter")
+            for (nom_compteur, labels), valeur in sorted(total.compteurs.items()):
+                if nom_compteur == nom:
+                    lignes.append(f"{nom}{_formater_labels(labels)} {valeur}")
+
+        for nom, (aide, buckets) in HISTOGRAMMES.items():
+            lignes.append(f"# HELP {nom} {aide}")
+            lignes.append(f"# TYPE {nom} histogram")
+            for (nom_histo, labels), valeurs in sorted(total.histogrammes.items()):
+                if nom_histo != nom:
+                    continue
+                cumul = 0
+                for borne, compte in zip(buckets + ("+Inf",), valeurs):
+                    cumul += compte
+                    lignes.append(f"{nom}_bucket{_formater_labels(labels + (('le', str(borne)),))} {cumul}")
+                lignes.append(f"{nom}_sum{_formater_labels(labels)} {valeurs[-2]}")
+                lignes.append(f"{nom}_count{_formater_labels(labels)} {valeurs[-1]}")
+
+        return "\n".join(lignes) + "\n"
+
+
+def _formater_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    contenu = ",".join(
+        '{}="{}"'.format(cle, str(valeur).replace("\\", "\\\\").replace('"', '\\"'))
+        for cle, valeur in labels
+    )
+    return "{" + contenu + "}"
+
+
+metriques = Metriques()
+
+
+def _endpoint() -> str:
+    # La règle de routage (et non le chemin brut) évite d'exploser le nombre de séries
+    return request.url_rule.rule if request.url_rule is not None else "inconnu"
+
+
+@contextmanager
+def chronometre_solveur(algorithme: str):
+    """
+    Mesure le temps passé dans un solveur et compte l'appel pour cet algorithme
+
+    Usage dans un endpoint :
+        with chronometre_solveur(algorithm):
+            workers, makespan = greedy_scheduler(tasks, num_workers)
+    """
+    endpoint = _endpoint()
+    metriques.incrementer("algorithm_requests_total", (("algorithm", algorithme), ("endpoint", endpoint)))
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        fin = time.perf_counter()
+        g.temps_solveur = getattr(g, "temps_solveur", 0.0) + fin - debut
+        g.fin_solveur = fin
+
+
+def compter_algorithme(algorithme: str):
+    """Compte un appel pour un algorithme, sans solveur à chronométrer"""
+    metriques.incrementer("algorithm_requests_total", (("algorithm", algorithme), ("endpoint", _endpoint())))
+
+
+def installer_metriques(app):
+    """Branche l'instrumentation sur une application Flask et ajoute l'endpoint /metrics"""
+
+    @app.before_request
+    def _debut_requete():
+        g.debut_requete = time.perf_counter()
+
+    @app.after_request
+    def _fin_requete(response):
+        debut = getattr(g, "debut_requete", None)
+        if debut is None:
+            return response
+
+        maintenant = time.perf_counter()
+        endpoint = (("endpoint", _endpoint()),)
+
+        metriques.incrementer("http_requests_total", endpoint + (("status", str(response.status_code)),))
+        metriques.observer("http_request_duration_seconds", maintenant - debut, endpoint)
+
+        if request.content_length:
+            metriques.observer("http_request_size_bytes", request.content_length, endpoint)
+        if response.content_length is not None:
+            metriques.observer("http_response_size_bytes", response.content_length, endpoint)
+
+        if hasattr(g, "fin_solveur"):
+            metriques.observer("solver_duration_seconds", g.temps_solveur, endpoint)
+            metriques.observer("serialization_duration_seconds", maintenant - g.fin_solveur, endpoint)
+
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def exporter_metriques():
+        """Métriques au format texte Prometheus"""
+        return Response(metriques.exporter(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    return metriques
@@ -0,0 +1,67 @@
+"""
+Oracle exact pour les très petites instances
+Énumère toutes les affectations (à symétrie des commis près) pour obtenir le makespan
+optimal et une affectation qui l'atteint : la référence des vérifications de fuzzing.py
+
+"""
+
+from typing import List, Sequence, Tuple
+
+
+# Au-delà, l'énumération devient trop longue pour servir d'oracle à chaque tirage
+MAX_TACHES_ORACLE = 12
+
+
+def optimum_exhaustif(temps: Sequence[int], nombre_commis: int) -> Tuple[int, List[int]]:
+    """
+    Makespan optimal par énumération exhaustive
+
+    Les tâches sont placées de la plus longue à la plus courte. Deux commis de même charge
+    étant interchangeables, une tâche n'est essayée que sur un commis par charge distincte ;
+    une branche est abandonnée dès qu'elle ne peut plus battre la meilleure solution connue.
+    Ces coupes n'écartent aucune affectation strictement meilleure : le résultat est exact.
+
+    Args:
+        temps: Durées des tâches
+        nombre_commis: Nombre de commis (au moins 1)
+
+    Returns:
+        Tuple (makespan optimal, affectation : commis de chaque tâche, dans l'ordre de temps)
+    """
+    if nombre_commis < 1:
+        raise ValueError("Il faut au moins un commis")
+    if len(temps) > MAX_TACHES_ORACLE:
+        raise ValueError(f"L'oracle est limité à {MAX_TACHES_ORACLE} tâches")
+
+    ordre = sorted(range(len(temps)), key=lambda i: temps[i], reverse=True)
+    total = sum(temps)
+    borne = max(max(temps, default=0), -(-total // nombre_commis))
+
+    # Solution initiale : tout sur le premier commis (toujours valide)
+    meilleur = [total, [0] * len(temps)]
+    charges = [0] * nombre_commis
+    courante = [0] * len(temps)
+
+    def explorer(position: int, maximum: int):
+        if maximum >= meilleur[0]:
+            return
+        if position == len(ordre):
+            meilleur[0], meilleur[1] = maximum, list(courante)
+            return
+        tache = ordre[position]
+        deja_essayees = set()
+        for commis in range(nombre_commis):
+            charge = charges[commis]
+            if charge in deja_essayees:
+                continue
+            deja_essayees.add(charge)
+            charges[commis] = charge + temps[tache]
+            courante[tache] = commis
+            explorer(position + 1, max(maximum, charges[commis]))
+            charges[commis] = charge
+            # Optimalité prouvée : inutile d'explorer le reste
+            if meilleur[0] == borne:
+                return
+
+    explorer(0, 0)
+    return meilleur[0], meilleur[1]
@@ -0,0 +1,74 @@
+"""
+Pool borné de processus solveurs
+Les résolutions lourdes quittent le processus web, qui reste disponible pour les endpoints rapides
+
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+class PoolSature(Exception):
+    """Levée quand le pool a déjà atteint son nombre maximal de résolutions en cours"""
+
+
+class PoolSolveurs:
+    """
+    Pool de processus à capacité bornée.
+
+    Au plus max_en_cours résolutions sont acceptées à la fois (en cours d'exécution ou en
+    attente d'un processus libre) ; au-delà, resoudre() lève PoolSature immédiatement
+    plutôt que d'empiler les requêtes. Le pool est créé paresseusement dans le processus
+    qui l'utilise, ce qui le rend sûr avec un serveur qui forke ses workers.
+    """
+
+    def __init__(self, processus: int = 2, max_en_cours: int = None):
+        """
+        Args:
+            processus: Nombre de processus solveurs
+            max_en_cours: Nombre maximal de résolutions acceptées simultanément
+                          (défaut: 4 par processus)
+        """
+        self.processus = processus
+        self.max_en_cours = max_en_cours or 4 * processus
+        self._places = threading.BoundedSemaphore(self.max_en_cours)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._verrou = threading.Lock()
+
+    def _executeur(self) -> ProcessPoolExecutor:
+        if self._executor is None or self._pid != os.getpid():
+            with self._verrou:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(max_workers=self.processus)
+                    self._pid = os.getpid()
+        return self._executor
+
+    def soumettre(self, fonction: Callable, *args):
+        """
+        Soumet une résolution sans attendre son résultat
+
+        Returns:
+            Un Future ; la place est libérée à la fin de la résolution
+        """
+        if not self._places.acquire(blocking=False):
+            raise PoolSature(f"{self.max_en_cours} résolutions déjà en cours")
+        try:
+            future = self._executeur().submit(fonction, *args)
+        except BaseException:
+            self._places.release()
+            raise
+        future.add_done_callback(lambda _: self._places.release())
+        return future
+
+    def resoudre(self, fonction: Callable, *args, timeout: float = None):
+        """Exécute fonction(*args) dans un processus solveur et attend le résultat"""
+        return self.soumettre(fonction, *args).result(timeout=timeout)
+
+    def fermer(self):
+        """Arrête les processus solveurs"""
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
@@ -0,0 +1,233 @@
+"""
+Profilage à la demande des moteurs d'ordonnancement
+cProfile ou échantillonnage de pile autour d'une résolution, et instantanés
+tracemalloc pour le générateur et le validateur d'instances
+
+Usage:
+    python profilage.py --plats 100000 --commis 8 --mode cprofile
+    python profilage.py --instance exemple_benchmark_complexe --mode echantillonnage --sortie pile.txt
+    python profilage.py --memoire --plats 10000
+
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+MODES = ("cprofile", "echantillonnage")
+
+
+class ResultatProfil:
+    """Résultat d'un profilage : sortie texte et format de cette sortie"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.duree = 0.0
+        self.stats: Optional[pstats.Stats] = None
+        self.piles: Counter = Counter()
+
+    @property
+    def format(self) -> str:
+        return "pstats" if self.mode == "cprofile" else "collapsed"
+
+    def texte(self, limite: int = 30) -> str:
+        """
+        Sortie lisible : tableau pstats trié par temps cumulé (cProfile),
+        ou piles repliées « a;b;c N » compatibles flamegraph.pl / speedscope (échantillonnage)
+        """
+        if self.stats is not None:
+            flux = io.StringIO()
+            self.stats.stream = flux
+            self.stats.sort_stats("cumulative").print_stats(limite)
+            return flux.getvalue()
+        return "\n".join(f"{pile} {n}" for pile, n in self.piles.most_common())
+
+    def sauvegarder(self, fichier: str):
+        """Écrit un fichier .prof (lisible par pstats / snakeviz) ou un fichier de piles repliées"""
+        if self.stats is not None:
+            self.stats.dump_stats(fichier)
+        else:
+            with open(fichier, "w", encoding="utf-8") as f:
+                f.write(self.texte() + "\n")
+
+    def to_dict(self, limite: int = 30) -> Dict:
+        return {"mode": self.mode, "format": self.format, "duree": self.duree, "sortie": self.texte(limite)}
+
+
+class EchantillonneurPile:
+    """
+    Profileur par échantillonnage : un thread relève la pile du thread observé
+    à intervalle régulier, sans instrumenter les appels (surcoût quasi nul)
+    """
+
+    def __init__(self, intervalle: float = 0.001):
+        self.intervalle = intervalle
+        self.piles: Counter = Counter()
+        self._cible = None
+        self._arret = threading.Event()
+        self._thread = None
+
+    def _echantillonner(self):
+        while not self._arret.wait(self.intervalle):
+            frame = sys._current_frames().get(self._cible)
+            pile = []
+            while frame is not None:
+                code = frame.f_code
+                pile.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            if pile:
+                self.piles[";".join(reversed(pile))] += 1
+
+    def demarrer(self):
+        self._cible = threading.get_ident()
+        self._arret.clear()
+        self._thread = threading.Thread(target=self._echantillonner, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        self._thread.join()
+
+
+@contextmanager
+def profiler(mode: str = "cprofile", intervalle: float = 0.001):
+    """
+    Profile le bloc de code englobé
+
+    Usage :
+        with profiler("cprofile") as profil:
+            greedy_scheduler(tasks, 4)
+        print(profil.texte())
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode de profilage inconnu: {mode} (attendu: {', '.join(MODES)})")
+
+    resultat = ResultatProfil(mode)
+    debut = time.perf_counter()
+
+    if mode == "cprofile":
+        profileur = cProfile.Profile()
+        profileur.enable()
+        try:
+            yield resultat
+        finally:
+            profileur.disable()
+            resultat.duree = time.perf_counter() - debut
+            resultat.stats = pstats.Stats(profileur)
+    else:
+        echantillonneur = EchantillonneurPile(intervalle)
+        echantillonneur.demarrer()
+        try:
+            yield resultat
+        finally:
+            echantillonneur.arreter()
+            resultat.duree = time.perf_counter() - debut
+            resultat.piles = echantillonneur.piles
+
+
+def mesurer_memoire(fonction: Callable, *args, top: int = 10, **kwargs) -> tuple:
+    """
+    Exécute une fonction sous tracemalloc et résume ses allocations
+
+    Returns:
+        Tuple (résultat de la fonction, {"pic_octets", "courant_octets", "top": [...]})
+    """
+    deja_actif = tracemalloc.is_tracing()
+    if not deja_actif:
+        tracemalloc.start()
+    if hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+        tracemalloc.reset_peak()
+    avant = tracemalloc.take_snapshot()
+
+    try:
+        resultat = fonction(*args, **kwargs)
+        apres = tracemalloc.take_snapshot()
+        courant, pic = tracemalloc.get_traced_memory()
+    finally:
+        if not deja_actif:
+            tracemalloc.stop()
+
+    differences = apres.compare_to(avant, "lineno")
+    rapport = {
+        "pic_octets": pic,
+        "courant_octets": courant,
+        "top": [
+            {"ligne": str(stat.traceback), "octets": stat.size_diff, "blocs": stat.count_diff}
+            for stat in differences[:top]
+        ]
+    }
+    return resultat, rapport
+
+
+def _afficher_memoire(titre: str, rapport: Dict):
+    print(f"\n🧠 {titre}: pic {rapport['pic_octets'] / 1024:.1f} Kio, "
+          f"retenu {rapport['courant_octets'] / 1024:.1f} Kio")
+    for ligne in rapport["top"]:
+        print(f"   • {ligne['octets'] / 1024:9.1f} Kio  {ligne['blocs']:7d} blocs  {ligne['ligne']}")
+
+
+def main():
+    """Point d'entrée : profile une résolution ou la mémoire du générateur/validateur"""
+    from algorithms import SCHEDULERS
+    from instance_generator import InstanceGenerator
+    from instance_loader import InstanceManager
+    from validator import InstanceValidator
+
+    parser = argparse.ArgumentParser(description="Profilage des moteurs d'ordonnancement")
+    parser.add_argument("--mode", choices=MODES, default="cprofile")
+    parser.add_argument("--algorithme", choices=sorted(SCHEDULERS), default="greedy")
+    parser.add_argument("--instance", type=str, default=None, help="Nom d'une instance de référence")
+    parser.add_argument("--plats", type=int, default=100_000, help="Taille de l'instance générée")
+    parser.add_argument("--commis", type=int, default=8)
+    parser.add_argument("--profil", type=str, default="simple", choices=sorted(InstanceGenerator.PROFILS))
+    parser.add_argument("--sortie", type=str, default=None,
+                        help="Fichier de sortie (.prof pour cProfile, piles repliées sinon)")
+    parser.add_argument("--memoire", action="store_true",
+                        help="Instantanés tracemalloc du générateur et du validateur")
+    args = parser.parse_args()
+
+    generator = InstanceGenerator(seed=42)
+
+    if args.memoire:
+        instance, rapport = mesurer_memoire(
+            generator.generer_instance_simple, args.plats, args.commis
+        )
+        _afficher_memoire(f"Génération ({args.plats} plats)", rapport)
+        _, rapport = mesurer_memoire(InstanceValidator().valider_instance, instance.to_dict())
+        _afficher_memoire("Validation", rapport)
+        return
+
+    if args.instance:
+        instance = InstanceManager().obtenir_instance_par_nom(args.instance)
+        if instance is None:
+            print(f"❌ Instance inconnue: {args.instance}")
+            sys.exit(1)
+        tasks, num_workers = InstanceManager().convertir_instance_pour_algorithme(instance)
+    else:
+        tasks = {}
+        for bloc in generator.iterer_blocs_plats(args.plats, args.profil):
+            for plat in bloc:
+                tasks[plat["nom"]] = plat["temps_epluchage"] + plat["temps_cuisson"]
+        num_workers = args.commis
+
+    with profiler(args.mode) as profil:
+        SCHEDULERS[args.algorithme](tasks, num_workers)
+
+    print(f"⏱️  {args.algorithme} sur {len(tasks)} tâches, {num_workers} commis: {profil.duree * 1000:.1f} ms\n")
+    if args.sortie:
+        profil.sauvegarder(args.sortie)
+        print(f"📁 Profil écrit dans {args.sortie}")
+    else:
+        print(profil.texte())
+
+
+if __name__ == "__main__":
+    main()
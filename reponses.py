@@ -0,0 +1,240 @@
+"""
+Formats de réponse compacts pour les ordonnancements
+Colonnes (index de tâche -> travailleur, début, fin), encodage binaire, encodeur
+JSON rapide optionnel (orjson) et compression gzip des gros corps
+
+Les colonnes sont indexées par tâche dans l'ordre de la requête : le client retrouve
+chaque tâche par sa position, et les noms ne sont renvoyés que sur demande (?noms=1).
+
+Format binaire (application/vnd.kitchen.schedule), petit-boutiste :
+    en-tête  "<4sHHIIQ" : magic b"KLBS", version, drapeaux, n tâches, m travailleurs, makespan
+    worker   n × int32
+    debut    n × int32 (int64 si drapeau TEMPS_64)
+    fin      n × int32 (int64 si drapeau TEMPS_64)
+    charges  m × int64
+    noms     UTF-8 séparés par "\\n", jusqu'à la fin du corps (si drapeau NOMS)
+
+Les clés annexes du résultat (erreurs, lignes_rejetees, best_known, profile...) n'ont pas
+de place dans le corps binaire : elles passent en JSON ASCII dans l'en-tête X-Kitchen-Meta,
+borné à TAILLE_MAX_META octets (voir meta_binaire).
+
+"""
+
+import gzip
+import json
+import operator
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from flask import Response, jsonify
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+
+MODES = ("json", "colonnes", "binaire")
+
+TYPE_COLONNES = "application/vnd.kitchen.columns+json"
+TYPE_BINAIRE = "application/vnd.kitchen.schedule"
+
+MAGIC = b"KLBS"
+VERSION = 1
+ENTETE = struct.Struct("<4sHHIIQ")
+
+# Drapeaux de l'en-tête binaire
+TEMPS_64 = 1
+NOMS = 2
+
+# En-tête portant les clés annexes en mode binaire. Beaucoup de mandataires refusent les
+# en-têtes de plus de 8 Ko : au-delà, les erreurs détaillées sont tronquées ou les plus
+# grosses clés omises (le client les retrouve en mode json ou colonnes)
+EN_TETE_META = "X-Kitchen-Meta"
+TAILLE_MAX_META = 8 * 1024
+
+# Taille à partir de laquelle un corps est compressé (si le client accepte gzip).
+# Niveau 3 : l'essentiel du gain sur ces données très répétitives, pour une fraction du temps du niveau 9
+SEUIL_GZIP = 16 * 1024
+NIVEAU_GZIP = 3
+
+
+class Colonnes:
+    """Ordonnancement en colonnes : une entrée par tâche, dans un ordre fixé"""
+
+    def __init__(self, noms: List[str], worker: array, debut: array, fin: array,
+                 charges: List[int], makespan: int):
+        self.noms = noms
+        self.worker = worker
+        self.debut = debut
+        self.fin = fin
+        self.charges = charges
+        self.makespan = makespan
+
+    @classmethod
+    def depuis_compact(cls, noms: List[str], temps, affectation, debuts, charges: List[int],
+                       makespan: int) -> "Colonnes":
+        """Depuis le résultat d'un ordonnanceur compact (voir SCHEDULERS_COMPACTS)"""
+        fin = array("q", map(operator.add, debuts, temps))
+        return cls(noms, affectation, debuts, fin, list(charges), makespan)
+
+    def to_workers(self) -> List[Dict]:
+        """Format historique [{'time', 'tasks': [(nom, temps)]}], tâches dans l'ordre d'exécution"""
+        workers = [{"time": charge, "tasks": []} for charge in self.charges]
+        for i in sorted(range(len(self.noms)), key=self.debut.__getitem__):
+            workers[self.worker[i]]["tasks"].append((self.noms[i], self.fin[i] - self.debut[i]))
+        return workers
+
+    def to_dict(self, noms: bool = False) -> Dict:
+        colonnes = {
+            "format": "colonnes",
+            "makespan": self.makespan,
+            "num_workers": len(self.charges),
+            "charges": self.charges,
+            "worker": self.worker.tolist(),
+            "debut": self.debut.tolist(),
+            "fin": self.fin.tolist()
+        }
+        if noms:
+            colonnes["noms"] = self.noms
+        return colonnes
+
+    def to_bytes(self, noms: bool = False) -> bytes:
+        drapeaux = (NOMS if noms else 0) | (TEMPS_64 if self.makespan >= 2 ** 31 else 0)
+        code_temps = "q" if drapeaux & TEMPS_64 else "i"
+        colonnes = [array("i", self.worker), array(code_temps, self.debut),
+                    array(code_temps, self.fin), array("q", self.charges)]
+        if sys.byteorder != "little":
+            for colonne in colonnes:
+                colonne.byteswap()
+        morceaux = [ENTETE.pack(MAGIC, VERSION, drapeaux, len(self.worker), len(self.charges), self.makespan)]
+        morceaux.extend(colonne.tobytes() for colonne in colonnes)
+        if noms:
+            morceaux.append("\n".join(self.noms).encode("utf-8"))
+        return b"".join(morceaux)
+
+
+def lire_binaire(donnees: bytes) -> Colonnes:
+    """Décode une réponse binaire (outil client / vérification)"""
+    magic, version, drapeaux, n, m, makespan = ENTETE.unpack_from(donnees)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Réponse binaire invalide")
+    code_temps = "q" if drapeaux & TEMPS_64 else "i"
+    position = ENTETE.size
+    colonnes = []
+    for code, taille in (("i", n), (code_temps, n), (code_temps, n), ("q", m)):
+        colonne = array(code)
+        colonne.frombytes(donnees[position:position + taille * colonne.itemsize])
+        if sys.byteorder != "little":
+            colonne.byteswap()
+        position += taille * colonne.itemsize
+        colonnes.append(colonne)
+    worker, debut, fin, charges = colonnes
+    noms = donnees[position:].decode("utf-8").split("\n") if drapeaux & NOMS and n else []
+    return Colonnes(noms, array("l", worker), array("q", debut), array("q", fin), charges.tolist(), makespan)
+
+
+def negocier_mode(requete) -> str:
+    """
+    Mode de réponse demandé : paramètre ?format=json|colonnes|binaire, sinon en-tête Accept
+    (application/vnd.kitchen.columns+json ou application/vnd.kitchen.schedule), sinon json
+    """
+    mode = requete.args.get("format")
+    if mode in MODES:
+        return mode
+    # Correspondance exacte seulement : un client qui envoie */* reçoit le JSON historique
+    acceptes = [valeur for valeur, qualite in requete.accept_mimetypes if qualite > 0]
+    if TYPE_BINAIRE in acceptes:
+        return "binaire"
+    if TYPE_COLONNES in acceptes:
+        return "colonnes"
+    return "json"
+
+
+def serialiser_json(objet) -> bytes:
+    """JSON compact, par orjson s'il est installé"""
+    if orjson is not None:
+        return orjson.dumps(objet, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(objet, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def meta_binaire(result: Dict) -> Optional[str]:
+    """
+    Clés annexes du résultat pour l'en-tête X-Kitchen-Meta (JSON ASCII d'au plus TAILLE_MAX_META octets)
+
+    Tant que le JSON est trop gros, la plus grosse clé est réduite : la liste 'erreurs' est
+    raccourcie de moitié (avec 'erreurs_tronquees', le total restant dans 'lignes_rejetees'),
+    toute autre clé est retirée et nommée dans 'cles_omises'.
+
+    Returns:
+        Le contenu de l'en-tête, ou None s'il n'y a aucune clé annexe
+    """
+    meta = {cle: valeur for cle, valeur in result.items() if cle not in ("workers", "makespan")}
+    if not meta:
+        return None
+
+    def encoder(objet) -> str:
+        return json.dumps(objet, separators=(",", ":"), sort_keys=True)
+
+    texte = encoder(meta)
+    omises = []
+    while len(texte) > TAILLE_MAX_META:
+        # On réduit la plus grosse clé : moitié des erreurs détaillées, ou omission de la clé
+        cle = max((c for c in meta if c != "cles_omises"), key=lambda c: len(encoder(meta[c])))
+        if cle == "erreurs" and meta["erreurs"]:
+            meta["erreurs"] = meta["erreurs"][:len(meta["erreurs"]) // 2]
+            meta["erreurs_tronquees"] = True
+        else:
+            del meta[cle]
+            omises.append(cle)
+            meta["cles_omises"] = omises
+        texte = encoder(meta)
+    return texte
+
+
+def compresser(reponse: Response, requete) -> Response:
+    """Compresse en gzip un corps de plus de SEUIL_GZIP octets si le client l'accepte"""
+    reponse.vary.add("Accept-Encoding")
+    if ("gzip" not in requete.accept_encodings or reponse.direct_passthrough
+            or reponse.content_length is None or reponse.content_length < SEUIL_GZIP
+            or "Content-Encoding" in reponse.headers):
+        return reponse
+    reponse.set_data(gzip.compress(reponse.get_data(), compresslevel=NIVEAU_GZIP))
+    reponse.headers["Content-Encoding"] = "gzip"
+    return reponse
+
+
+def reponse_ordonnancement(requete, result: Dict, colonnes: Optional[Colonnes] = None) -> Response:
+    """
+    Construit la réponse d'un ordonnancement dans le mode négocié
+
+    Args:
+        requete: La requête Flask
+        result: Les clés annexes du résultat, plus 'workers' et 'makespan' au format
+                historique si colonnes n'est pas fourni
+        colonnes: Les colonnes de l'ordonnancement (obligatoires hors mode json)
+
+    En mode binaire, les clés annexes de result passent dans l'en-tête X-Kitchen-Meta.
+    """
+    mode = negocier_mode(requete)
+
+    if mode == "json":
+        if "workers" not in result:
+            result = dict(result, workers=colonnes.to_workers(), makespan=colonnes.makespan)
+        reponse = (Response(serialiser_json(result), mimetype="application/json")
+                   if orjson is not None else jsonify(result))
+        return compresser(reponse, requete)
+
+    noms = requete.args.get("noms") == "1"
+    if mode == "binaire":
+        reponse = Response(colonnes.to_bytes(noms), mimetype=TYPE_BINAIRE)
+        meta = meta_binaire(result)
+        if meta is not None:
+            reponse.headers[EN_TETE_META] = meta
+    else:
+        corps = colonnes.to_dict(noms)
+        corps.update(result)
+        reponse = Response(serialiser_json(corps), mimetype=TYPE_COLONNES)
+    return compresser(reponse, requete)
@@ -0,0 +1,279 @@
+"""
+Point d'entrée de production : serveur multi-processus préforké
+Les workers partagent un corpus d'instances mappé en mémoire (lecture seule)
+et déportent les résolutions lourdes dans un pool de solveurs borné
+
+Les endpoints à état (file de travaux /api/jobs, sessions /api/sessions) sont servis par un processus unique,
+le processus des moteurs, à l'écoute sur une socket locale : les workers lui relaient
+ces requêtes (RelaisMoteurs), quel que soit celui qui reçoit la connexion.
+
+Usage:
+    python serveur_production.py --workers 4 --port 5000
+
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from werkzeug.serving import make_server
+
+from app import app
+from instance_loader import InstanceManager, preparer_corpus
+from memoire_partagee import ExecuteurPartage
+from metriques import metriques
+from pool_solveurs import PoolSolveurs
+
+
+def configurer_application(instances_dir: str, processus_solveurs: int, seuil_pool: int):
+    """
+    Prépare l'application avant le fork : corpus partagé et pool de solveurs
+
+    Le corpus est ouvert ici, dans le processus maître : après fork, tous les workers
+    lisent les mêmes pages mappées au lieu de charger chacun leur copie des JSON.
+    Les pools de solveurs (résolutions et lots), eux, sont créés paresseusement dans
+    chaque worker, avec processus_solveurs processus chacun. Le profilage
+    à la demande (X-Profile) est toujours désactivé en production.
+    """
+    corpus = preparer_corpus(instances_dir)
+    app.config['INSTANCES'] = InstanceManager(instances_dir, corpus=corpus)
+    app.config['SEUIL_POOL'] = seuil_pool
+    app.config['PROFILAGE_AUTORISE'] = False
+    if processus_solveurs > 0:
+        app.config['POOL_SOLVEURS'] = PoolSolveurs(processus_solveurs)
+        app.config['POOL_LOTS'] = ExecuteurPartage(processus_solveurs)
+    else:
+        app.config['POOL_LOTS'] = None
+    app.debug = False
+    return corpus
+
+
+def ouvrir_socket(hote: str, port: int, backlog: int = 1024) -> socket.socket:
+    """Ouvre la socket d'écoute partagée par tous les workers"""
+    famille = socket.AF_INET6 if ":" in hote else socket.AF_INET
+    sock = socket.socket(famille, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((hote, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+# Endpoints servis par le processus des moteurs (leur état n'existe que dans ce processus)
+PREFIXES_MOTEURS = ('/api/jobs', '/api/sessions')
+
+# En-têtes propres à une connexion, jamais relayés
+EN_TETES_CONNEXION = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+                      'te', 'trailer', 'transfer-encoding', 'upgrade'}
+
+
+class RelaisMoteurs:
+    """
+    Middleware WSGI des workers : relaie au processus des moteurs les requêtes
+    des endpoints à état, et passe les autres à l'application.
+
+    La réponse est renvoyée au fil de sa lecture (les flux restent des flux).
+    Si le processus des moteurs ne répond pas, le client reçoit un 503.
+    """
+
+    def __init__(self, application, port_moteurs: int, prefixes: tuple = PREFIXES_MOTEURS):
+        self.application = application
+        self.port_moteurs = port_moteurs
+        self.prefixes = prefixes
+
+    def concerne(self, chemin: str) -> bool:
+        return any(chemin == prefixe or chemin.startswith(prefixe + '/') for prefixe in self.prefixes)
+
+    def __call__(self, environ, start_response):
+        if not self.concerne(environ.get('PATH_INFO', '')):
+            return self.application(environ, start_response)
+        return self._relayer(environ, start_response)
+
+    def _relayer(self, environ, start_response):
+        en_tetes = {
+            cle[5:].replace('_', '-').title(): valeur
+            for cle, valeur in environ.items()
+            if cle.startswith('HTTP_') and cle[5:].replace('_', '-').lower() not in EN_TETES_CONNEXION
+        }
+        for cle in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            if environ.get(cle):
+                en_tetes[cle.replace('_', '-').title()] = environ[cle]
+        longueur = int(environ.get('CONTENT_LENGTH') or 0)
+        corps = environ['wsgi.input'].read(longueur) if longueur else None
+        cible = environ.get('RAW_URI') or environ.get('REQUEST_URI') or environ.get('PATH_INFO', '/')
+
+        connexion = http.client.HTTPConnection('127.0.0.1', self.port_moteurs)
+        try:
+            connexion.request(environ['REQUEST_METHOD'], cible, body=corps, headers=en_tetes)
+            reponse = connexion.getresponse()
+        except OSError:
+            connexion.close()
+            start_response('503 Service Unavailable', [('Content-Type', 'application/json'),
+                                                       ('Retry-After', '5')])
+            return [json.dumps({'error': 'Processus des moteurs indisponible, réessayez plus tard.'}).encode()]
+
+        start_response(f"{reponse.status} {reponse.reason}",
+                       [(cle, valeur) for cle, valeur in reponse.getheaders()
+                        if cle.lower() not in EN_TETES_CONNEXION])
+        return self._corps(connexion, reponse)
+
+    @staticmethod
+    def _corps(connexion, reponse):
+        try:
+            while True:
+                bloc = reponse.read1(65536)
+                if not bloc:
+                    return
+                yield bloc
+        finally:
+            connexion.close()
+
+
+def servir_worker(hote: str, port: int, fd: int, application=app):
+    """Boucle d'un worker : accepte les connexions sur la socket héritée du maître"""
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    serveur = make_server(hote, port, application, threaded=True, fd=fd)
+    metriques.demarrer_publication()
+    try:
+        serveur.serve_forever()
+    finally:
+        metriques.publier()
+        for cle in ('POOL_SOLVEURS', 'POOL_LOTS', 'GRAPPE'):
+            pool = app.config[cle]
+            if pool is not None:
+                pool.fermer()
+        for cle in ('TRAVAUX', 'SESSIONS'):
+            moteur = app.config[cle]
+            if moteur is not None and moteur.pid == os.getpid():
+                moteur.arreter()
+
+
+class Maitre:
+    """
+    Processus maître : forke les workers et le processus des moteurs,
+    les relance s'ils meurent, relaie l'arrêt
+    """
+
+    # Numéro du processus des moteurs dans self.workers
+    MOTEURS = -1
+
+    def __init__(self, hote: str, port: int, workers: int, sock: socket.socket,
+                 sock_moteurs: socket.socket):
+        self.hote = hote
+        self.port = port
+        self.nombre_workers = workers
+        self.sock = sock
+        self.sock_moteurs = sock_moteurs
+        self.port_moteurs = sock_moteurs.getsockname()[1]
+        self.workers: Dict[int, int] = {}  # pid -> numéro du worker
+        self.arret = False
+
+    def _forker(self, numero: int):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                if numero == self.MOTEURS:
+                    self.sock.close()
+                    servir_worker('127.0.0.1', self.port_moteurs, self.sock_moteurs.fileno())
+                else:
+                    self.sock_moteurs.close()
+                    servir_worker(self.hote, self.port, self.sock.fileno(),
+                                  RelaisMoteurs(app, self.port_moteurs))
+            finally:
+                os._exit(0)
+        self.workers[pid] = numero
+
+    def _nom(self, numero: int) -> str:
+        return "Processus des moteurs" if numero == self.MOTEURS else f"Worker {numero}"
+
+    def _arreter(self, *_):
+        self.arret = True
+
+    def executer(self):
+        signal.signal(signal.SIGTERM, self._arreter)
+        signal.signal(signal.SIGINT, self._arreter)
+
+        self._forker(self.MOTEURS)
+        for numero in range(self.nombre_workers):
+            self._forker(numero)
+        print(f"🚀 {self.nombre_workers} workers à l'écoute sur http://{self.hote}:{self.port}")
+
+        while not self.arret:
+            try:
+                pid, statut = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid and pid in self.workers:
+                numero = self.workers.pop(pid)
+                if not self.arret:
+                    print(f"⚠️  {self._nom(numero)} (pid {pid}) arrêté (statut {statut}), relance")
+                    self._forker(numero)
+            else:
+                time.sleep(0.2)
+
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.workers):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.sock.close()
+        self.sock_moteurs.close()
+        print("✅ Serveur arrêté")
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Serveur de production multi-processus")
+    parser.add_argument("--hote", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000, help="Port d'écoute (0 : choisi par le système)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Nombre de processus web (défaut: nombre de cœurs)")
+    parser.add_argument("--solveurs", type=int, default=1,
+                        help="Processus solveurs par worker web (0 = résolutions sur place)")
+    parser.add_argument("--seuil-pool", type=int, default=5000,
+                        help="Nombre de tâches à partir duquel une résolution part dans le pool")
+    parser.add_argument("--instances", type=str, default="instances",
+                        help="Répertoire des instances")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    configurer_application(args.instances, args.solveurs, args.seuil_pool)
+
+    if not hasattr(os, "fork"):
+        # Windows : pas de fork, un seul processus multi-thread
+        serveur = make_server(args.hote, args.port, app, threaded=True)
+        print(f"🚀 Serveur mono-processus sur http://{args.hote}:{serveur.server_port}")
+        serveur.serve_forever()
+        return
+
+    sock = ouvrir_socket(args.hote, args.port)
+    port = sock.getsockname()[1]
+    # Socket locale du processus des moteurs (port choisi par le système)
+    sock_moteurs = ouvrir_socket("127.0.0.1", 0)
+    # /metrics additionne les compteurs publiés par tous les workers
+    dossier_metriques = tempfile.mkdtemp(prefix="metriques-")
+    metriques.partager(dossier_metriques)
+    try:
+        Maitre(args.hote, port, args.workers, sock, sock_moteurs).executer()
+    finally:
+        shutil.rmtree(dossier_metriques, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+"""
+Simulation de cuisine côté serveur, pour de nombreuses sessions simultanées
+Reprend les règles du jeu de static/simulation.js (SimulationCore, SimStation, SimPlat) en mode
+automatique : commandes aléatoires, stations préparation → cuisson → dressage,
+échéances, satisfaction. Le serveur fait foi ; les clients suivent par SSE.
+
+Toutes les sessions avancent ensemble, à chaque tick d'un unique thread : l'état des
+plats est rangé en colonnes (array) indexées par emplacement, partagées par toutes les
+sessions, et un tick est un seul parcours de ces colonnes. Seuls les événements
+(nouveau plat, entrée en station, mise en file, plat servi ou brûlé, fin de partie)
+sont envoyés aux abonnés : la progression d'une étape se déduit de sa durée.
+
+Le moteur vit dans un processus : sous serveur_production.py, c'est le processus des
+moteurs, auquel les workers relaient toutes les requêtes /api/sessions (RelaisMoteurs).
+
+Les sessions ne coûtent que de la mémoire, mais chaque abonné SSE occupe un thread du
+serveur pendant toute la durée de son flux (et un second dans le worker qui le relaie) :
+le nombre d'abonnés simultanés est donc borné (max_abonnes), au-delà abonner() lève
+AbonnementsSatures.
+
+"""
+
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Catalogue des plats (PLATS_CATALOGUE de simulation.js) : préparation, cuisson, dressage, priorité, échéance
+CATALOGUE = {
+    "A": (15, 0, 5, "normale", 40),
+    "B": (10, 17, 3, "normale", 50),
+    "C": (8, 12, 4, "elevee", 40),
+    "D": (20, 25, 10, "vip", 75),
+    "E": (7, 10, 3, "normale", 35),
+    "F": (12, 18, 4, "basse", 55),
+}
+CODES_PLATS = sorted(CATALOGUE)
+DUREES = [CATALOGUE[code][:3] for code in CODES_PLATS]
+ECHEANCES = [CATALOGUE[code][4] for code in CODES_PLATS]
+PENALITES = [{"vip": 15, "elevee": 10}.get(CATALOGUE[code][3], 5) for code in CODES_PLATS]
+
+# Stations (STATIONS_CONFIG de simulation.js), dans l'ordre des étapes
+STATIONS = ("preparation", "cuisson", "dressage")
+CAPACITES = (2, 1, 1)
+VITESSES = (1.0, 1.0, 1.5)
+
+# Intervalle entre deux commandes : 7 s + aléa de 0 à 5 s (temps de jeu)
+INTERVALLE_COMMANDES = (7.0, 5.0)
+
+# États d'un emplacement de plat
+LIBRE, EN_FILE, ACTIF = 0, 1, 2
+
+# États d'une session
+EN_COURS, EN_PAUSE, TERMINEE = 0, 1, 2
+NOMS_ETATS = ("en_cours", "en_pause", "terminee")
+
+# Tick : 10 par seconde ; un tick en retard n'avance pas le jeu de plus de DT_MAX
+FREQUENCE_TICKS = 10
+DT_MAX = 0.5
+
+# Resynchronisation périodique des horloges client (en ticks)
+TICKS_SYNCHRO = FREQUENCE_TICKS
+
+# Événements en attente par abonné avant de le considérer comme décroché
+MAX_EN_ATTENTE = 256
+
+
+class SessionsSaturees(Exception):
+    """Levée quand le moteur héberge déjà son nombre maximal de sessions"""
+
+
+class AbonnementsSatures(Exception):
+    """Levée quand le moteur a déjà son nombre maximal d'abonnés SSE"""
+
+
+class MoteurSessions:
+    """
+    Moteur de toutes les sessions d'un processus
+
+    Colonnes des plats (une entrée par emplacement, réutilisé après service ou brûlure) :
+    session, numéro, plat du catalogue, état, étape, temps restant de l'étape, temps
+    restant avant échéance. Colonnes des sessions : temps de jeu, vitesse, état,
+    prochaine commande, satisfaction, compteurs. Les stations d'une session sont des
+    listes d'emplacements (actifs) et des files.
+    """
+
+    def __init__(self, max_sessions: int = 5000, frequence: int = FREQUENCE_TICKS,
+                 duree_inactivite: float = 600.0, max_abonnes: int = 256):
+        """
+        Args:
+            max_sessions: Nombre maximal de sessions simultanées
+            max_abonnes: Nombre maximal d'abonnés SSE simultanés (un thread serveur chacun)
+            frequence: Ticks par seconde
+            duree_inactivite: Secondes sans requête ni abonné avant suppression d'une session
+        """
+        self.pid = os.getpid()
+        self.max_sessions = max_sessions
+        self.max_abonnes = max_abonnes
+        self.nombre_abonnes = 0
+        self.periode = 1.0 / frequence
+        self.duree_inactivite = duree_inactivite
+        self._verrou = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._arret = threading.Event()
+        self.tick = 0
+        self.duree_dernier_tick = 0.0
+
+        # Plats
+        self.p_session = array("l")
+        self.p_numero = array("l")
+        self.p_plat = array("b")
+        self.p_etat = array("b")
+        self.p_etape = array("b")
+        self.p_restant = array("d")
+        self.p_delai = array("d")
+        self._plats_libres: List[int] = []
+
+        # Sessions
+        self.s_temps = array("d")
+        self.s_vitesse = array("d")
+        self.s_etat = array("b")
+        self.s_prochaine = array("d")
+        self.s_satisfaction = array("d")
+        self.s_servis = array("l")
+        self.s_rates = array("l")
+        self.s_total = array("l")
+        self.s_activite = array("d")
+        self.s_id: List[Optional[str]] = []
+        self.s_rng: List[Optional[random.Random]] = []
+        self.s_actifs: List[List[List[int]]] = []
+        self.s_files: List[List[deque]] = []
+        self.s_abonnes: List[List[queue.Queue]] = []
+        self.s_evenements: List[list] = []
+        self._sessions_libres: List[int] = []
+        self._index: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------ emplacements
+
+    def _nouveau_plat(self, s: int) -> int:
+        if self._plats_libres:
+            i = self._plats_libres.pop()
+        else:
+            i = len(self.p_etat)
+            for colonne in (self.p_session, self.p_numero, self.p_plat, self.p_etat, self.p_etape):
+                colonne.append(0)
+            self.p_restant.append(0.0)
+            self.p_delai.append(0.0)
+        self.s_total[s] += 1
+        plat = self.s_rng[s].randrange(len(CODES_PLATS))
+        self.p_session[i] = s
+        self.p_numero[i] = self.s_total[s]
+        self.p_plat[i] = plat
+        self.p_delai[i] = ECHEANCES[plat]
+        self.s_evenements[s].append(["n", self.s_total[s], CODES_PLATS[plat]])
+        self._entrer_station(i, s, 0)
+        return i
+
+    def _liberer_plat(self, i: int):
+        self.p_etat[i] = LIBRE
+        self._plats_libres.append(i)
+
+    def _nouvelle_session(self) -> int:
+        if self._sessions_libres:
+            return self._sessions_libres.pop()
+        s = len(self.s_etat)
+        for colonne in (self.s_temps, self.s_vitesse, self.s_prochaine, self.s_satisfaction, self.s_activite):
+            colonne.append(0.0)
+        for colonne in (self.s_etat, self.s_servis, self.s_rates, self.s_total):
+            colonne.append(0)
+        self.s_id.append(None)
+        self.s_rng.append(None)
+        self.s_actifs.append([[] for _ in STATIONS])
+        self.s_files.append([deque() for _ in STATIONS])
+        self.s_abonnes.append([])
+        self.s_evenements.append([])
+        return s
+
+    # ------------------------------------------------------------------ règles du jeu
+
+    def _entrer_station(self, i: int, s: int, etape: int):
+        """Place le plat sur la station de l'étape (la cuisson est sautée si sa durée est nulle)"""
+        duree = DUREES[self.p_plat[i]]
+        while etape < len(STATIONS) and duree[etape] == 0:
+            etape += 1
+        self.p_etape[i] = etape
+        self.p_restant[i] = duree[etape]
+        numero = self.p_numero[i]
+        if len(self.s_actifs[s][etape]) < CAPACITES[etape]:
+            self.s_actifs[s][etape].append(i)
+            self.p_etat[i] = ACTIF
+            self.s_evenements[s].append(["a", numero, etape, duree[etape]])
+        else:
+            self.s_files[s][etape].append(i)
+            self.p_etat[i] = EN_FILE
+            self.s_evenements[s].append(["q", numero, etape])
+
+    def _quitter_station(self, i: int, s: int):
+        """Retire le plat de sa station et fait entrer le premier de la file"""
+        etape = self.p_etape[i]
+        if self.p_etat[i] == EN_FILE:
+            self.s_files[s][etape].remove(i)
+            return
+        self.s_actifs[s][etape].remove(i)
+        file = self.s_files[s][etape]
+        if file:
+            suivant = file.popleft()
+            self.s_actifs[s][etape].append(suivant)
+            self.p_etat[suivant] = ACTIF
+            self.s_evenements[s].append(["a", self.p_numero[suivant], etape, self.p_restant[suivant]])
+
+    def _terminer_etape(self, i: int, s: int):
+        self._quitter_station(i, s)
+        etape = self.p_etape[i] + 1
+        duree = DUREES[self.p_plat[i]]
+        while etape < len(STATIONS) and duree[etape] == 0:
+            etape += 1
+        if etape < len(STATIONS):
+            self._entrer_station(i, s, etape)
+            return
+        # Servi : bonus si servi avec plus de 5 s d'avance
+        self.s_servis[s] += 1
+        bonus = 2 if self.p_delai[i] > 5 else 0
+        self.s_satisfaction[s] = min(100.0, self.s_satisfaction[s] + 1 + bonus)
+        self.s_evenements[s].append(["s", self.p_numero[i]])
+        self._liberer_plat(i)
+
+    def _bruler(self, i: int, s: int):
+        self._quitter_station(i, s)
+        self.s_rates[s] += 1
+        self.s_satisfaction[s] = max(0.0, self.s_satisfaction[s] - PENALITES[self.p_plat[i]])
+        self.s_evenements[s].append(["b", self.p_numero[i]])
+        self._liberer_plat(i)
+        if self.s_satisfaction[s] <= 0 and self.s_etat[s] != TERMINEE:
+            self.s_etat[s] = TERMINEE
+            self.s_evenements[s].append(["fin"])
+
+    def avancer(self, dt: float):
+        """
+        Avance toutes les sessions en cours de dt secondes réelles (un tick)
+
+        Ordre d'un tick, comme GameEngine.gameLoop : commandes, puis stations, puis échéances.
+        """
+        with self._verrou:
+            self.tick += 1
+            pas = array("d", bytes(8 * len(self.s_etat)))
+            for s in range(len(self.s_etat)):
+                if self.s_id[s] is None or self.s_etat[s] != EN_COURS:
+                    continue
+                d = dt * self.s_vitesse[s]
+                pas[s] = d
+                self.s_temps[s] += d
+                while self.s_temps[s] >= self.s_prochaine[s]:
+                    self._nouveau_plat(s)
+                    base, alea = INTERVALLE_COMMANDES
+                    self.s_prochaine[s] = self.s_temps[s] + base + self.s_rng[s].random() * alea
+
+            # Un seul parcours des colonnes de plats, toutes sessions confondues
+            termines, echus = [], []
+            p_etat, p_session, p_etape = self.p_etat, self.p_session, self.p_etape
+            p_restant, p_delai = self.p_restant, self.p_delai
+            for i in range(len(p_etat)):
+                etat = p_etat[i]
+                if etat == LIBRE:
+                    continue
+                d = pas[p_session[i]]
+                if d == 0.0:
+                    continue
+                if etat == ACTIF:
+                    restant = p_restant[i] - d * VITESSES[p_etape[i]]
+                    if restant <= 0:
+                        restant = 0.0
+                        termines.append(i)
+                    p_restant[i] = restant
+                delai = p_delai[i] - d
+                p_delai[i] = delai
+                if delai <= 0:
+                    echus.append(i)
+
+            # Étapes terminées, station par station (préparation d'abord, comme processStations)
+            termines.sort(key=p_etape.__getitem__)
+            for i in termines:
+                self._terminer_etape(i, p_session[i])
+            for i in echus:
+                s = p_session[i]
+                if p_etat[i] != LIBRE and p_delai[i] <= 0 and self.s_etat[s] == EN_COURS:
+                    self._bruler(i, s)
+
+            self._diffuser()
+
+    # ------------------------------------------------------------------ diffusion
+
+    def _entete(self, s: int) -> Dict:
+        return {
+            "tick": self.tick,
+            "temps": round(self.s_temps[s], 3),
+            "etat": NOMS_ETATS[self.s_etat[s]],
+            "satisfaction": self.s_satisfaction[s],
+            "servis": self.s_servis[s],
+            "rates": self.s_rates[s]
+        }
+
+    def _diffuser(self):
+        """Envoie à chaque abonné les événements du tick (sérialisés une fois par session)"""
+        maintenant = time.monotonic()
+        synchro = self.tick % TICKS_SYNCHRO == 0
+        for s, evenements in enumerate(self.s_evenements):
+            abonnes = self.s_abonnes[s]
+            if abonnes:
+                self.s_activite[s] = maintenant
+                if evenements or (synchro and self.s_etat[s] == EN_COURS):
+                    delta = self._entete(s)
+                    delta["evenements"] = evenements
+                    message = _message_sse("delta", delta, self.tick)
+                    for abonne in list(abonnes):
+                        try:
+                            abonne.put_nowait(message)
+                        except queue.Full:
+                            # Client trop lent : il recevra un instantané en se reconnectant
+                            abonnes.remove(abonne)
+                            self.nombre_abonnes -= 1
+                            _clore(abonne)
+            if evenements:
+                self.s_evenements[s] = []
+
+    # ------------------------------------------------------------------ API
+
+    def creer(self, seed: int = None, vitesse: float = 1.0) -> Dict:
+        """Crée une session et la démarre (deux commandes initiales, comme GameEngine.start)"""
+        with self._verrou:
+            if len(self._index) >= self.max_sessions:
+                raise SessionsSaturees(f"{self.max_sessions} sessions déjà ouvertes")
+            s = self._nouvelle_session()
+            identifiant = secrets.token_hex(8)
+            self._index[identifiant] = s
+            self.s_id[s] = identifiant
+            self.s_rng[s] = random.Random(seed)
+            self.s_temps[s] = 0.0
+            self.s_vitesse[s] = vitesse
+            self.s_etat[s] = EN_COURS
+            self.s_prochaine[s] = 0.0
+            self.s_satisfaction[s] = 100.0
+            self.s_servis[s] = self.s_rates[s] = self.s_total[s] = 0
+            self.s_activite[s] = time.monotonic()
+            self._nouveau_plat(s)
+            self._nouveau_plat(s)
+            self.s_evenements[s] = []
+            return self._instantane(s)
+
+    def _session(self, identifiant: str) -> Optional[int]:
+        s = self._index.get(identifiant)
+        if s is not None:
+            self.s_activite[s] = time.monotonic()
+        return s
+
+    def _instantane(self, s: int) -> Dict:
+        etat = self._entete(s)
+        etat["id"] = self.s_id[s]
+        etat["vitesse"] = self.s_vitesse[s]
+        etat["plats"] = [
+            {
+                "numero": self.p_numero[i],
+                "plat": CODES_PLATS[self.p_plat[i]],
+                "station": STATIONS[self.p_etape[i]],
+                "actif": self.p_etat[i] == ACTIF,
+                "restant": round(self.p_restant[i], 3),
+                "delai": round(self.p_delai[i], 3)
+            }
+            for etape in range(len(STATIONS))
+            for i in self.s_actifs[s][etape] + list(self.s_files[s][etape])
+        ]
+        return etat
+
+    def instantane(self, identifiant: str) -> Optional[Dict]:
+        """État complet d'une session, ou None si elle n'existe pas"""
+        with self._verrou:
+            s = self._session(identifiant)
+            return self._instantane(s) if s is not None else None
+
+    def modifier(self, identifiant: str, pause: bool = None, vitesse: float = None) -> Optional[Dict]:
+        """Met en pause, reprend ou change la vitesse d'une session"""
+        with self._verrou:
+            s = self._session(identifiant)
+            if s is None:
+                return None
+            if vitesse is not None:
+                self.s_vitesse[s] = vitesse
+            if pause is not None and self.s_etat[s] != TERMINEE:
+                self.s_etat[s] = EN_PAUSE if pause else EN_COURS
+            return self._instantane(s)
+
+    def supprimer(self, identifiant: str) -> bool:
+        with self._verrou:
+            return self._supprimer(identifiant)
+
+    def _supprimer(self, identifiant: str) -> bool:
+        s = self._index.pop(identifiant, None)
+        if s is None:
+            return False
+        for etape in range(len(STATIONS)):
+            for i in self.s_actifs[s][etape] + list(self.s_files[s][etape]):
+                self._liberer_plat(i)
+            self.s_actifs[s][etape] = []
+            self.s_files[s][etape] = deque()
+        for abonne in self.s_abonnes[s]:
+            _clore(abonne)
+        self.nombre_abonnes -= len(self.s_abonnes[s])
+        self.s_abonnes[s] = []
+        self.s_evenements[s] = []
+        self.s_id[s] = self.s_rng[s] = None
+        self._sessions_libres.append(s)
+        return True
+
+    def abonner(self, identifiant: str) -> Optional[tuple]:
+        """
+        Abonne un client aux événements d'une session
+
+        Returns:
+            Tuple (file des messages SSE, instantané initial), ou None si la session
+            n'existe pas. La file reçoit None quand l'abonnement prend fin.
+            Lève AbonnementsSatures si max_abonnes est atteint.
+        """
+        with self._verrou:
+            s = self._session(identifiant)
+            if s is None:
+                return None
+            if self.nombre_abonnes >= self.max_abonnes:
+                raise AbonnementsSatures(f"Nombre maximal d'abonnés atteint ({self.max_abonnes})")
+            abonne = queue.Queue(MAX_EN_ATTENTE)
+            self.s_abonnes[s].append(abonne)
+            self.nombre_abonnes += 1
+            return abonne, _message_sse("etat", self._instantane(s), self.tick)
+
+    def desabonner(self, identifiant: str, abonne: queue.Queue):
+        with self._verrou:
+            s = self._index.get(identifiant)
+            if s is not None and abonne in self.s_abonnes[s]:
+                self.s_abonnes[s].remove(abonne)
+                self.nombre_abonnes -= 1
+
+    def nettoyer(self):
+        """Supprime les sessions sans requête ni abonné depuis duree_inactivite"""
+        limite = time.monotonic() - self.duree_inactivite
+        with self._verrou:
+            for identifiant, s in list(self._index.items()):
+                if not self.s_abonnes[s] and self.s_activite[s] < limite:
+                    self._supprimer(identifiant)
+
+    def statistiques(self) -> Dict:
+        with self._verrou:
+            etats = [self.s_etat[s] for s in self._index.values()]
+            return {
+                "sessions": len(etats),
+                "en_cours": etats.count(EN_COURS),
+                "max_sessions": self.max_sessions,
+                "plats": len(self.p_etat) - len(self._plats_libres),
+                "abonnes": self.nombre_abonnes,
+                "max_abonnes": self.max_abonnes,
+                "tick": self.tick,
+                "duree_dernier_tick_ms": round(self.duree_dernier_tick * 1000, 3)
+            }
+
+    # ------------------------------------------------------------------ boucle
+
+    def demarrer(self):
+        """Lance le thread des ticks (sans effet s'il tourne déjà)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._arret.clear()
+            self._thread = threading.Thread(target=self._boucle, name="sessions-cuisine", daemon=True)
+            self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _boucle(self):
+        precedent = time.monotonic()
+        prochain_nettoyage = precedent + 60
+        while not self._arret.is_set():
+            debut = time.monotonic()
+            self.avancer(min(debut - precedent, DT_MAX))
+            precedent = debut
+            if debut >= prochain_nettoyage:
+                self.nettoyer()
+                prochain_nettoyage = debut + 60
+            self.duree_dernier_tick = time.monotonic() - debut
+            self._arret.wait(max(0.0, self.periode - self.duree_dernier_tick))
+
+
+def _clore(abonne: queue.Queue):
+    """Termine un abonnement : vide sa file et y place la marque de fin (None)"""
+    with abonne.mutex:
+        abonne.queue.clear()
+        abonne.queue.append(None)
+        abonne.not_empty.notify()
+
+
+def _message_sse(evenement: str, donnees: Dict, identifiant: int) -> bytes:
+    return (f"event: {evenement}\nid: {identifiant}\n"
+            f"data: {json.dumps(donnees, separators=(',', ':'))}\n\n").encode("utf-8")
+
+
+def flux_sse(moteur: MoteurSessions, identifiant: str, abonne: queue.Queue, initial: bytes,
+             battement: float = 15.0):
+    """
+    Générateur du corps text/event-stream d'un abonné
+
+    Envoie l'instantané initial, puis les deltas ; un commentaire toutes les battement
+    secondes sans événement garde la connexion ouverte à travers les proxys.
+    """
+    try:
+        yield initial
+        while True:
+            try:
+                message = abonne.get(timeout=battement)
+            except queue.Empty:
+                yield b": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        moteur.desabonner(identifiant, abonne)
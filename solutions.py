@@ -0,0 +1,345 @@
+"""
+Magasin persistant des meilleures solutions connues
+Pour chaque instance (identifiée par le contenu : durées et nombre de commis), le
+meilleur makespan trouvé, l'affectation correspondante, la borne inférieure et
+l'optimalité prouvée. Le magasin ne connaît que les instances qui y ont été amorcées
+(--remplir : instances de référence et de test) ; une amélioration trouvée en
+production pour l'une d'elles y est réécrite, les autres requêtes l'ignorent.
+
+Usage:
+    python solutions.py --remplir          # résout les instances de référence
+    python solutions.py --lister
+    python solutions.py --compacter
+
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from algorithms import SCHEDULERS_COMPACTS
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus
+    fcntl = None
+
+
+FICHIER_DEFAUT = os.path.join("instances", "solutions.jsonl")
+
+
+def ordre_canonique(temps: Sequence[int]) -> List[int]:
+    """
+    Indices des tâches par durée décroissante (tri stable)
+
+    Deux tâches de même durée sont interchangeables : une affectation exprimée dans cet
+    ordre s'applique donc à toute instance ayant les mêmes durées, quels que soient
+    les noms et l'ordre des tâches.
+    """
+    return sorted(range(len(temps)), key=temps.__getitem__, reverse=True)
+
+
+def cle_solution(temps_tries: Sequence[int], nombre_commis: int) -> str:
+    """Empreinte du contenu d'une instance (durées triées et nombre de commis)"""
+    empreinte = hashlib.blake2b(array("q", temps_tries).tobytes(), digest_size=16)
+    empreinte.update(str(nombre_commis).encode())
+    return empreinte.hexdigest()
+
+
+class SolutionConnue:
+    """Entrée du magasin, rattachée à l'ordre canonique de la requête qui l'a consultée"""
+
+    def __init__(self, entree: Dict, ordre: List[int]):
+        self.makespan: int = entree["makespan"]
+        self.borne: int = entree["borne"]
+        self.optimal: bool = entree["optimal"]
+        self.source: str = entree["source"]
+        self._affectation = entree["affectation"]
+        self._ordre = ordre
+
+    def compacte(self, temps: Sequence[int], nombre_commis: int) -> tuple:
+        """
+        L'affectation dans l'ordre des tâches de la requête
+
+        Returns:
+            Tuple (affectation, debuts, charges, makespan), comme SCHEDULERS_COMPACTS
+        """
+        affectation = array("l", bytes(array("l").itemsize * len(temps)))
+        debuts = array("q", bytes(8 * len(temps)))
+        charges = [0] * nombre_commis
+        for position, index in enumerate(self._ordre):
+            worker = self._affectation[position]
+            affectation[index] = worker
+            debuts[index] = charges[worker]
+            charges[worker] += temps[index]
+        return affectation, debuts, charges, self.makespan
+
+    def to_dict(self) -> Dict:
+        return {"makespan": self.makespan, "lower_bound": self.borne,
+                "optimal": self.optimal, "source": self.source}
+
+
+class MagasinSolutions:
+    """
+    Journal JSON Lines partagé entre processus : une ligne {"cle", ...entrée} par amélioration.
+
+    Chaque processus garde en mémoire la meilleure entrée par clé et ne lit que les lignes
+    ajoutées depuis sa dernière lecture (un stat par consultation). Les ajouts se font sous
+    verrou, en relisant d'abord la fin du journal : une amélioration trouvée par un worker
+    n'est jamais masquée par une moins bonne venue d'un autre. compacter() réécrit le
+    journal avec une seule ligne par clé.
+
+    Seules les instances amorcées (proposer(..., creer=True), voir --remplir) sont
+    enregistrées : le trafic ordinaire ne fait grossir ni le journal ni la mémoire. Le couple
+    (nombre de tâches, nombre de commis) des instances connues écarte en O(1), sans tri ni
+    empreinte, toute requête qui ne peut correspondre à aucune d'elles (voir connait).
+    """
+
+    # Au-delà, les solutions ne sont pas conservées (une ligne par tâche en mémoire dans chaque processus)
+    MAX_TACHES = 200_000
+
+    def __init__(self, fichier: str = FICHIER_DEFAUT):
+        self.fichier = fichier
+        self._entrees: Dict[str, Dict] = {}
+        # (nombre de tâches, nombre de commis) des instances connues
+        self._formats = set()
+        self._position = 0
+        self._inode = None
+        self._verrou = threading.Lock()
+
+    def _integrer(self, entree: Dict):
+        cle = entree.pop("cle")
+        actuelle = self._entrees.get(cle)
+        if actuelle is None or entree["makespan"] < actuelle["makespan"]:
+            self._entrees[cle] = entree
+            self._formats.add((entree["nombre_taches"], entree["nombre_commis"]))
+
+    def _lire_nouveautes(self):
+        """Intègre les lignes ajoutées au journal depuis la dernière lecture"""
+        try:
+            stat = os.stat(self.fichier)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._position:
+            # Journal compacté (remplacé) : relecture complète
+            self._entrees, self._position, self._inode = {}, 0, stat.st_ino
+            self._formats = set()
+        if stat.st_size == self._position:
+            return
+
+        with open(self.fichier, "rb") as f:
+            f.seek(self._position)
+            for ligne in f:
+                if not ligne.endswith(b"\n"):
+                    break  # ligne en cours d'écriture : relue la prochaine fois
+                self._position += len(ligne)
+                try:
+                    self._integrer(json.loads(ligne))
+                except (ValueError, KeyError):
+                    print(f"⚠️  Ligne illisible ignorée dans {self.fichier}")
+
+    def _recharger_si_modifie(self):
+        with self._verrou:
+            self._lire_nouveautes()
+
+    def __len__(self) -> int:
+        self._recharger_si_modifie()
+        return len(self._entrees)
+
+    def entrees(self) -> Dict[str, Dict]:
+        self._recharger_si_modifie()
+        return dict(self._entrees)
+
+    def connait(self, nombre_taches: int, nombre_commis: int) -> bool:
+        """Faux si aucune instance connue n'a ce nombre de tâches et de commis (test en O(1))"""
+        self._recharger_si_modifie()
+        return (nombre_taches, nombre_commis) in self._formats
+
+    def consulter(self, temps: Sequence[int], nombre_commis: int,
+                  ordre: List[int] = None) -> Optional[SolutionConnue]:
+        """Meilleure solution connue pour ces durées, ou None"""
+        if not self.connait(len(temps), nombre_commis):
+            return None
+        if ordre is None:
+            ordre = ordre_canonique(temps)
+        entree = self._entrees.get(cle_solution([temps[i] for i in ordre], nombre_commis))
+        return SolutionConnue(entree, ordre) if entree is not None else None
+
+    def proposer(self, temps: Sequence[int], nombre_commis: int, affectation: Sequence[int],
+                 source: str, optimal: bool = False, ordre: List[int] = None,
+                 creer: bool = False) -> Optional[SolutionConnue]:
+        """
+        Propose une solution ; elle est enregistrée si elle bat la meilleure connue
+
+        Le makespan est recalculé à partir de l'affectation (une affectation invalide
+        lève ValueError). Une solution qui atteint la borne inférieure est marquée optimale.
+
+        Args:
+            creer: Amorcer l'instance si elle est inconnue (sinon la proposition est ignorée)
+
+        Returns:
+            La meilleure solution connue après la proposition
+            (None si l'instance est inconnue sans creer, ou dépasse MAX_TACHES)
+        """
+        if len(affectation) != len(temps):
+            raise ValueError("Affectation incomplète")
+        if len(temps) > self.MAX_TACHES:
+            return None
+        if not creer and not self.connait(len(temps), nombre_commis):
+            return None
+
+        if ordre is None:
+            ordre = ordre_canonique(temps)
+        temps_tries = [temps[i] for i in ordre]
+        cle = cle_solution(temps_tries, nombre_commis)
+
+        self._recharger_si_modifie()
+        actuelle = self._entrees.get(cle)
+        if actuelle is None and not creer:
+            return None
+
+        charges = [0] * nombre_commis
+        for index, worker in enumerate(affectation):
+            if not 0 <= worker < nombre_commis:
+                raise ValueError(f"Commis invalide pour la tâche {index}: {worker}")
+            charges[worker] += temps[index]
+        makespan = max(charges, default=0)
+
+        if actuelle is not None and actuelle["makespan"] <= makespan:
+            return SolutionConnue(actuelle, ordre)
+
+        # Même borne que makespan_lower_bound : max(plus longue tâche, ⌈total / m⌉)
+        borne = max(temps_tries[0] if temps_tries else 0, -(-sum(temps_tries) // nombre_commis))
+        entree = {
+            "makespan": makespan,
+            "borne": borne,
+            "optimal": optimal or makespan == borne,
+            "source": source,
+            "affectation": [affectation[i] for i in ordre],
+            "nombre_taches": len(temps),
+            "nombre_commis": nombre_commis,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        return SolutionConnue(self._ajouter(cle, entree), ordre)
+
+    def _ajouter(self, cle: str, entree: Dict) -> Dict:
+        """Ajoute l'entrée au journal sous verrou si elle reste la meilleure ; retourne la meilleure"""
+        os.makedirs(os.path.dirname(self.fichier) or ".", exist_ok=True)
+        ligne = json.dumps(dict(entree, cle=cle), separators=(",", ":")).encode() + b"\n"
+
+        with self._verrou, open(self.fichier, "ab") as journal:
+            if fcntl is not None:
+                fcntl.flock(journal, fcntl.LOCK_EX)
+            self._lire_nouveautes()
+            actuelle = self._entrees.get(cle)
+            if actuelle is not None and actuelle["makespan"] <= entree["makespan"]:
+                return actuelle
+            journal.write(ligne)
+            journal.flush()
+            self._entrees[cle] = entree
+            self._formats.add((entree["nombre_taches"], entree["nombre_commis"]))
+            self._position += len(ligne)
+            self._inode = os.fstat(journal.fileno()).st_ino
+
+        return entree
+
+    def compacter(self) -> int:
+        """
+        Réécrit le journal avec la seule meilleure entrée de chaque clé (remplacement atomique)
+
+        Returns:
+            Le nombre d'entrées conservées
+        """
+        with self._verrou, open(self.fichier, "ab") as journal:
+            if fcntl is not None:
+                fcntl.flock(journal, fcntl.LOCK_EX)
+            self._lire_nouveautes()
+            temporaire = f"{self.fichier}.{os.getpid()}.tmp"
+            with open(temporaire, "wb") as f:
+                for cle, entree in self._entrees.items():
+                    f.write(json.dumps(dict(entree, cle=cle), separators=(",", ":")).encode() + b"\n")
+            os.replace(temporaire, self.fichier)
+            stat = os.stat(self.fichier)
+            self._position, self._inode = stat.st_size, stat.st_ino
+            return len(self._entrees)
+
+
+def resoudre_avec_magasin(magasin: Optional[MagasinSolutions], algorithme: str,
+                          temps: Sequence[int], nombre_commis: int, solveur=None) -> tuple:
+    """
+    Résout en s'appuyant sur le magasin : une solution prouvée optimale est rendue sans
+    résoudre ; sinon l'algorithme tourne, son résultat est proposé au magasin et la
+    meilleure des deux solutions est rendue. Une instance que le magasin ne peut pas
+    connaître (voir MagasinSolutions.connait) est résolue directement.
+
+    Args:
+        solveur: Fonction (algorithme, temps, nombre_commis) -> résultat compact
+                 (défaut: SCHEDULERS_COMPACTS en direct)
+
+    Returns:
+        Tuple ((affectation, debuts, charges, makespan), SolutionConnue ou None, source)
+    """
+    if solveur is None:
+        solveur = lambda algo, t, m: SCHEDULERS_COMPACTS[algo](t, m)
+
+    if magasin is None or not magasin.connait(len(temps), nombre_commis):
+        return solveur(algorithme, temps, nombre_commis), None, algorithme
+
+    ordre = ordre_canonique(temps)
+    connue = magasin.consulter(temps, nombre_commis, ordre)
+    if connue is not None and connue.optimal:
+        return connue.compacte(temps, nombre_commis), connue, "magasin"
+
+    resultat = solveur(algorithme, temps, nombre_commis)
+    connue = magasin.proposer(temps, nombre_commis, resultat[0], algorithme, ordre=ordre)
+    if connue is not None and connue.makespan < resultat[3]:
+        return connue.compacte(temps, nombre_commis), connue, "magasin"
+    return resultat, connue, algorithme
+
+
+def main():
+    """Point d'entrée principal"""
+    from instance_loader import InstanceManager
+
+    parser = argparse.ArgumentParser(description="Magasin des meilleures solutions connues")
+    parser.add_argument("--fichier", type=str, default=FICHIER_DEFAUT)
+    parser.add_argument("--remplir", action="store_true",
+                        help="Résoudre les instances disponibles avec tous les algorithmes")
+    parser.add_argument("--lister", action="store_true", help="Afficher le contenu du magasin")
+    parser.add_argument("--compacter", action="store_true",
+                        help="Réécrire le journal avec une seule ligne par instance (serveur arrêté)")
+    args = parser.parse_args()
+
+    magasin = MagasinSolutions(args.fichier)
+
+    if args.remplir:
+        manager = InstanceManager()
+        for info in manager.lister_instances_disponibles():
+            instance = manager.obtenir_instance_par_nom(info["nom"])
+            tasks, nombre_commis = manager.convertir_instance_pour_algorithme(instance)
+            temps = list(tasks.values())
+            for algorithme, solveur in SCHEDULERS_COMPACTS.items():
+                affectation = solveur(temps, nombre_commis)[0]
+                connue = magasin.proposer(temps, nombre_commis, affectation, algorithme, creer=True)
+            etat = "optimal ✅" if connue.optimal else f"borne {connue.borne}"
+            print(f"   • {info['nom']:35s} makespan {connue.makespan:6d}  ({etat})")
+
+    if args.compacter:
+        print(f"🗜️  Journal compacté : {magasin.compacter()} entrées")
+
+    if args.lister or not (args.remplir or args.compacter):
+        entrees = magasin.entrees()
+        print(f"📦 {len(entrees)} solutions dans {args.fichier}")
+        for cle, entree in sorted(entrees.items(), key=lambda e: e[1]["date"]):
+            etat = "optimal" if entree["optimal"] else f"écart {entree['makespan'] - entree['borne']}"
+            print(f"   • {cle[:12]}  {entree['nombre_taches']:6d} tâches  {entree['nombre_commis']:3d} commis  "
+                  f"makespan {entree['makespan']:6d}  ({etat}, {entree['source']})")
+
+
+if __name__ == "__main__":
+    main()
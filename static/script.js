@@ -1,6 +1,7 @@
 /**
  * Kitchen Load Balancer - Game Engine
  * MVP Implementation
+ * Interface du jeu (rendu, sons, entrees) ; le service est simule par simulation.js
  */
 
 // ================================================
@@ -166,10 +167,11 @@ class ParticleEffects {
         }
     }
 
-    static createSmoke(element) {
+    // rect : position deja lue (evite une lecture de mise en page entre deux ecritures)
+    static createSmoke(element, rect = null) {
         if (!element) return;
 
-        const rect = element.getBoundingClientRect();
+        rect = rect || element.getBoundingClientRect();
         const particle = document.createElement('div');
         particle.className = 'smoke-particle';
         particle.style.left = (rect.left + rect.width / 2 + (Math.random() - 0.5) * 30) + 'px';
@@ -179,10 +181,10 @@ class ParticleEffects {
         setTimeout(() => particle.remove(), 2000);
     }
 
-    static createFlame(element) {
+    static createFlame(element, rect = null) {
         if (!element) return;
 
-        const rect = element.getBoundingClientRect();
+        rect = rect || element.getBoundingClientRect();
 
         for (let i = 0; i < 5; i++) {
             setTimeout(() => {
@@ -345,31 +347,106 @@ styleSheet.textContent = `
 document.head.appendChild(styleSheet);
 
 // ================================================
-// Catalogue des plats (données du GDD)
+// Pool des cartes de plats
 // ================================================
-const PLATS_CATALOGUE = {
-    A: { id: 'A', nom: "Salade Cesar", icon: "\u{1F957}", prep: 15, cuisson: 0, dressage: 5, priorite: "normale", deadline: 40 },
-    B: { id: 'B', nom: "Pizza", icon: "\u{1F355}", prep: 10, cuisson: 17, dressage: 3, priorite: "normale", deadline: 50 },
-    C: { id: 'C', nom: "Steak grille", icon: "\u{1F969}", prep: 8, cuisson: 12, dressage: 4, priorite: "elevee", deadline: 40 },
-    D: { id: 'D', nom: "Plat gastro", icon: "\u{1F37D}\u{FE0F}", prep: 20, cuisson: 25, dressage: 10, priorite: "vip", deadline: 75 },
-    E: { id: 'E', nom: "Burger", icon: "\u{1F354}", prep: 7, cuisson: 10, dressage: 3, priorite: "normale", deadline: 35 },
-    F: { id: 'F', nom: "Soupe", icon: "\u{1F372}", prep: 12, cuisson: 18, dressage: 4, priorite: "basse", deadline: 55 }
-};
-
-// Configuration des stations
-const STATIONS_CONFIG = {
-    preparation: { capacite: 2, vitesse: 1 },
-    cuisson: { capacite: 1, vitesse: 1 },
-    dressage: { capacite: 1, vitesse: 1.5 }
-};
+// Cartes retirees conservees pour etre reutilisees (au-dela, elles sont liberees)
+const TAILLE_MAX_POOL = 200;
+
+// Cartes gardees dans la zone des plats servis
+const MAX_SERVIS_AFFICHES = 30;
+
+const ETAPES_CLASSES = { preparation: 'prep', cuisson: 'cuisson', dressage: 'dressage' };
+
+class PlatViewPool {
+    constructor() {
+        this.libres = [];
+    }
+
+    // Construire une carte et garder les references de ses elements
+    build() {
+        const root = document.createElement('div');
+        root.innerHTML = `
+            <span class="plat-priority"></span>
+            <div class="plat-icon"></div>
+            <div class="plat-name"></div>
+            <div class="plat-etapes">
+                <span class="etape prep"></span>
+                <span class="etape cuisson"></span>
+                <span class="etape dressage"></span>
+            </div>
+            <div class="plat-deadline">
+                <div class="countdown"></div>
+            </div>
+            <div class="plat-progress">
+                <div class="progress-fill"></div>
+            </div>
+        `;
+        return {
+            root,
+            badge: root.querySelector('.plat-priority'),
+            icon: root.querySelector('.plat-icon'),
+            name: root.querySelector('.plat-name'),
+            etapes: {
+                preparation: root.querySelector('.etape.prep'),
+                cuisson: root.querySelector('.etape.cuisson'),
+                dressage: root.querySelector('.etape.dressage')
+            },
+            countdown: root.querySelector('.countdown'),
+            progressFill: root.querySelector('.progress-fill'),
+            // Dernieres valeurs ecrites dans le DOM (null : a reecrire)
+            rendu: {}
+        };
+    }
+
+    // Obtenir une carte remplie pour un plat
+    acquire(plat) {
+        const view = this.libres.pop() || this.build();
+        const root = view.root;
+        root.dataset.id = plat.id;
+        root.dataset.priority = plat.priorite;
+
+        // Badge priorite pour VIP et elevee
+        view.badge.hidden = plat.priorite !== 'vip' && plat.priorite !== 'elevee';
+        view.badge.className = `plat-priority ${plat.priorite}`;
+        view.badge.textContent = plat.priorite === 'vip' ? 'VIP' : '!';
+
+        view.icon.textContent = plat.icon;
+        view.name.textContent = plat.nom;
+        ETAPES_ORDRE.forEach(type => {
+            const etape = plat.etapes[type];
+            view.etapes[type].textContent = `${etape.total}s`;
+            view.etapes[type].hidden = type === 'cuisson' && etape.total === 0;
+        });
+
+        view.rendu = { countdown: null, niveau: null, progression: null, etapes: null };
+        return view;
+    }
+
+    // Rendre une carte au pool
+    release(view) {
+        const root = view.root;
+        if (root.parentNode) {
+            root.parentNode.removeChild(root);
+        }
+        delete root.dataset.id;
+        root.style.opacity = '';
+        if (this.libres.length < TAILLE_MAX_POOL) {
+            this.libres.push(view);
+        }
+    }
+}
+
+// Pool global des cartes
+const platViews = new PlatViewPool();
 
 // ================================================
 // Classe Plat
 // ================================================
+// Vue d'un plat : son etat est recopie des instantanes publies par la simulation
 class Plat {
-    constructor(catalogId, instanceId) {
+    constructor(catalogId, id) {
         const template = PLATS_CATALOGUE[catalogId];
-        this.id = instanceId;
+        this.id = id;
         this.catalogId = catalogId;
         this.nom = template.nom;
         this.icon = template.icon;
@@ -377,118 +454,107 @@ class Plat {
         this.deadline = template.deadline;
         this.timeRemaining = template.deadline;
 
-        // Etapes avec temps restants
+        // Etapes : duree totale et etat
         this.etapes = {
-            preparation: { total: template.prep, remaining: template.prep, done: false },
-            cuisson: { total: template.cuisson, remaining: template.cuisson, done: false },
-            dressage: { total: template.dressage, remaining: template.dressage, done: false }
+            preparation: { total: template.prep, done: false },
+            cuisson: { total: template.cuisson, done: false },
+            dressage: { total: template.dressage, done: false }
         };
 
         // Etat actuel
-        this.etat = 'EN_ATTENTE'; // EN_ATTENTE, EN_PREPARATION, EN_CUISSON, EN_DRESSAGE, SERVI, BRULE
         this.currentEtape = null;
+        this.progression = 0; // Avancement de l'etape en cours (%)
+        this.zone = ZONE_COMMANDES;
+        this.container = null;
+        this.vu = 0; // Sequence du dernier instantane contenant le plat
+        this.view = null;
         this.element = null;
-        this.createdAt = Date.now();
     }
 
-    // Creer l'element HTML de la carte
-    createElement(compact = false, mini = false) {
-        const card = document.createElement('div');
-        card.className = `plat-card${compact ? ' compact' : ''}${mini ? ' mini' : ''}`;
-        card.dataset.id = this.id;
-        card.dataset.priority = this.priorite;
-
-        // Badge priorite pour VIP et elevee
-        let priorityBadge = '';
-        if (this.priorite === 'vip') {
-            priorityBadge = '<span class="plat-priority vip">VIP</span>';
-        } else if (this.priorite === 'elevee') {
-            priorityBadge = '<span class="plat-priority elevee">!</span>';
+    // Placer la carte du plat dans un conteneur (la carte est reprise du pool
+    // si le plat n'en a pas, sinon simplement deplacee)
+    mount(container, compact = false, mini = false) {
+        if (!this.view) {
+            this.view = platViews.acquire(this);
+            this.element = this.view.root;
         }
+        this.element.className = `plat-card${compact ? ' compact' : ''}${mini ? ' mini' : ''}`;
+        this.view.rendu.niveau = null;
+        container.appendChild(this.element);
+        this.container = container;
+        this.updateDisplay();
+        return this.element;
+    }
 
-        // Classes pour les etapes
-        const prepClass = this.etapes.preparation.done ? 'done' : (this.currentEtape === 'preparation' ? 'active' : '');
-        const cuissonClass = this.etapes.cuisson.done ? 'done' : (this.currentEtape === 'cuisson' ? 'active' : '');
-        const dressageClass = this.etapes.dressage.done ? 'done' : (this.currentEtape === 'dressage' ? 'active' : '');
-
-        card.innerHTML = `
-            ${priorityBadge}
-            <div class="plat-icon">${this.icon}</div>
-            <div class="plat-name">${this.nom}</div>
-            <div class="plat-etapes">
-                <span class="etape prep ${prepClass}">${this.etapes.preparation.total}s</span>
-                ${this.etapes.cuisson.total > 0 ? `<span class="etape cuisson ${cuissonClass}">${this.etapes.cuisson.total}s</span>` : ''}
-                <span class="etape dressage ${dressageClass}">${this.etapes.dressage.total}s</span>
-            </div>
-            <div class="plat-deadline">
-                <div class="countdown">${Math.ceil(this.timeRemaining)}</div>
-            </div>
-            <div class="plat-progress">
-                <div class="progress-fill" style="width: 0%"></div>
-            </div>
-        `;
+    // Retirer la carte du DOM et la rendre au pool
+    unmount() {
+        if (!this.view) return;
+        platViews.release(this.view);
+        this.view = null;
+        this.element = null;
+        this.container = null;
+    }
 
-        this.element = card;
-        return card;
+    // Detacher la carte du plat sans la retirer du DOM (animation de sortie)
+    detachView() {
+        const view = this.view;
+        this.view = null;
+        this.element = null;
+        this.container = null;
+        return view;
     }
 
-    // Mettre a jour l'affichage
+    // Mettre a jour l'affichage (seules les valeurs qui changent sont ecrites)
     updateDisplay() {
-        if (!this.element) return;
-
-        // Mettre a jour le countdown
-        const countdown = this.element.querySelector('.countdown');
-        if (countdown) {
-            countdown.textContent = Math.ceil(this.timeRemaining);
-            countdown.className = 'countdown';
-            if (this.timeRemaining <= 5) {
-                countdown.classList.add('critical');
-            } else if (this.timeRemaining <= 10) {
-                countdown.classList.add('warning');
-            }
+        const view = this.view;
+        if (!view) return;
+        const rendu = view.rendu;
+
+        // Countdown
+        const countdown = Math.ceil(this.timeRemaining);
+        if (countdown !== rendu.countdown) {
+            view.countdown.textContent = countdown;
+            rendu.countdown = countdown;
         }
 
-        // Mettre a jour les classes de deadline
-        this.element.classList.remove('deadline-warning', 'deadline-critical');
+        // Classes de deadline
+        let niveau = '';
         if (this.timeRemaining <= 5) {
-            this.element.classList.add('deadline-critical');
+            niveau = 'critical';
         } else if (this.timeRemaining <= 10) {
-            this.element.classList.add('deadline-warning');
+            niveau = 'warning';
+        }
+        if (niveau !== rendu.niveau) {
+            view.countdown.className = niveau ? `countdown ${niveau}` : 'countdown';
+            this.element.classList.toggle('deadline-critical', niveau === 'critical');
+            this.element.classList.toggle('deadline-warning', niveau === 'warning');
+            rendu.niveau = niveau;
         }
 
-        // Mettre a jour la barre de progression si en cours
-        if (this.currentEtape) {
-            const etape = this.etapes[this.currentEtape];
-            const progress = ((etape.total - etape.remaining) / etape.total) * 100;
-            const progressFill = this.element.querySelector('.progress-fill');
-            if (progressFill) {
-                progressFill.style.width = `${progress}%`;
-            }
-
-            // Mettre a jour les classes des etapes
-            this.updateEtapeClasses();
+        // Barre de progression de l'etape en cours (au pourcent pres)
+        const progression = Math.floor(this.progression);
+        if (progression !== rendu.progression) {
+            view.progressFill.style.width = `${progression}%`;
+            rendu.progression = progression;
         }
+
+        this.updateEtapeClasses();
     }
 
     updateEtapeClasses() {
-        if (!this.element) return;
-
-        const etapeElements = this.element.querySelectorAll('.etape');
-        etapeElements.forEach(el => {
-            el.classList.remove('active', 'done');
+        const view = this.view;
+        if (!view) return;
+
+        const cle = `${this.currentEtape}:${this.etapes.preparation.done}:${this.etapes.cuisson.done}:${this.etapes.dressage.done}`;
+        if (cle === view.rendu.etapes) return;
+        view.rendu.etapes = cle;
+
+        ETAPES_ORDRE.forEach(type => {
+            let className = `etape ${ETAPES_CLASSES[type]}`;
+            if (this.etapes[type].done) className += ' done';
+            if (this.currentEtape === type) className += ' active';
+            view.etapes[type].className = className;
         });
-
-        const prepEl = this.element.querySelector('.etape.prep');
-        const cuissonEl = this.element.querySelector('.etape.cuisson');
-        const dressageEl = this.element.querySelector('.etape.dressage');
-
-        if (this.etapes.preparation.done && prepEl) prepEl.classList.add('done');
-        if (this.etapes.cuisson.done && cuissonEl) cuissonEl.classList.add('done');
-        if (this.etapes.dressage.done && dressageEl) dressageEl.classList.add('done');
-
-        if (this.currentEtape === 'preparation' && prepEl) prepEl.classList.add('active');
-        if (this.currentEtape === 'cuisson' && cuissonEl) cuissonEl.classList.add('active');
-        if (this.currentEtape === 'dressage' && dressageEl) dressageEl.classList.add('active');
     }
 
     // Obtenir la prochaine etape
@@ -498,247 +564,149 @@ class Plat {
         if (!this.etapes.dressage.done) return 'dressage';
         return null;
     }
-
-    // Verifier si le plat est termine
-    isComplete() {
-        return this.etapes.preparation.done &&
-               (this.etapes.cuisson.total === 0 || this.etapes.cuisson.done) &&
-               this.etapes.dressage.done;
-    }
 }
 
 // ================================================
 // Classe Station
 // ================================================
+// Affichage d'une station : occupation et charge publiees par la simulation
 class Station {
     constructor(type, activeContainerId, queueContainerId) {
         this.type = type;
         this.config = STATIONS_CONFIG[type];
-        this.active = []; // Plats en cours de traitement
-        this.queue = []; // File d'attente
         this.activeContainer = document.getElementById(activeContainerId);
         this.queueContainer = document.getElementById(queueContainerId);
         this.stationElement = this.activeContainer.closest('.station');
+        this.loadFill = this.stationElement.querySelector('.load-fill');
+        this.capacityEl = this.stationElement.querySelector('.station-capacity');
+
+        this.actifs = 0;
+        this.file = 0;
+        this.load = 0;
+
+        // Affichage a refaire au prochain rendu
+        this.dirty = true;
+        this.rendu = {};
     }
 
     // Obtenir la charge totale (temps restant)
     getTotalLoad() {
-        let load = 0;
-        this.active.forEach(p => {
-            const etape = p.etapes[this.type];
-            if (etape) load += etape.remaining;
-        });
-        this.queue.forEach(p => {
-            const etape = p.etapes[this.type];
-            if (etape) load += etape.remaining;
-        });
-        return load;
+        return this.load;
     }
 
-    // Verifier si la station peut accepter un nouveau plat
-    canAccept() {
-        return this.active.length < this.config.capacite;
-    }
-
-    // Ajouter un plat a la station
-    addPlat(plat) {
-        if (this.canAccept()) {
-            this.active.push(plat);
-            plat.currentEtape = this.type;
-            plat.etat = `EN_${this.type.toUpperCase()}`;
-
-            // Creer l'element et l'ajouter
-            const element = plat.createElement(false, false);
-            this.activeContainer.appendChild(element);
-        } else {
-            // Ajouter a la file d'attente
-            this.queue.push(plat);
-            const element = plat.createElement(true, false);
-            this.queueContainer.appendChild(element);
+    // Recopier l'etat publie par la simulation
+    sync(actifs, file, load) {
+        if (actifs !== this.actifs || file !== this.file) {
+            this.actifs = actifs;
+            this.file = file;
+            this.dirty = true;
         }
-
-        this.updateDisplay();
+        this.load = load;
     }
 
-    // Retirer un plat de la station
-    removePlat(plat) {
-        // Retirer de active
-        const activeIndex = this.active.indexOf(plat);
-        if (activeIndex > -1) {
-            this.active.splice(activeIndex, 1);
-            if (plat.element && plat.element.parentNode) {
-                plat.element.parentNode.removeChild(plat.element);
-            }
-            plat.element = null;
-        }
-
-        // Retirer de la queue
-        const queueIndex = this.queue.indexOf(plat);
-        if (queueIndex > -1) {
-            this.queue.splice(queueIndex, 1);
-            if (plat.element && plat.element.parentNode) {
-                plat.element.parentNode.removeChild(plat.element);
-            }
-            plat.element = null;
-        }
-
-        // Promouvoir de la queue vers active si possible
-        while (this.queue.length > 0 && this.canAccept()) {
-            const nextPlat = this.queue.shift();
-            if (nextPlat.element && nextPlat.element.parentNode) {
-                nextPlat.element.parentNode.removeChild(nextPlat.element);
-            }
-            nextPlat.element = null;
-
-            this.active.push(nextPlat);
-            nextPlat.currentEtape = this.type;
-            nextPlat.etat = `EN_${this.type.toUpperCase()}`;
-
-            const element = nextPlat.createElement(false, false);
-            this.activeContainer.appendChild(element);
-        }
-
-        this.updateDisplay();
+    // Vider la station
+    clear() {
+        this.sync(0, 0, 0);
+        this.activeContainer.innerHTML = '';
+        this.queueContainer.innerHTML = '';
     }
 
     // Mettre a jour l'affichage de la station
     updateDisplay() {
-        const total = this.active.length + this.queue.length;
-        const loadPercent = Math.min(100, (total / (this.config.capacite + 3)) * 100);
+        if (!this.dirty) return;
+        this.dirty = false;
 
-        // Mettre a jour la barre de charge
-        const loadFill = this.stationElement.querySelector('.load-fill');
-        if (loadFill) {
-            loadFill.style.width = `${loadPercent}%`;
-        }
-
-        // Mettre a jour la capacite affichee
-        const capacityEl = this.stationElement.querySelector('.station-capacity');
-        if (capacityEl) {
-            capacityEl.textContent = `${this.active.length}/${this.config.capacite}`;
-        }
+        const total = this.actifs + this.file;
+        const loadPercent = Math.min(100, (total / (this.config.capacite + 3)) * 100);
+        const capacite = `${this.actifs}/${this.config.capacite}`;
 
         // Mettre a jour le statut
         let status = 'idle';
-        if (this.active.length > 0) status = 'normal';
-        if (this.queue.length > 0) status = 'loaded';
-        if (this.queue.length >= 3) status = 'saturated';
-
-        this.stationElement.dataset.status = status;
-    }
-
-    // Traiter les plats (appelé a chaque tick)
-    process(deltaTime, speedMultiplier) {
-        const completedPlats = [];
-
-        this.active.forEach(plat => {
-            const etape = plat.etapes[this.type];
-            if (etape && !etape.done) {
-                etape.remaining -= deltaTime * this.config.vitesse * speedMultiplier;
-                if (etape.remaining <= 0) {
-                    etape.remaining = 0;
-                    etape.done = true;
-                    completedPlats.push(plat);
-                }
-            }
-            plat.updateDisplay();
-        });
+        if (this.actifs > 0) status = 'normal';
+        if (this.file > 0) status = 'loaded';
+        if (this.file >= 3) status = 'saturated';
 
-        return completedPlats;
+        if (this.loadFill && loadPercent !== this.rendu.loadPercent) {
+            this.loadFill.style.width = `${loadPercent}%`;
+        }
+        if (this.capacityEl && capacite !== this.rendu.capacite) {
+            this.capacityEl.textContent = capacite;
+        }
+        if (status !== this.rendu.status) {
+            this.stationElement.dataset.status = status;
+        }
+        this.rendu = { loadPercent, capacite, status };
     }
 }
 
 // ================================================
-// Classe LoadBalancer
+// Classe SimulationClient
 // ================================================
-class LoadBalancer {
-    constructor(stations) {
-        this.stations = stations;
-        this.algorithm = 'least-loaded';
-    }
-
-    setAlgorithm(algo) {
-        this.algorithm = algo;
-    }
-
-    isManualMode() {
-        return this.algorithm === 'manual';
-    }
-
-    // Assigner un plat a une station
-    assignPlat(plat) {
-        // En mode manuel, ne pas auto-assigner
-        if (this.isManualMode()) {
-            return false;
+// Simulation dans un Web Worker (simulation.js) ; sur le thread principal si les
+// workers ne sont pas disponibles (meme protocole de messages)
+class SimulationClient {
+    constructor(onMessage) {
+        this.worker = null;
+        this.runner = null;
+
+        if (window.Worker && SIMULATION_URL) {
+            try {
+                this.worker = new Worker(SIMULATION_URL);
+                this.worker.onmessage = (e) => onMessage(e.data);
+            } catch (e) {
+                console.warn('Web Worker not supported, simulating on the main thread:', e);
+                this.worker = null;
+            }
         }
-
-        const nextEtape = plat.getNextEtape();
-        if (!nextEtape || !this.stations[nextEtape]) return false;
-
-        const station = this.stations[nextEtape];
-
-        // Pour le MVP, on utilise Least Loaded
-        // Les autres algorithmes seront implementes plus tard
-        station.addPlat(plat);
-        return true;
-    }
-
-    // Assigner manuellement un plat a une station specifique
-    manualAssign(plat, stationType) {
-        const nextEtape = plat.getNextEtape();
-
-        // Verifier que c'est la bonne etape
-        if (nextEtape !== stationType) {
-            return { success: false, message: `Ce plat doit d'abord passer par ${nextEtape}` };
+        if (!this.worker) {
+            this.runner = new SimulationRunner((message) => onMessage(message));
         }
+    }
 
-        const station = this.stations[stationType];
-        if (!station) {
-            return { success: false, message: 'Station invalide' };
+    send(message, transfer = []) {
+        if (this.worker) {
+            this.worker.postMessage(message, transfer);
+        } else {
+            this.runner.handle(message);
         }
-
-        station.addPlat(plat);
-        return { success: true };
     }
+}
 
-    // Algorithme Least Loaded (assigner vers la station la moins chargee)
-    // Note: Dans le contexte du jeu, chaque etape a une seule station
-    // donc cet algorithme est surtout utile pour la file d'attente
-    getLeastLoadedStation(type) {
-        return this.stations[type];
-    }
+// Duree simulee par l'apercu du service (secondes de jeu)
+const HORIZON_APERCU = 120;
+
+// 'mm:ss'
+function formatTemps(secondes) {
+    const minutes = Math.floor(secondes / 60);
+    const reste = Math.floor(secondes % 60);
+    return `${minutes.toString().padStart(2, '0')}:${reste.toString().padStart(2, '0')}`;
 }
 
 // ================================================
 // Classe GameEngine
 // ================================================
+// Interface du jeu : entrees, sons et rendu ; le service est simule par SimulationClient
 class GameEngine {
     constructor() {
         this.isRunning = false;
         this.isPaused = false;
         this.gameTime = 0;
-        this.lastTickTime = 0;
-        this.speedMultiplier = 1;
+        this.manualMode = false;
 
-        // Stats
+        // Stats (recopiees des instantanes)
         this.satisfaction = 100;
         this.platsServis = 0;
         this.platsRates = 0;
-        this.totalPlats = 0;
+        this.etat = ETAT_ARRETE;
+        this.partie = 1;
 
         // Collections
-        this.commandes = []; // Plats en attente d'assignation
-        this.waitingPlats = []; // Plats en attente de la prochaine etape (mode manuel)
-        this.allPlats = new Map(); // Tous les plats par ID
-        this.platCounter = 0;
+        this.allPlats = new Map(); // Plats en jeu (ni servis ni brules) par ID
+        this.servis = []; // Plats servis affiches, du plus ancien au plus recent
 
         // Manual mode
         this.selectedPlat = null;
 
-        // Generation de commandes
-        this.nextOrderTime = 0;
-        this.orderInterval = 8; // Nouvelle commande toutes les 8 secondes de base
-
         // Initialiser les stations
         this.stations = {
             preparation: new Station('preparation', 'prep-active', 'prep-queue'),
@@ -746,8 +714,10 @@ class GameEngine {
             dressage: new Station('dressage', 'dressage-active', 'dressage-queue')
         };
 
-        // Initialiser le load balancer
-        this.loadBalancer = new LoadBalancer(this.stations);
+        // Rendu : effets a placer (lectures de position) et dernieres valeurs du HUD
+        this.effets = [];
+        this.hud = {};
+        this.renderPending = false;
 
         // Elements DOM
         this.commandesContainer = document.getElementById('commandes-container');
@@ -759,6 +729,9 @@ class GameEngine {
         this.platsRatesDisplay = document.getElementById('plats-rates');
         this.manualInstructions = document.getElementById('manual-instructions');
 
+        // Simulation du service
+        this.simulation = new SimulationClient((message) => this.onSimulationMessage(message));
+
         // Setup event listeners
         this.setupEventListeners();
     }
@@ -774,6 +747,10 @@ class GameEngine {
             soundManager.play('click');
             this.reset();
         });
+        document.getElementById('btn-apercu')?.addEventListener('click', () => {
+            soundManager.play('click');
+            this.simulation.send({ type: 'preview', horizon: HORIZON_APERCU });
+        });
 
         // Boutons d'algorithme
         document.querySelectorAll('.algo-btn').forEach(btn => {
@@ -784,7 +761,8 @@ class GameEngine {
                 btn.classList.add('active');
                 const algo = btn.dataset.algo;
                 const icon = btn.dataset.icon;
-                this.loadBalancer.setAlgorithm(algo);
+                this.manualMode = algo === 'manual';
+                this.simulation.send({ type: 'algorithm', algorithm: algo });
                 document.getElementById('algo-icon').textContent = icon;
                 document.getElementById('algo-name').textContent = btn.querySelector('.btn-label').textContent;
 
@@ -799,10 +777,15 @@ class GameEngine {
                 soundManager.play('click');
                 document.querySelectorAll('.speed-btn').forEach(b => b.classList.remove('active'));
                 btn.classList.add('active');
-                this.speedMultiplier = parseFloat(btn.dataset.speed);
+                this.simulation.send({ type: 'speed', speed: parseFloat(btn.dataset.speed) });
             });
         });
 
+        // Onglet cache : le service est suspendu
+        document.addEventListener('visibilitychange', () => {
+            this.simulation.send({ type: 'visible', visible: !document.hidden });
+        });
+
         // Message overlay
         document.getElementById('message-close').addEventListener('click', () => {
             document.getElementById('message-overlay').classList.remove('visible');
@@ -811,7 +794,7 @@ class GameEngine {
         // Station click handlers pour mode manuel
         document.querySelectorAll('.station').forEach(stationEl => {
             stationEl.addEventListener('click', (e) => {
-                if (!this.loadBalancer.isManualMode()) return;
+                if (!this.manualMode) return;
                 if (!this.selectedPlat) return;
 
                 const stationType = stationEl.dataset.type;
@@ -823,13 +806,13 @@ class GameEngine {
         document.addEventListener('click', (e) => {
             const platCard = e.target.closest('.plat-card');
             if (!platCard) return;
-            if (!this.loadBalancer.isManualMode()) return;
+            if (!this.manualMode) return;
 
             // Ne pas selectionner les plats servis ou en cours de traitement actif
             if (platCard.closest('.servis-container')) return;
             if (platCard.closest('.station-active')) return;
 
-            this.handlePlatClick(platCard.dataset.id);
+            this.handlePlatClick(Number(platCard.dataset.id));
         });
     }
 
@@ -837,7 +820,7 @@ class GameEngine {
     handlePlatClick(platId) {
         const plat = this.allPlats.get(platId);
         if (!plat) return;
-        if (plat.etat === 'SERVI' || plat.etat === 'BRULE') return;
+        if (plat.zone !== ZONE_COMMANDES && plat.zone !== ZONE_ATTENTE) return;
 
         // Son de clic
         soundManager.play('click');
@@ -869,54 +852,31 @@ class GameEngine {
         if (!this.selectedPlat) return;
 
         const plat = this.selectedPlat;
-        const result = this.loadBalancer.manualAssign(plat, stationType);
-
-        if (result.success) {
-            // Son d'assignation
-            soundManager.play('assign');
-
-            // Retirer des commandes ou waiting
-            this.removeFromWaitingAreas(plat);
+        const nextEtape = plat.getNextEtape();
 
-            // Deselectionner
-            if (plat.element) {
-                plat.element.classList.remove('selected');
-            }
-            this.selectedPlat = null;
-            this.updateManualInstructions();
-            this.updateStationsHighlight();
-        } else {
+        // Verifier que c'est la bonne etape (la simulation le verifie aussi)
+        if (nextEtape !== stationType) {
             soundManager.play('warning');
-            this.showMessage(result.message);
+            this.showMessage(`Ce plat doit d'abord passer par ${nextEtape}`);
+            return;
         }
-    }
 
-    // Retirer un plat des zones d'attente
-    removeFromWaitingAreas(plat) {
-        // Retirer de commandes
-        const cmdIndex = this.commandes.indexOf(plat);
-        if (cmdIndex > -1) {
-            this.commandes.splice(cmdIndex, 1);
-            if (plat.element && plat.element.parentNode === this.commandesContainer) {
-                this.commandesContainer.removeChild(plat.element);
-                plat.element = null;
-            }
-        }
+        // Son d'assignation
+        soundManager.play('assign');
+        this.simulation.send({ type: 'assign', id: plat.id, station: stationType });
 
-        // Retirer de waitingPlats
-        const waitIndex = this.waitingPlats.indexOf(plat);
-        if (waitIndex > -1) {
-            this.waitingPlats.splice(waitIndex, 1);
-            if (plat.element && plat.element.parentNode === this.commandesContainer) {
-                this.commandesContainer.removeChild(plat.element);
-                plat.element = null;
-            }
+        // Deselectionner
+        if (plat.element) {
+            plat.element.classList.remove('selected');
         }
+        this.selectedPlat = null;
+        this.updateManualInstructions();
+        this.updateStationsHighlight();
     }
 
     // Mettre a jour l'UI du mode manuel
     updateManualModeUI() {
-        const isManual = this.loadBalancer.isManualMode();
+        const isManual = this.manualMode;
         const gameContainer = document.querySelector('.game-container');
 
         if (isManual) {
@@ -934,15 +894,6 @@ class GameEngine {
                 p.classList.remove('selectable', 'selected');
             });
             this.selectedPlat = null;
-
-            // En mode auto, assigner automatiquement les plats en attente
-            if (this.isRunning) {
-                [...this.commandes, ...this.waitingPlats].forEach(plat => {
-                    if (plat.etat === 'EN_ATTENTE') {
-                        this.loadBalancer.assignPlat(plat);
-                    }
-                });
-            }
         }
 
         this.updateManualInstructions();
@@ -952,7 +903,7 @@ class GameEngine {
     updateManualInstructions() {
         if (!this.manualInstructions) return;
 
-        if (!this.loadBalancer.isManualMode()) {
+        if (!this.manualMode) {
             this.manualInstructions.classList.remove('has-selection');
             return;
         }
@@ -971,7 +922,7 @@ class GameEngine {
     updateStationsHighlight() {
         document.querySelectorAll('.station').forEach(s => s.classList.remove('highlight'));
 
-        if (this.selectedPlat && this.loadBalancer.isManualMode()) {
+        if (this.selectedPlat && this.manualMode) {
             const nextEtape = this.selectedPlat.getNextEtape();
             if (nextEtape) {
                 const targetStation = document.querySelector(`.station[data-type="${nextEtape}"]`);
@@ -986,9 +937,13 @@ class GameEngine {
     start() {
         if (this.isRunning) return;
 
+        // Apres une defaite, repartir d'un service neuf
+        if (this.etat === ETAT_PERDU) {
+            this.reset();
+        }
+
         this.isRunning = true;
         this.isPaused = false;
-        this.lastTickTime = performance.now();
 
         // Son de demarrage
         soundManager.play('start');
@@ -999,56 +954,43 @@ class GameEngine {
         // Update manual mode UI
         this.updateManualModeUI();
 
-        // Generer quelques commandes initiales
-        this.generateOrder();
-        this.generateOrder();
-
-        this.gameLoop();
+        this.simulation.send({ type: 'start' });
     }
 
     // Pause/Resume
     togglePause() {
         this.isPaused = !this.isPaused;
         document.getElementById('btn-pause').textContent = this.isPaused ? '▶ Reprendre' : '⏸ Pause';
-
-        if (!this.isPaused) {
-            this.lastTickTime = performance.now();
-            this.gameLoop();
-        }
+        this.simulation.send({ type: 'pause', paused: this.isPaused });
     }
 
     // Reset le jeu
     reset() {
+        // Les instantanes de la partie precedente encore en route seront ignores
+        this.partie++;
+        this.simulation.send({ type: 'reset' });
+
         this.isRunning = false;
         this.isPaused = false;
         this.gameTime = 0;
         this.satisfaction = 100;
         this.platsServis = 0;
         this.platsRates = 0;
-        this.totalPlats = 0;
-        this.platCounter = 0;
-        this.commandes = [];
-        this.waitingPlats = [];
-        this.allPlats.clear();
-        this.nextOrderTime = 0;
+        this.etat = ETAT_ARRETE;
         this.selectedPlat = null;
+        this.effets = [];
 
-        // Vider les containers
+        // Rendre toutes les cartes au pool et vider les containers
+        this.allPlats.forEach(plat => plat.unmount());
+        this.servis.forEach(plat => plat.unmount());
+        this.allPlats.clear();
+        this.servis = [];
+        Object.values(this.stations).forEach(station => station.clear());
         this.commandesContainer.innerHTML = '';
         this.servisContainer.innerHTML = '';
 
-        // Reinitialiser les stations
-        Object.values(this.stations).forEach(station => {
-            station.active = [];
-            station.queue = [];
-            station.activeContainer.innerHTML = '';
-            // Garder le label de la queue
-            station.queueContainer.innerHTML = '';
-            station.updateDisplay();
-        });
-
         // Reset l'UI
-        this.updateHUD();
+        this.render();
         this.updateManualModeUI();
         this.updateStationsHighlight();
         document.getElementById('btn-start').disabled = false;
@@ -1056,167 +998,122 @@ class GameEngine {
         document.getElementById('btn-pause').textContent = '⏸ Pause';
     }
 
-    // Boucle principale du jeu
-    gameLoop() {
-        if (!this.isRunning || this.isPaused) return;
-
-        const currentTime = performance.now();
-        const deltaTime = (currentTime - this.lastTickTime) / 1000; // En secondes
-        this.lastTickTime = currentTime;
-
-        this.gameTime += deltaTime * this.speedMultiplier;
-
-        // Generation de commandes
-        if (this.gameTime >= this.nextOrderTime) {
-            this.generateOrder();
-            // Intervalle aleatoire entre 7 et 12 secondes
-            this.nextOrderTime = this.gameTime + 7 + Math.random() * 5;
+    // Messages de la simulation
+    onSimulationMessage(message) {
+        switch (message.type) {
+            case 'etat': {
+                const donnees = new Float64Array(message.buffer);
+                if (donnees[1] === this.partie) {
+                    this.applySnapshot(donnees);
+                }
+                // Rendre le buffer pour le prochain instantane
+                this.simulation.send({ type: 'buffer', buffer: message.buffer }, [message.buffer]);
+                break;
+            }
+            case 'refus':
+                soundManager.play('warning');
+                this.showMessage(message.message);
+                break;
+            case 'preview':
+                this.showPreview(message);
+                break;
         }
-
-        // Assigner les commandes en attente
-        this.processCommandes();
-
-        // Traiter les stations
-        this.processStations(deltaTime * this.speedMultiplier);
-
-        // Mettre a jour les deadlines de tous les plats
-        this.updateAllDeadlines(deltaTime * this.speedMultiplier);
-
-        // Mettre a jour le HUD
-        this.updateHUD();
-
-        // Continuer la boucle
-        requestAnimationFrame(() => this.gameLoop());
     }
 
-    // Generer une nouvelle commande
-    generateOrder() {
-        const platIds = Object.keys(PLATS_CATALOGUE);
-        const randomId = platIds[Math.floor(Math.random() * platIds.length)];
-
-        this.platCounter++;
-        const plat = new Plat(randomId, `plat-${this.platCounter}`);
-        this.totalPlats++;
-
-        this.allPlats.set(plat.id, plat);
-        this.commandes.push(plat);
+    // Recopier un instantane de la simulation (l'affichage est fait par render)
+    applySnapshot(donnees) {
+        const sequence = donnees[0];
+        this.gameTime = donnees[2];
+        this.satisfaction = donnees[3];
+        this.platsServis = donnees[4];
+        this.platsRates = donnees[5];
+        const etat = donnees[6];
+        const nombrePlats = donnees[7];
+        const nombreEvenements = donnees[8];
+        ETAPES_ORDRE.forEach((type, i) => {
+            this.stations[type].sync(donnees[9 + 3 * i], donnees[10 + 3 * i], donnees[11 + 3 * i]);
+        });
 
-        // Creer l'element et l'ajouter
-        const element = plat.createElement(false, false);
-        if (this.loadBalancer.isManualMode()) {
-            element.classList.add('selectable');
+        // Evenements depuis l'instantane precedent
+        let position = ENTETE + nombrePlats * CHAMPS_PLAT;
+        for (let i = 0; i < nombreEvenements; i++, position += CHAMPS_EVENEMENT) {
+            const code = donnees[position];
+            const id = donnees[position + 1];
+            const plat = this.allPlats.get(id) || new Plat(CODES_PLATS[donnees[position + 2]], id);
+            if (code === EVT_SERVI) {
+                this.servePlat(plat);
+            } else if (code === EVT_BRULE) {
+                this.burnPlat(plat);
+            } else if (code === EVT_ALERTE) {
+                // Son d'avertissement quand on passe a 5 secondes
+                soundManager.play('warning');
+            }
         }
-        this.commandesContainer.appendChild(element);
-    }
 
-    // Traiter les commandes en attente
-    processCommandes() {
-        const toRemove = [];
-
-        this.commandes.forEach(plat => {
-            if (this.loadBalancer.assignPlat(plat)) {
-                toRemove.push(plat);
-                // Retirer l'element de la zone commandes
-                if (plat.element && plat.element.parentNode === this.commandesContainer) {
-                    this.commandesContainer.removeChild(plat.element);
-                    plat.element = null;
-                }
+        // Plats en jeu
+        position = ENTETE;
+        for (let i = 0; i < nombrePlats; i++, position += CHAMPS_PLAT) {
+            const id = donnees[position];
+            let plat = this.allPlats.get(id);
+            if (!plat) {
+                plat = new Plat(CODES_PLATS[donnees[position + 1]], id);
+                this.allPlats.set(id, plat);
             }
-        });
-
-        toRemove.forEach(plat => {
-            const index = this.commandes.indexOf(plat);
-            if (index > -1) this.commandes.splice(index, 1);
-        });
-    }
-
-    // Traiter les stations
-    processStations(deltaTime) {
-        // Preparation
-        const prepCompleted = this.stations.preparation.process(deltaTime, 1);
-        prepCompleted.forEach(plat => {
-            this.stations.preparation.removePlat(plat);
-            const nextEtape = plat.getNextEtape();
-            if (nextEtape) {
-                if (this.loadBalancer.isManualMode()) {
-                    // En mode manuel, remettre dans la zone commandes
-                    this.addToWaitingArea(plat);
-                } else {
-                    this.loadBalancer.assignPlat(plat);
-                }
+            plat.vu = sequence;
+            plat.timeRemaining = donnees[position + 4];
+            plat.progression = donnees[position + 5];
+            const masque = donnees[position + 6];
+            ETAPES_ORDRE.forEach((type, j) => { plat.etapes[type].done = (masque & (1 << j)) !== 0; });
+            const etapeEnCours = donnees[position + 7];
+            plat.currentEtape = etapeEnCours >= 0 ? ETAPES_ORDRE[etapeEnCours] : null;
+
+            // Deplacer la carte si le plat a change de zone
+            const zone = donnees[position + 2];
+            let container = this.commandesContainer;
+            if (zone === ZONE_ACTIVE || zone === ZONE_FILE) {
+                const station = this.stations[ETAPES_ORDRE[donnees[position + 3]]];
+                container = zone === ZONE_ACTIVE ? station.activeContainer : station.queueContainer;
             }
-        });
-
-        // Cuisson
-        const cuissonCompleted = this.stations.cuisson.process(deltaTime, 1);
-        cuissonCompleted.forEach(plat => {
-            this.stations.cuisson.removePlat(plat);
-            const nextEtape = plat.getNextEtape();
-            if (nextEtape) {
-                if (this.loadBalancer.isManualMode()) {
-                    // En mode manuel, remettre dans la zone commandes
-                    this.addToWaitingArea(plat);
-                } else {
-                    this.loadBalancer.assignPlat(plat);
+            plat.zone = zone;
+            if (container !== plat.container) {
+                const element = plat.mount(container, zone === ZONE_FILE, false);
+                if (this.manualMode && container === this.commandesContainer) {
+                    element.classList.add('selectable');
+                }
+                if (this.selectedPlat === plat) {
+                    this.selectedPlat = null;
+                    this.updateManualInstructions();
+                    this.updateStationsHighlight();
                 }
             }
-        });
 
-        // Dressage
-        const dressageCompleted = this.stations.dressage.process(deltaTime, 1);
-        dressageCompleted.forEach(plat => {
-            this.stations.dressage.removePlat(plat);
-            if (plat.isComplete()) {
-                this.servePlat(plat);
+            // Effet de fumee pour les plats critiques
+            if (plat.timeRemaining <= 5 && plat.element && Math.random() < 0.1) {
+                this.effets.push(['createSmoke', plat.element]);
             }
-        });
-    }
-
-    // Ajouter un plat a la zone d'attente (mode manuel)
-    addToWaitingArea(plat) {
-        this.waitingPlats.push(plat);
-        plat.etat = 'EN_ATTENTE';
-        plat.currentEtape = null;
-
-        const element = plat.createElement(false, false);
-        element.classList.add('selectable');
-        this.commandesContainer.appendChild(element);
-    }
-
-    // Mettre a jour les deadlines
-    updateAllDeadlines(deltaTime) {
-        this.allPlats.forEach((plat, id) => {
-            if (plat.etat !== 'SERVI' && plat.etat !== 'BRULE') {
-                const previousTime = plat.timeRemaining;
-                plat.timeRemaining -= deltaTime;
-
-                // Son d'avertissement quand on passe a 5 secondes
-                if (previousTime > 5 && plat.timeRemaining <= 5) {
-                    soundManager.play('warning');
-                }
+        }
 
-                // Effet de fumee pour les plats critiques
-                if (plat.timeRemaining <= 5 && plat.element && Math.random() < 0.1) {
-                    ParticleEffects.createSmoke(plat.element);
+        // Plats disparus sans evenement (instantanes non publies)
+        if (this.allPlats.size !== nombrePlats) {
+            this.allPlats.forEach((plat, id) => {
+                if (plat.vu !== sequence) {
+                    plat.unmount();
+                    this.allPlats.delete(id);
                 }
+            });
+        }
 
-                if (plat.timeRemaining <= 0) {
-                    this.burnPlat(plat);
-                } else {
-                    plat.updateDisplay();
-                }
-            }
-        });
+        this.etat = etat;
+        if (etat === ETAT_PERDU && this.isRunning) {
+            this.gameOver();
+        }
+        this.scheduleRender();
     }
 
     // Servir un plat
     servePlat(plat) {
-        plat.etat = 'SERVI';
-        this.platsServis++;
-
-        // Bonus de satisfaction si servi a temps
-        const timeBonus = plat.timeRemaining > 5 ? 2 : 0;
-        this.satisfaction = Math.min(100, this.satisfaction + 1 + timeBonus);
+        this.allPlats.delete(plat.id);
+        if (this.selectedPlat === plat) this.selectedPlat = null;
 
         // Son et effets
         if (plat.priorite === 'vip') {
@@ -1226,19 +1123,25 @@ class GameEngine {
             soundManager.play('ding');
         }
 
-        // Ajouter a la zone servis
-        const element = plat.createElement(false, true);
+        // Ajouter a la zone servis (les plus anciennes cartes retournent au pool)
+        plat.currentEtape = null;
+        plat.progression = 0;
+        ETAPES_ORDRE.forEach(type => { plat.etapes[type].done = plat.etapes[type].total > 0; });
+        const element = plat.mount(this.servisContainer, false, true);
         element.classList.add('served');
-        this.servisContainer.appendChild(element);
+        this.servis.push(plat);
+        while (this.servis.length > MAX_SERVIS_AFFICHES) {
+            this.servis.shift().unmount();
+        }
 
         // Sparkles pour VIP
         if (plat.priorite === 'vip') {
             setTimeout(() => ParticleEffects.createSparkles(element), 100);
         }
 
-        // Nettoyer apres un moment
+        // Nettoyer apres un moment (si la carte n'a pas ete reprise entre-temps)
         setTimeout(() => {
-            if (element.parentNode) {
+            if (plat.element === element) {
                 element.style.opacity = '0.5';
             }
         }, 3000);
@@ -1246,73 +1149,112 @@ class GameEngine {
 
     // Bruler un plat (timeout)
     burnPlat(plat) {
-        plat.etat = 'BRULE';
-        this.platsRates++;
-
-        // Penalite de satisfaction
-        let penalty = 5;
-        if (plat.priorite === 'vip') penalty = 15;
-        if (plat.priorite === 'elevee') penalty = 10;
-        this.satisfaction = Math.max(0, this.satisfaction - penalty);
+        this.allPlats.delete(plat.id);
+        if (this.selectedPlat === plat) this.selectedPlat = null;
 
         // Son de brulure
         soundManager.play('burn');
 
-        // Animation de brulure avec flammes
-        if (plat.element) {
-            ParticleEffects.createFlame(plat.element);
-            ParticleEffects.createSmoke(plat.element);
-            plat.element.classList.add('burning');
-            setTimeout(() => {
-                if (plat.element && plat.element.parentNode) {
-                    plat.element.parentNode.removeChild(plat.element);
-                }
-            }, 500);
-        }
-
-        // Retirer des stations/commandes
-        Object.values(this.stations).forEach(station => {
-            station.removePlat(plat);
-        });
-
-        const cmdIndex = this.commandes.indexOf(plat);
-        if (cmdIndex > -1) {
-            this.commandes.splice(cmdIndex, 1);
+        // Animation de brulure avec flammes : la carte reste affichee le temps de l'animation
+        const view = plat.detachView();
+        if (view) {
+            this.effets.push(['createFlame', view.root], ['createSmoke', view.root]);
+            view.root.classList.add('burning');
+            setTimeout(() => platViews.release(view), 500);
         }
 
         // Message si VIP perdu
         if (plat.priorite === 'vip') {
             this.showMessage("Client VIP perdu ! La satisfaction chute.");
         }
+    }
 
-        // Verifier la defaite
-        if (this.satisfaction <= 0) {
-            this.gameOver();
+    // Afficher l'apercu de la suite du service
+    showPreview(message) {
+        const echantillons = message.echantillons;
+        const dernier = echantillons.length - CHAMPS_ECHANTILLON;
+        if (dernier < 0) return;
+
+        // Station la plus chargee sur l'horizon
+        let pic = 0;
+        let stationPic = null;
+        for (let base = 0; base <= dernier; base += CHAMPS_ECHANTILLON) {
+            ETAPES_ORDRE.forEach((type, j) => {
+                if (echantillons[base + 4 + j] > pic) {
+                    pic = echantillons[base + 4 + j];
+                    stationPic = type;
+                }
+            });
+        }
+
+        let texte = `Dans ${formatTemps(message.horizon)} (mode auto) : ` +
+            `+${echantillons[dernier + 2] - echantillons[2]} servis, ` +
+            `+${echantillons[dernier + 3] - echantillons[3]} rates, ` +
+            `satisfaction ${Math.round(echantillons[dernier + 1])}%.`;
+        if (stationPic) {
+            texte += ` Pic de charge : ${stationPic} (${Math.round(pic)}s).`;
         }
+        if (message.perdu !== null) {
+            texte += ` Service perdu a ${formatTemps(message.perdu)} !`;
+        }
+        this.showMessage(texte);
+    }
+
+    // Demander un rendu (une fois par frame, quel que soit le nombre d'instantanes recus)
+    scheduleRender() {
+        if (this.renderPending) return;
+        this.renderPending = true;
+        requestAnimationFrame(() => this.render());
+    }
+
+    // Rendu d'une frame : toutes les lectures de position d'abord, puis les ecritures,
+    // pour ne provoquer qu'un seul calcul de mise en page
+    render() {
+        this.renderPending = false;
+
+        if (this.effets.length > 0) {
+            const effets = this.effets;
+            this.effets = [];
+            const rects = effets.map(([, element]) => element.isConnected ? element.getBoundingClientRect() : null);
+            effets.forEach(([effet, element], i) => {
+                if (rects[i]) ParticleEffects[effet](element, rects[i]);
+            });
+        }
+
+        this.allPlats.forEach(plat => plat.updateDisplay());
+        Object.values(this.stations).forEach(station => station.updateDisplay());
+        this.updateHUD();
     }
 
-    // Mettre a jour le HUD
+    // Mettre a jour le HUD (seules les valeurs qui changent sont ecrites)
     updateHUD() {
+        const hud = this.hud;
+
         // Timer
-        const minutes = Math.floor(this.gameTime / 60);
-        const seconds = Math.floor(this.gameTime % 60);
-        this.timerDisplay.textContent = `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
-
-        // Satisfaction
-        this.satisfactionFill.style.width = `${this.satisfaction}%`;
-        this.satisfactionValue.textContent = `${Math.round(this.satisfaction)}%`;
-
-        // Classes de satisfaction
-        this.satisfactionFill.classList.remove('warning', 'danger');
-        if (this.satisfaction <= 30) {
-            this.satisfactionFill.classList.add('danger');
-        } else if (this.satisfaction <= 60) {
-            this.satisfactionFill.classList.add('warning');
+        const timer = formatTemps(this.gameTime);
+        if (timer !== hud.timer) {
+            this.timerDisplay.textContent = timer;
+            hud.timer = timer;
+        }
+
+        // Satisfaction et ses classes
+        if (this.satisfaction !== hud.satisfaction) {
+            this.satisfactionFill.style.width = `${this.satisfaction}%`;
+            this.satisfactionValue.textContent = `${Math.round(this.satisfaction)}%`;
+            this.satisfactionFill.classList.toggle('danger', this.satisfaction <= 30);
+            this.satisfactionFill.classList.toggle('warning', this.satisfaction > 30 && this.satisfaction <= 60);
+            hud.satisfaction = this.satisfaction;
         }
 
         // Stats
-        this.platsServisDisplay.textContent = this.platsServis;
-        this.platsRatesDisplay.textContent = this.platsRates;
+        if (this.platsServis !== hud.platsServis) {
+            this.platsServisDisplay.textContent = this.platsServis;
+            hud.platsServis = this.platsServis;
+        }
+        if (this.platsRates !== hud.platsRates) {
+            this.platsRatesDisplay.textContent = this.platsRates;
+            hud.platsRates = this.platsRates;
+        }
     }
 
     // Afficher un message
@@ -0,0 +1,743 @@
+/**
+ * Kitchen Load Balancer - Simulation Core
+ * Etat du service et politiques d'assignation, sans acces au DOM.
+ * Charge dans un Web Worker par script.js (ou sur le thread principal si les
+ * workers ne sont pas disponibles) ; l'etat est publie dans des buffers transferables.
+ */
+
+// ================================================
+// Catalogue des plats (donnees du GDD)
+// ================================================
+const PLATS_CATALOGUE = {
+    A: { id: 'A', nom: "Salade Cesar", icon: "\u{1F957}", prep: 15, cuisson: 0, dressage: 5, priorite: "normale", deadline: 40 },
+    B: { id: 'B', nom: "Pizza", icon: "\u{1F355}", prep: 10, cuisson: 17, dressage: 3, priorite: "normale", deadline: 50 },
+    C: { id: 'C', nom: "Steak grille", icon: "\u{1F969}", prep: 8, cuisson: 12, dressage: 4, priorite: "elevee", deadline: 40 },
+    D: { id: 'D', nom: "Plat gastro", icon: "\u{1F37D}\u{FE0F}", prep: 20, cuisson: 25, dressage: 10, priorite: "vip", deadline: 75 },
+    E: { id: 'E', nom: "Burger", icon: "\u{1F354}", prep: 7, cuisson: 10, dressage: 3, priorite: "normale", deadline: 35 },
+    F: { id: 'F', nom: "Soupe", icon: "\u{1F372}", prep: 12, cuisson: 18, dressage: 4, priorite: "basse", deadline: 55 }
+};
+const CODES_PLATS = Object.keys(PLATS_CATALOGUE);
+
+// Configuration des stations
+const STATIONS_CONFIG = {
+    preparation: { capacite: 2, vitesse: 1 },
+    cuisson: { capacite: 1, vitesse: 1 },
+    dressage: { capacite: 1, vitesse: 1.5 }
+};
+const ETAPES_ORDRE = ['preparation', 'cuisson', 'dressage'];
+
+// URL de ce fichier (empreintee en production), pour lancer le worker depuis la page
+const SIMULATION_URL = typeof document !== 'undefined' && document.currentScript ? document.currentScript.src : null;
+
+// ================================================
+// Format des instantanes (Float64Array)
+// ================================================
+// Etat du service
+const ETAT_ARRETE = 0;
+const ETAT_EN_COURS = 1;
+const ETAT_PAUSE = 2;
+const ETAT_PERDU = 3;
+
+// Zone d'un plat : commandes, attente d'assignation (mode manuel), file ou poste d'une station
+const ZONE_COMMANDES = 0;
+const ZONE_ATTENTE = 1;
+const ZONE_FILE = 2;
+const ZONE_ACTIVE = 3;
+
+// Evenements : [code, id du plat, index du plat dans CODES_PLATS]
+const EVT_SERVI = 1;
+const EVT_BRULE = 2;
+const EVT_ALERTE = 3;
+
+// Entete : sequence, partie, temps, satisfaction, servis, rates, etat, nombre de plats,
+// nombre d'evenements, puis (actifs, file, charge) de chaque station
+const ENTETE = 9 + 3 * ETAPES_ORDRE.length;
+// Plat : id, index catalogue, zone, station, temps restant, progression (%),
+// etapes terminees (bits dans l'ordre de ETAPES_ORDRE), etape en cours
+const CHAMPS_PLAT = 8;
+const CHAMPS_EVENEMENT = 3;
+
+// Instantanes publies et pas encore rendus par l'interface (au-dela, la publication attend)
+const MAX_INSTANTANES_EN_VOL = 3;
+
+// Pas de la boucle de simulation (ms) et pas maximal en temps de jeu (s)
+const PAS_SIMULATION_MS = 1000 / 60;
+const DT_MAX = 0.5;
+
+// Apercu : pas de simulation et intervalle entre deux echantillons (temps de jeu, s)
+const PAS_APERCU = 0.1;
+const INTERVALLE_ECHANTILLONS = 10;
+// Echantillon : temps, satisfaction, servis, rates, charge de chaque station
+const CHAMPS_ECHANTILLON = 4 + ETAPES_ORDRE.length;
+
+// ================================================
+// Generateur pseudo-aleatoire (mulberry32)
+// ================================================
+// Son etat se copie : un apercu rejoue exactement les commandes a venir
+class Aleatoire {
+    constructor(graine) {
+        this.etat = graine >>> 0;
+    }
+
+    next() {
+        let t = (this.etat = (this.etat + 0x6D2B79F5) >>> 0);
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    }
+
+    clone() {
+        return new Aleatoire(this.etat);
+    }
+}
+
+// ================================================
+// Classe SimPlat
+// ================================================
+class SimPlat {
+    constructor(catalogId, id) {
+        const template = PLATS_CATALOGUE[catalogId];
+        this.id = id;
+        this.catalogIndex = CODES_PLATS.indexOf(catalogId);
+        this.priorite = template.priorite;
+        this.timeRemaining = template.deadline;
+
+        // Etapes avec temps restants
+        this.etapes = {
+            preparation: { total: template.prep, remaining: template.prep, done: false },
+            cuisson: { total: template.cuisson, remaining: template.cuisson, done: false },
+            dressage: { total: template.dressage, remaining: template.dressage, done: false }
+        };
+
+        // Etat actuel
+        this.etat = 'EN_ATTENTE'; // EN_ATTENTE, EN_PREPARATION, EN_CUISSON, EN_DRESSAGE, SERVI, BRULE
+        this.currentEtape = null;
+        this.zone = ZONE_COMMANDES;
+        this.station = null;
+    }
+
+    // Obtenir la prochaine etape
+    getNextEtape() {
+        if (!this.etapes.preparation.done) return 'preparation';
+        if (!this.etapes.cuisson.done && this.etapes.cuisson.total > 0) return 'cuisson';
+        if (!this.etapes.dressage.done) return 'dressage';
+        return null;
+    }
+
+    // Verifier si le plat est termine
+    isComplete() {
+        return this.etapes.preparation.done &&
+               (this.etapes.cuisson.total === 0 || this.etapes.cuisson.done) &&
+               this.etapes.dressage.done;
+    }
+
+    clone() {
+        const copie = Object.assign(Object.create(SimPlat.prototype), this);
+        copie.etapes = {
+            preparation: { ...this.etapes.preparation },
+            cuisson: { ...this.etapes.cuisson },
+            dressage: { ...this.etapes.dressage }
+        };
+        return copie;
+    }
+}
+
+// ================================================
+// Classe SimStation
+// ================================================
+class SimStation {
+    constructor(type) {
+        this.type = type;
+        this.config = STATIONS_CONFIG[type];
+        this.active = []; // Plats en cours de traitement
+        this.queue = []; // File d'attente
+
+        // Charge totale tenue a jour (temps restant des plats actifs et en file)
+        this.load = 0;
+    }
+
+    // Obtenir la charge totale (temps restant)
+    getTotalLoad() {
+        return this.load;
+    }
+
+    // Verifier si la station peut accepter un nouveau plat
+    canAccept() {
+        return this.active.length < this.config.capacite;
+    }
+
+    // Ajouter un plat a la station
+    addPlat(plat) {
+        plat.station = this.type;
+        if (this.canAccept()) {
+            this.active.push(plat);
+            plat.currentEtape = this.type;
+            plat.etat = `EN_${this.type.toUpperCase()}`;
+            plat.zone = ZONE_ACTIVE;
+        } else {
+            // Ajouter a la file d'attente
+            this.queue.push(plat);
+            plat.zone = ZONE_FILE;
+        }
+        this.load += plat.etapes[this.type].remaining;
+    }
+
+    // Retirer un plat de la station
+    removePlat(plat) {
+        let index = this.active.indexOf(plat);
+        let liste = this.active;
+        if (index === -1) {
+            index = this.queue.indexOf(plat);
+            liste = this.queue;
+        }
+        if (index === -1) return;
+
+        liste.splice(index, 1);
+        plat.station = null;
+        this.load -= plat.etapes[this.type].remaining;
+
+        // Promouvoir de la queue vers active si possible
+        while (this.queue.length > 0 && this.canAccept()) {
+            const nextPlat = this.queue.shift();
+            this.active.push(nextPlat);
+            nextPlat.currentEtape = this.type;
+            nextPlat.etat = `EN_${this.type.toUpperCase()}`;
+            nextPlat.zone = ZONE_ACTIVE;
+        }
+
+        // Station vide : repartir de zero plutot que d'accumuler les erreurs d'arrondi
+        if (this.active.length === 0 && this.queue.length === 0) {
+            this.load = 0;
+        }
+    }
+
+    // Traiter les plats (appelé a chaque pas)
+    process(deltaTime, speedMultiplier) {
+        const completedPlats = [];
+        const avance = deltaTime * this.config.vitesse * speedMultiplier;
+
+        for (let i = 0; i < this.active.length; i++) {
+            const plat = this.active[i];
+            const etape = plat.etapes[this.type];
+            if (etape && !etape.done) {
+                const consomme = Math.min(avance, etape.remaining);
+                etape.remaining -= consomme;
+                this.load -= consomme;
+                if (etape.remaining <= 0) {
+                    etape.remaining = 0;
+                    etape.done = true;
+                    completedPlats.push(plat);
+                }
+            }
+        }
+
+        return completedPlats;
+    }
+
+    // Copie dont les plats sont pris dans copies (plat d'origine -> copie)
+    clone(copies) {
+        const copie = new SimStation(this.type);
+        copie.active = this.active.map(plat => copies.get(plat));
+        copie.queue = this.queue.map(plat => copies.get(plat));
+        copie.load = this.load;
+        return copie;
+    }
+}
+
+// ================================================
+// Classe LoadBalancer
+// ================================================
+class LoadBalancer {
+    constructor(stations) {
+        this.stations = stations;
+        this.algorithm = 'least-loaded';
+    }
+
+    setAlgorithm(algo) {
+        this.algorithm = algo;
+    }
+
+    isManualMode() {
+        return this.algorithm === 'manual';
+    }
+
+    // Assigner un plat a une station
+    assignPlat(plat) {
+        // En mode manuel, ne pas auto-assigner
+        if (this.isManualMode()) {
+            return false;
+        }
+
+        const nextEtape = plat.getNextEtape();
+        if (!nextEtape || !this.stations[nextEtape]) return false;
+
+        // Pour le MVP, on utilise Least Loaded
+        // Les autres algorithmes seront implementes plus tard
+        this.getLeastLoadedStation(nextEtape).addPlat(plat);
+        return true;
+    }
+
+    // Assigner manuellement un plat a une station specifique
+    manualAssign(plat, stationType) {
+        const nextEtape = plat.getNextEtape();
+
+        // Verifier que c'est la bonne etape
+        if (nextEtape !== stationType) {
+            return { success: false, message: `Ce plat doit d'abord passer par ${nextEtape}` };
+        }
+
+        const station = this.stations[stationType];
+        if (!station) {
+            return { success: false, message: 'Station invalide' };
+        }
+
+        station.addPlat(plat);
+        return { success: true };
+    }
+
+    // Algorithme Least Loaded (assigner vers la station la moins chargee)
+    // Note: Dans le contexte du jeu, chaque etape a une seule station
+    // donc cet algorithme est surtout utile pour la file d'attente
+    getLeastLoadedStation(type) {
+        return this.stations[type];
+    }
+}
+
+// ================================================
+// Classe SimulationCore
+// ================================================
+class SimulationCore {
+    constructor(graine = Math.floor(Math.random() * 4294967296)) {
+        this.reset(graine);
+    }
+
+    reset(graine = Math.floor(Math.random() * 4294967296)) {
+        this.etat = ETAT_ARRETE;
+        this.gameTime = 0;
+        this.speedMultiplier = this.speedMultiplier || 1;
+        this.sequence = this.sequence || 0;
+        // Numero de partie : l'interface ignore les instantanes publies avant un reset
+        this.partie = (this.partie || 0) + 1;
+        this.rng = new Aleatoire(graine);
+
+        // Stats
+        this.satisfaction = 100;
+        this.platsServis = 0;
+        this.platsRates = 0;
+        this.totalPlats = 0;
+
+        // Collections
+        this.commandes = []; // Plats en attente d'assignation
+        this.waitingPlats = []; // Plats en attente de la prochaine etape (mode manuel)
+        this.allPlats = new Map(); // Plats en jeu (ni servis ni brules) par ID
+        this.platCounter = 0;
+
+        // Generation de commandes
+        this.nextOrderTime = 0;
+
+        // Evenements a publier avec le prochain instantane (null : non collectes)
+        this.evenements = [];
+
+        // Initialiser les stations et le load balancer (la politique est conservee)
+        const algorithm = this.loadBalancer ? this.loadBalancer.algorithm : 'least-loaded';
+        this.stations = {};
+        ETAPES_ORDRE.forEach(type => { this.stations[type] = new SimStation(type); });
+        this.loadBalancer = new LoadBalancer(this.stations);
+        this.loadBalancer.setAlgorithm(algorithm);
+    }
+
+    // Demarrer le service
+    start() {
+        if (this.etat !== ETAT_ARRETE) return;
+        this.etat = ETAT_EN_COURS;
+
+        // Generer quelques commandes initiales
+        this.generateOrder();
+        this.generateOrder();
+    }
+
+    setPaused(paused) {
+        if (this.etat === ETAT_EN_COURS && paused) this.etat = ETAT_PAUSE;
+        else if (this.etat === ETAT_PAUSE && !paused) this.etat = ETAT_EN_COURS;
+    }
+
+    setAlgorithm(algorithm) {
+        this.loadBalancer.setAlgorithm(algorithm);
+
+        // En mode auto, les plats en attente d'assignation repassent par les commandes
+        if (!this.loadBalancer.isManualMode() && this.waitingPlats.length > 0) {
+            this.waitingPlats.forEach(plat => { plat.zone = ZONE_COMMANDES; });
+            this.commandes.push(...this.waitingPlats);
+            this.waitingPlats = [];
+        }
+    }
+
+    // Avancer le service de deltaTime secondes (temps reel, multiplie par la vitesse)
+    step(deltaTime) {
+        if (this.etat !== ETAT_EN_COURS) return;
+        const dt = deltaTime * this.speedMultiplier;
+        this.gameTime += dt;
+
+        // Generation de commandes
+        if (this.gameTime >= this.nextOrderTime) {
+            this.generateOrder();
+            // Intervalle aleatoire entre 7 et 12 secondes
+            this.nextOrderTime = this.gameTime + 7 + this.rng.next() * 5;
+        }
+
+        // Assigner les commandes en attente
+        this.processCommandes();
+
+        // Traiter les stations
+        this.processStations(dt);
+
+        // Mettre a jour les deadlines de tous les plats
+        this.updateAllDeadlines(dt);
+    }
+
+    // Generer une nouvelle commande
+    generateOrder() {
+        const randomId = CODES_PLATS[Math.floor(this.rng.next() * CODES_PLATS.length)];
+
+        this.platCounter++;
+        const plat = new SimPlat(randomId, this.platCounter);
+        this.totalPlats++;
+
+        this.allPlats.set(plat.id, plat);
+        this.commandes.push(plat);
+    }
+
+    // Traiter les commandes en attente
+    processCommandes() {
+        if (this.commandes.length === 0) return;
+        this.commandes = this.commandes.filter(plat => !this.loadBalancer.assignPlat(plat));
+    }
+
+    // Traiter les stations, dans l'ordre des etapes
+    processStations(deltaTime) {
+        ETAPES_ORDRE.forEach(type => {
+            const station = this.stations[type];
+            station.process(deltaTime, 1).forEach(plat => {
+                station.removePlat(plat);
+                if (plat.isComplete()) {
+                    this.servePlat(plat);
+                } else if (this.loadBalancer.isManualMode()) {
+                    // En mode manuel, remettre dans la zone commandes
+                    this.addToWaitingArea(plat);
+                } else {
+                    this.loadBalancer.assignPlat(plat);
+                }
+            });
+        });
+    }
+
+    // Ajouter un plat a la zone d'attente (mode manuel)
+    addToWaitingArea(plat) {
+        this.waitingPlats.push(plat);
+        plat.etat = 'EN_ATTENTE';
+        plat.currentEtape = null;
+        plat.zone = ZONE_ATTENTE;
+    }
+
+    // Assigner manuellement un plat en attente
+    assign(platId, stationType) {
+        const plat = this.allPlats.get(platId);
+        if (!plat || (plat.zone !== ZONE_COMMANDES && plat.zone !== ZONE_ATTENTE)) {
+            return { success: false, message: 'Ce plat n\'est plus en attente' };
+        }
+
+        const result = this.loadBalancer.manualAssign(plat, stationType);
+        if (result.success) {
+            this.removeFromWaitingAreas(plat);
+        }
+        return result;
+    }
+
+    // Retirer un plat des zones d'attente
+    removeFromWaitingAreas(plat) {
+        const cmdIndex = this.commandes.indexOf(plat);
+        if (cmdIndex > -1) {
+            this.commandes.splice(cmdIndex, 1);
+        }
+
+        const waitIndex = this.waitingPlats.indexOf(plat);
+        if (waitIndex > -1) {
+            this.waitingPlats.splice(waitIndex, 1);
+        }
+    }
+
+    // Mettre a jour les deadlines
+    updateAllDeadlines(deltaTime) {
+        this.allPlats.forEach(plat => {
+            const previousTime = plat.timeRemaining;
+            plat.timeRemaining -= deltaTime;
+
+            // Avertissement quand on passe a 5 secondes
+            if (previousTime > 5 && plat.timeRemaining <= 5) {
+                this.emit(EVT_ALERTE, plat);
+            }
+
+            if (plat.timeRemaining <= 0) {
+                this.burnPlat(plat);
+            }
+        });
+    }
+
+    // Servir un plat
+    servePlat(plat) {
+        plat.etat = 'SERVI';
+        this.platsServis++;
+        this.allPlats.delete(plat.id);
+
+        // Bonus de satisfaction si servi a temps
+        const timeBonus = plat.timeRemaining > 5 ? 2 : 0;
+        this.satisfaction = Math.min(100, this.satisfaction + 1 + timeBonus);
+        this.emit(EVT_SERVI, plat);
+    }
+
+    // Bruler un plat (timeout)
+    burnPlat(plat) {
+        plat.etat = 'BRULE';
+        this.platsRates++;
+        this.allPlats.delete(plat.id);
+
+        // Penalite de satisfaction
+        let penalty = 5;
+        if (plat.priorite === 'vip') penalty = 15;
+        if (plat.priorite === 'elevee') penalty = 10;
+        this.satisfaction = Math.max(0, this.satisfaction - penalty);
+        this.emit(EVT_BRULE, plat);
+
+        // Retirer des stations/commandes
+        if (plat.station) {
+            this.stations[plat.station].removePlat(plat);
+        }
+        this.removeFromWaitingAreas(plat);
+
+        // Verifier la defaite
+        if (this.satisfaction <= 0) {
+            this.etat = ETAT_PERDU;
+        }
+    }
+
+    emit(code, plat) {
+        if (this.evenements) {
+            this.evenements.push(code, plat.id, plat.catalogIndex);
+        }
+    }
+
+    // Ecrire l'etat dans un instantane (buffer reutilise s'il est assez grand)
+    // et vider la liste des evenements
+    writeSnapshot(buffer = null) {
+        const taille = ENTETE + this.allPlats.size * CHAMPS_PLAT + this.evenements.length;
+        if (!buffer || buffer.byteLength < taille * 8) {
+            buffer = new ArrayBuffer(Math.ceil(taille * 1.5) * 8);
+        }
+        const donnees = new Float64Array(buffer);
+
+        donnees[0] = ++this.sequence;
+        donnees[1] = this.partie;
+        donnees[2] = this.gameTime;
+        donnees[3] = this.satisfaction;
+        donnees[4] = this.platsServis;
+        donnees[5] = this.platsRates;
+        donnees[6] = this.etat;
+        donnees[7] = this.allPlats.size;
+        donnees[8] = this.evenements.length / CHAMPS_EVENEMENT;
+        ETAPES_ORDRE.forEach((type, i) => {
+            const station = this.stations[type];
+            donnees[9 + 3 * i] = station.active.length;
+            donnees[10 + 3 * i] = station.queue.length;
+            donnees[11 + 3 * i] = station.load;
+        });
+
+        let position = ENTETE;
+        this.allPlats.forEach(plat => {
+            let masque = 0;
+            ETAPES_ORDRE.forEach((type, i) => { if (plat.etapes[type].done) masque |= 1 << i; });
+            let progression = 0;
+            if (plat.currentEtape) {
+                const etape = plat.etapes[plat.currentEtape];
+                progression = ((etape.total - etape.remaining) / etape.total) * 100;
+            }
+            donnees[position] = plat.id;
+            donnees[position + 1] = plat.catalogIndex;
+            donnees[position + 2] = plat.zone;
+            donnees[position + 3] = plat.station ? ETAPES_ORDRE.indexOf(plat.station) : -1;
+            donnees[position + 4] = plat.timeRemaining;
+            donnees[position + 5] = progression;
+            donnees[position + 6] = masque;
+            donnees[position + 7] = plat.currentEtape ? ETAPES_ORDRE.indexOf(plat.currentEtape) : -1;
+            position += CHAMPS_PLAT;
+        });
+
+        donnees.set(this.evenements, position);
+        this.evenements.length = 0;
+        return buffer;
+    }
+
+    // Copie independante de l'etat (memes plats, memes commandes a venir)
+    clone() {
+        const copie = Object.create(SimulationCore.prototype);
+        Object.assign(copie, this);
+        copie.rng = this.rng.clone();
+
+        const copies = new Map();
+        const copier = plat => {
+            const c = plat.clone();
+            copies.set(plat, c);
+            return c;
+        };
+        copie.allPlats = new Map();
+        this.allPlats.forEach((plat, id) => copie.allPlats.set(id, copier(plat)));
+        copie.commandes = this.commandes.map(plat => copies.get(plat));
+        copie.waitingPlats = this.waitingPlats.map(plat => copies.get(plat));
+
+        copie.stations = {};
+        ETAPES_ORDRE.forEach(type => { copie.stations[type] = this.stations[type].clone(copies); });
+        copie.loadBalancer = new LoadBalancer(copie.stations);
+        copie.loadBalancer.setAlgorithm(this.loadBalancer.algorithm);
+        copie.evenements = null;
+        return copie;
+    }
+
+    /**
+     * Simule la suite du service plus vite que le temps reel, sur une copie de l'etat
+     *
+     * Les plats en attente sont assignes par la politique automatique (least-loaded) :
+     * l'apercu montre ce que donnerait le reste du service sans intervention.
+     *
+     * @param {number} horizon - Duree a simuler (secondes de jeu)
+     * @returns {{echantillons: Float64Array, perdu: (number|null)}} Echantillons toutes
+     *          les INTERVALLE_ECHANTILLONS secondes (CHAMPS_ECHANTILLON valeurs chacun) et
+     *          instant de la defaite eventuelle
+     */
+    preview(horizon) {
+        const copie = this.clone();
+        copie.speedMultiplier = 1;
+        copie.setAlgorithm('least-loaded');
+        if (copie.etat === ETAT_ARRETE) copie.start();
+        if (copie.etat === ETAT_PAUSE) copie.etat = ETAT_EN_COURS;
+
+        const nombre = Math.floor(horizon / INTERVALLE_ECHANTILLONS) + 1;
+        const echantillons = new Float64Array(nombre * CHAMPS_ECHANTILLON);
+        const fin = copie.gameTime + horizon;
+        let prochain = copie.gameTime;
+        let i = 0;
+        while (i < nombre) {
+            if (copie.gameTime >= prochain - 1e-9 || copie.etat !== ETAT_EN_COURS) {
+                const base = i * CHAMPS_ECHANTILLON;
+                echantillons[base] = copie.gameTime;
+                echantillons[base + 1] = copie.satisfaction;
+                echantillons[base + 2] = copie.platsServis;
+                echantillons[base + 3] = copie.platsRates;
+                ETAPES_ORDRE.forEach((type, j) => { echantillons[base + 4 + j] = copie.stations[type].load; });
+                i++;
+                prochain += INTERVALLE_ECHANTILLONS;
+                if (copie.etat !== ETAT_EN_COURS) break;
+            }
+            if (copie.gameTime < fin) copie.step(PAS_APERCU);
+        }
+
+        return {
+            echantillons: echantillons.subarray(0, i * CHAMPS_ECHANTILLON),
+            perdu: copie.etat === ETAT_PERDU ? copie.gameTime : null
+        };
+    }
+}
+
+// ================================================
+// Classe SimulationRunner
+// ================================================
+// Horloge du service et protocole de messages (identiques dans le worker et en local)
+class SimulationRunner {
+    constructor(post) {
+        this.post = post;
+        this.core = new SimulationCore();
+        this.buffers = []; // Buffers rendus par l'interface, reutilises
+        this.enVol = 0;
+        this.minuteur = null;
+        this.visible = true;
+        this.dernierPas = 0;
+    }
+
+    handle(message) {
+        const core = this.core;
+        switch (message.type) {
+            case 'start':
+                core.start();
+                break;
+            case 'pause':
+                core.setPaused(message.paused);
+                break;
+            case 'reset':
+                core.reset();
+                break;
+            case 'speed':
+                core.speedMultiplier = message.speed;
+                break;
+            case 'algorithm':
+                core.setAlgorithm(message.algorithm);
+                break;
+            case 'visible':
+                // Onglet cache : le service est suspendu, comme l'etait la boucle requestAnimationFrame
+                this.visible = message.visible;
+                break;
+            case 'assign': {
+                const result = core.assign(message.id, message.station);
+                if (!result.success) {
+                    this.post({ type: 'refus', id: message.id, message: result.message });
+                }
+                break;
+            }
+            case 'buffer':
+                this.buffers.push(message.buffer);
+                this.enVol = Math.max(0, this.enVol - 1);
+                return;
+            case 'preview': {
+                const { echantillons, perdu } = core.preview(message.horizon);
+                this.post({ type: 'preview', horizon: message.horizon, echantillons, perdu }, [echantillons.buffer]);
+                return;
+            }
+            default:
+                return;
+        }
+        this.publish();
+        this.schedule();
+    }
+
+    // (Re)lancer ou arreter l'horloge selon l'etat du service
+    schedule() {
+        const actif = this.core.etat === ETAT_EN_COURS && this.visible;
+        if (actif && this.minuteur === null) {
+            this.dernierPas = performance.now();
+            this.minuteur = setTimeout(() => this.tick(), PAS_SIMULATION_MS);
+        } else if (!actif && this.minuteur !== null) {
+            clearTimeout(this.minuteur);
+            this.minuteur = null;
+        }
+    }
+
+    tick() {
+        this.minuteur = null;
+        const maintenant = performance.now();
+        this.core.step(Math.min(DT_MAX, (maintenant - this.dernierPas) / 1000));
+        this.dernierPas = maintenant;
+        this.publish();
+        this.schedule();
+    }
+
+    // Publier un instantane (les evenements s'accumulent si l'interface est en retard)
+    publish() {
+        if (this.enVol >= MAX_INSTANTANES_EN_VOL) return;
+        const buffer = this.core.writeSnapshot(this.buffers.pop());
+        this.enVol++;
+        this.post({ type: 'etat', buffer }, [buffer]);
+    }
+}
+
+// Point d'entree du worker
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    const runner = new SimulationRunner((message, transfer) => self.postMessage(message, transfer || []));
+    self.onmessage = (event) => runner.handle(event.data);
+}
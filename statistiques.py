@@ -0,0 +1,187 @@
+"""
+Noyau de statistiques partagé sur les instances
+Un seul accumulateur, alimenté par blocs de plats (fonctions natives) ou plat par plat
+en flux ; calculer_statistiques et resume_statistiques n'en sont que des raccourcis.
+
+Pas de cache indexé par contenu : calculer la clé (parcourir et hacher toutes les durées)
+coûte autant qu'un passage de l'accumulateur. Les statistiques sont mémorisées par leurs
+utilisateurs, sur l'objet qui les possède (Instance.calculer_statistiques, validateur).
+
+"""
+
+import math
+from collections import Counter
+from operator import add, mul
+from typing import Dict, Iterable, List
+
+
+# Percentiles calculés sur le temps total par plat
+PERCENTILES = (50, 90, 99)
+
+
+class AccumulateurStatistiques:
+    """
+    Accumule les statistiques d'une instance en un seul passage, bloc par bloc ou plat par plat
+
+    Tout est tenu en entiers : totaux, extrêmes et somme des carrés (la variance est exacte).
+    Les percentiles sont exacts : ils s'appuient sur un histogramme des temps totaux, dont la
+    taille ne dépend que du nombre de durées distinctes (et non du nombre de plats), ce qui
+    permet aussi de l'utiliser en flux sur des instances massives. Sans distribution, seuls
+    les totaux et les extrêmes sont tenus (c'est tout ce que demande le résumé).
+    """
+
+    def __init__(self, distribution: bool = True):
+        """
+        Args:
+            distribution: Tenir aussi la variance et les percentiles
+        """
+        self.distribution = distribution
+        self.nombre_plats = 0
+        self.temps_total_epluchage = 0
+        self.temps_total_cuisson = 0
+        self.temps_max_plat = None
+        self.temps_min_plat = None
+        self._somme_carres = 0
+        self._histogramme = Counter()
+
+    def ajouter(self, temps_epluchage, temps_cuisson):
+        """Ajoute un plat"""
+        temps = temps_epluchage + temps_cuisson
+
+        self.nombre_plats += 1
+        self.temps_total_epluchage += temps_epluchage
+        self.temps_total_cuisson += temps_cuisson
+
+        if self.temps_max_plat is None or temps > self.temps_max_plat:
+            self.temps_max_plat = temps
+        if self.temps_min_plat is None or temps < self.temps_min_plat:
+            self.temps_min_plat = temps
+
+        if self.distribution:
+            self._somme_carres += temps * temps
+            self._histogramme[temps] += 1
+
+    def ajouter_plats(self, plats: Iterable[Dict]):
+        """
+        Ajoute un bloc de plats ({"temps_epluchage", "temps_cuisson"})
+
+        Les durées sont extraites une fois ; totaux, extrêmes, carrés et histogramme sont
+        ensuite calculés par les fonctions natives, sans boucle Python par plat.
+        """
+        plats = plats if isinstance(plats, list) else list(plats)
+        if not plats:
+            return
+        epluchage = [plat.get("temps_epluchage", 0) for plat in plats]
+        cuisson = [plat.get("temps_cuisson", 0) for plat in plats]
+        temps = list(map(add, epluchage, cuisson))
+
+        self.nombre_plats += len(temps)
+        self.temps_total_epluchage += sum(epluchage)
+        self.temps_total_cuisson += sum(cuisson)
+
+        maximum, minimum = max(temps), min(temps)
+        if self.temps_max_plat is None or maximum > self.temps_max_plat:
+            self.temps_max_plat = maximum
+        if self.temps_min_plat is None or minimum < self.temps_min_plat:
+            self.temps_min_plat = minimum
+
+        if self.distribution:
+            self._somme_carres += sum(map(mul, temps, temps))
+            self._histogramme.update(temps)
+
+    def _variance(self) -> float:
+        """Variance exacte sur des durées entières : (n Σt² - (Σt)²) / n²"""
+        n = self.nombre_plats
+        if not n:
+            return 0.0
+        total = self.temps_total_epluchage + self.temps_total_cuisson
+        return max((n * self._somme_carres - total * total) / (n * n), 0.0)
+
+    def _percentiles(self) -> Dict[str, float]:
+        """Percentiles par la méthode du rang le plus proche, à partir de l'histogramme"""
+        if not self.nombre_plats:
+            return {f"p{p}": 0 for p in PERCENTILES}
+
+        rangs = [(p, max(1, math.ceil(p / 100 * self.nombre_plats))) for p in PERCENTILES]
+        resultats = {}
+        cumul = 0
+        for temps in sorted(self._histogramme):
+            cumul += self._histogramme[temps]
+            while rangs and cumul >= rangs[0][1]:
+                resultats[f"p{rangs.pop(0)[0]}"] = temps
+            if not rangs:
+                break
+        return resultats
+
+    def resultat(self, nombre_commis: int) -> Dict:
+        """
+        Statistiques complètes de l'instance
+
+        Sans distribution, variance, écart type et percentiles valent None.
+
+        Args:
+            nombre_commis: Nombre de commis (pour la charge théorique)
+        """
+        nombre_plats = self.nombre_plats
+        temps_total = self.temps_total_epluchage + self.temps_total_cuisson
+        variance = self._variance() if self.distribution else None
+        return {
+            "nombre_plats": nombre_plats,
+            "nombre_commis": nombre_commis,
+            "temps_total_travail": temps_total,
+            "temps_total_epluchage": self.temps_total_epluchage,
+            "temps_total_cuisson": self.temps_total_cuisson,
+            "temps_moyen_par_plat": temps_total / nombre_plats if nombre_plats else 0,
+            "temps_max_plat": self.temps_max_plat or 0,
+            "temps_min_plat": self.temps_min_plat or 0,
+            "variance_par_plat": variance,
+            "ecart_type_par_plat": math.sqrt(variance) if variance is not None else None,
+            "percentiles_plat": self._percentiles() if self.distribution else None,
+            "charge_theorique_par_commis": temps_total / nombre_commis if nombre_commis > 0 else 0,
+            "ratio_plats_commis": nombre_plats / nombre_commis if nombre_commis > 0 else 0
+        }
+
+
+def calculer_statistiques(plats: List[Dict], nombre_commis: int) -> Dict:
+    """
+    Calcule les statistiques complètes d'une instance (un passage de l'accumulateur)
+
+    Args:
+        plats: Liste des plats ({"nom", "temps_epluchage", "temps_cuisson"})
+        nombre_commis: Nombre de commis
+
+    Returns:
+        Dictionnaire de statistiques (voir AccumulateurStatistiques.resultat)
+    """
+    accumulateur = AccumulateurStatistiques()
+    accumulateur.ajouter_plats(plats)
+    return accumulateur.resultat(nombre_commis)
+
+
+def resume_statistiques(plats: List[Dict], nombre_commis: int) -> Dict:
+    """
+    Résumé enregistré dans les fichiers d'instances (champ "statistiques")
+
+    Même accumulateur, sans distribution : le résumé ne demande que les totaux et les extrêmes.
+    """
+    accumulateur = AccumulateurStatistiques(distribution=False)
+    accumulateur.ajouter_plats(plats)
+    return formater_resume(accumulateur.resultat(nombre_commis), nombre_commis)
+
+
+def formater_resume(stats: Dict, nombre_commis: int) -> Dict:
+    """
+    Résumé historique à partir de statistiques (AccumulateurStatistiques.resultat)
+
+    Mêmes clés et mêmes arrondis (divisions entières) que le format historique.
+    """
+    temps_total = stats["temps_total_travail"]
+    nombre_plats = stats["nombre_plats"]
+    return {
+        "nombre_plats": nombre_plats,
+        "temps_total_travail": temps_total,
+        "temps_moyen_par_plat": temps_total // nombre_plats if nombre_plats else 0,
+        "temps_max_plat": stats["temps_max_plat"],
+        "temps_min_plat": stats["temps_min_plat"],
+        "charge_theorique_par_commis": temps_total // nombre_commis if nombre_commis > 0 else 0
+    }
@@ -0,0 +1,235 @@
+"""
+Diagramme de Gantt indexé dans le temps
+Calcule les dates de début/fin de chaque tâche et répond aux requêtes par intervalle
+
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+
+class Timeline:
+    """
+    Chronologie d'un ordonnancement stockée en colonnes.
+
+    Colonnes globales (une entrée par tâche, regroupées par travailleur puis par date de début) :
+    noms, travailleur, début, fin. Deux index s'y ajoutent :
+
+    - global : un arbre d'intervalles centré (en tableaux plats) répond à « qui est occupé à
+      l'instant t » en O(log n + k) pour k tâches en cours, et les débuts/fins triés avec leurs
+      sommes cumulées donnent la charge totale sur [a, b] en O(log n) ;
+    - par travailleur : la somme cumulée des durées donne la charge de chaque travailleur
+      sur [a, b] en O(log n) par travailleur.
+
+    Les fenêtres d'inactivité sont triées par longueur pour la requête « fenêtres plus longues
+    que d ».
+    """
+
+    def __init__(self, workers: List[Dict], horizon: int = None):
+        """
+        Construit la chronologie à partir de la sortie de greedy_scheduler
+
+        Args:
+            workers: Liste [{'time', 'tasks': [(nom, temps), ...]}, ...]
+            horizon: Fin de la fenêtre d'observation (par défaut le makespan)
+        """
+        self.num_workers = len(workers)
+        self.names: List[str] = []
+        self.worker = array('l')
+        self.start = array('q')
+        self.end = array('q')
+
+        # Index par travailleur : positions [offset, offset + taille) dans les colonnes globales
+        self._offsets = array('l', [0])
+        self._prefix_busy: List[array] = []
+
+        for worker_index, worker in enumerate(workers):
+            clock = 0
+            prefix = array('q', [0])
+            for task_name, task_time in worker['tasks']:
+                self.names.append(task_name)
+                self.worker.append(worker_index)
+                self.start.append(clock)
+                clock += task_time
+                self.end.append(clock)
+                prefix.append(prefix[-1] + task_time)
+            self._offsets.append(len(self.names))
+            self._prefix_busy.append(prefix)
+
+        self.makespan = max(self.end) if self.end else 0
+        self.horizon = self.makespan if horizon is None else horizon
+
+        # Fenêtres d'inactivité (longueur, travailleur, début), triées par longueur
+        self._idle: List[Tuple[int, int, int]] = []
+        for worker_index in range(self.num_workers):
+            clock = 0
+            for i in range(self._offsets[worker_index], self._offsets[worker_index + 1]):
+                if self.start[i] > clock:
+                    self._idle.append((self.start[i] - clock, worker_index, clock))
+                clock = max(clock, self.end[i])
+            if self.horizon > clock:
+                self._idle.append((self.horizon - clock, worker_index, clock))
+        self._idle.sort()
+
+        # Index globaux, construits à la première requête qui en a besoin
+        self._load_index = None
+        self._root = None
+
+    def _build_load_index(self):
+        """Débuts et fins triés, avec leurs sommes cumulées"""
+        starts = array('q', sorted(self.start))
+        ends = array('q', sorted(self.end))
+        self._load_index = (starts, self._cumul(starts), ends, self._cumul(ends))
+
+    def _build_tree(self):
+        """Arbre d'intervalles centré, en coordonnées doublées (centre = début + fin d'un intervalle)"""
+        self._node_center = array('q')
+        self._node_offset = array('l')
+        self._node_size = array('l')
+        self._node_left = array('l')
+        self._node_right = array('l')
+        self._by_start = array('l')
+        self._by_end = array('l')
+        self._starts2 = [2 * value for value in self.start]
+        self._ends2 = [2 * value for value in self.end]
+        # Les tâches de durée nulle ne sont jamais en cours : elles restent hors de l'arbre
+        tasks = [i for i in range(len(self.names)) if self.end[i] > self.start[i]]
+        tasks.sort(key=lambda i: self.start[i] + self.end[i])
+        self._root = self._build_node(tasks)
+        del self._starts2, self._ends2
+
+    @staticmethod
+    def _cumul(values: array) -> array:
+        prefix = array('q', [0])
+        total = 0
+        for value in values:
+            total += value
+            prefix.append(total)
+        return prefix
+
+    def _build_node(self, tasks: List[int]) -> int:
+        """
+        Construit un nœud de l'arbre d'intervalles et ses descendants
+
+        Args:
+            tasks: Index des tâches du sous-arbre, triés par milieu (début + fin)
+
+        Returns:
+            Le numéro du nœud, ou -1 pour un sous-arbre vide
+        """
+        if not tasks:
+            return -1
+        start, end = self.start, self.end
+        starts2, ends2 = self._starts2, self._ends2
+        # Centre = milieu médian : chaque sous-arbre reçoit au plus la moitié des tâches
+        middle = len(tasks) // 2
+        center = start[tasks[middle]] + end[tasks[middle]]
+        # Avant la médiane, une tâche finit avant le centre ou le contient ; après, elle commence
+        # après le centre ou le contient
+        below, above = tasks[:middle], tasks[middle:]
+        left = [i for i in below if ends2[i] <= center]
+        right = [i for i in above if starts2[i] > center]
+        here = [i for i in below if ends2[i] > center]
+        here.extend(i for i in above if starts2[i] <= center)
+
+        node = len(self._node_center)
+        self._node_center.append(center)
+        self._node_offset.append(len(self._by_start))
+        self._node_size.append(len(here))
+        self._by_start.extend(sorted(here, key=start.__getitem__))
+        self._by_end.extend(sorted(here, key=end.__getitem__, reverse=True))
+        self._node_left.append(-1)
+        self._node_right.append(-1)
+        # Les listes filtrées restent triées par milieu
+        self._node_left[node] = self._build_node(left)
+        self._node_right[node] = self._build_node(right)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _span(self, worker_index: int) -> Tuple[int, int]:
+        return self._offsets[worker_index], self._offsets[worker_index + 1]
+
+    def busy_at(self, t: int) -> List[Tuple[int, str]]:
+        """
+        Retourne les travailleurs occupés à l'instant t (une tâche [début, fin) contient t)
+
+        Returns:
+            Liste de (travailleur, nom de la tâche en cours), par travailleur croissant
+        """
+        if self._root is None:
+            self._build_tree()
+        start, end = self.start, self.end
+        t2 = 2 * t
+        found = []
+        node = self._root
+        while node != -1:
+            offset = self._node_offset[node]
+            stop = offset + self._node_size[node]
+            # Les tâches du nœud contiennent le centre : un seul côté reste à vérifier
+            if t2 < self._node_center[node]:
+                for k in range(offset, stop):
+                    i = self._by_start[k]
+                    if start[i] > t:
+                        break
+                    found.append(i)
+                node = self._node_left[node]
+            else:
+                for k in range(offset, stop):
+                    i = self._by_end[k]
+                    if end[i] <= t:
+                        break
+                    found.append(i)
+                node = self._node_right[node]
+        found.sort(key=self.worker.__getitem__)
+        return [(self.worker[i], self.names[i]) for i in found]
+
+    def idle_windows(self, min_length: int) -> List[Dict]:
+        """Retourne les fenêtres d'inactivité strictement plus longues que min_length"""
+        first = bisect_right(self._idle, (min_length, self.num_workers, self.horizon))
+        return [
+            {'worker': worker_index, 'start': start, 'end': start + length}
+            for length, worker_index, start in self._idle[first:]
+        ]
+
+    def _busy_before(self, worker_index: int, t: int) -> int:
+        """Temps de travail cumulé d'un travailleur sur [0, t]"""
+        low, high = self._span(worker_index)
+        i = bisect_right(self.start, t, low, high) - 1
+        if i < low:
+            return 0
+        busy = self._prefix_busy[worker_index][i - low]
+        return busy + min(t, self.end[i]) - self.start[i]
+
+    def load_between(self, a: int, b: int) -> List[int]:
+        """Temps de travail de chaque travailleur sur l'intervalle [a, b]"""
+        return [
+            self._busy_before(worker_index, b) - self._busy_before(worker_index, a)
+            for worker_index in range(self.num_workers)
+        ]
+
+    def _total_busy_before(self, t: int) -> int:
+        """Temps de travail cumulé de tous les travailleurs sur [0, t]"""
+        if self._load_index is None:
+            self._build_load_index()
+        starts, starts_prefix, ends, ends_prefix = self._load_index
+        started = bisect_right(starts, t)
+        ended = bisect_right(ends, t)
+        return (t * started - starts_prefix[started]) - (t * ended - ends_prefix[ended])
+
+    def total_load_between(self, a: int, b: int) -> int:
+        """Temps de travail total (tous travailleurs confondus) sur l'intervalle [a, b]"""
+        return self._total_busy_before(b) - self._total_busy_before(a)
+
+    def to_columns(self) -> Dict:
+        """Export compact en colonnes, directement sérialisable en JSON"""
+        return {
+            'makespan': self.makespan,
+            'num_workers': self.num_workers,
+            'names': self.names,
+            'worker': self.worker.tolist(),
+            'start': self.start.tolist(),
+            'end': self.end.tolist()
+        }
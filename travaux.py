@@ -0,0 +1,331 @@
+"""
+File de travaux asynchrones pour les résolutions longues
+Soumission, suivi, résultat et annulation, exécutés par un pool de processus dédiés
+
+"""
+
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from algorithms import SCHEDULERS
+
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ECHOUE = "echoue"
+ANNULE = "annule"
+EXPIRE = "expire"
+
+ETATS_FINAUX = (TERMINE, ECHOUE, ANNULE, EXPIRE)
+
+
+class FileSaturee(Exception):
+    """Levée quand la file d'attente a atteint sa capacité"""
+
+
+class Travail:
+    """Un travail de résolution et son cycle de vie"""
+
+    def __init__(self, algorithme: str, tasks: Dict[str, int], num_workers: int,
+                 priorite: int, limite_temps: float):
+        self.id = uuid.uuid4().hex
+        self.algorithme = algorithme
+        self.tasks = tasks
+        self.nombre_taches = len(tasks)
+        self.num_workers = num_workers
+        self.priorite = priorite
+        self.limite_temps = limite_temps
+        self.etat = EN_ATTENTE
+        self.erreur: Optional[str] = None
+        self.soumis_a = time.time()
+        self.debut: Optional[float] = None
+        self.fin: Optional[float] = None
+        self.annulation = threading.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "etat": self.etat,
+            "algorithm": self.algorithme,
+            "nombre_taches": self.nombre_taches,
+            "num_workers": self.num_workers,
+            "priorite": self.priorite,
+            "limite_temps": self.limite_temps,
+            "soumis_a": self.soumis_a,
+            "debut": self.debut,
+            "fin": self.fin,
+            "erreur": self.erreur
+        }
+
+
+class MagasinResultats:
+    """Résultats sérialisés, bornés en taille totale, évincés du plus ancien au plus récent"""
+
+    def __init__(self, taille_max_octets: int):
+        self.taille_max_octets = taille_max_octets
+        self.taille_octets = 0
+        self._resultats: "OrderedDict[str, bytes]" = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def ajouter(self, cle: str, donnees: bytes) -> list:
+        """
+        Stocke un résultat
+
+        Returns:
+            Les clés évincées pour faire de la place
+        """
+        evinces = []
+        with self._verrou:
+            self._resultats[cle] = donnees
+            self.taille_octets += len(donnees)
+            while self.taille_octets > self.taille_max_octets and len(self._resultats) > 1:
+                ancienne, valeur = self._resultats.popitem(last=False)
+                self.taille_octets -= len(valeur)
+                evinces.append(ancienne)
+        return evinces
+
+    def obtenir(self, cle: str) -> Optional[bytes]:
+        with self._verrou:
+            return self._resultats.get(cle)
+
+    def retirer(self, cle: str):
+        with self._verrou:
+            valeur = self._resultats.pop(cle, None)
+            if valeur is not None:
+                self.taille_octets -= len(valeur)
+
+
+def _boucle_ouvrier(connexion):
+    """Boucle d'un processus ouvrier : reçoit (algorithme, tâches, m), renvoie le résultat sérialisé"""
+    while True:
+        try:
+            message = connexion.recv()
+        except EOFError:
+            return  # le processus qui pilote l'ouvrier a disparu
+        if message is None:
+            return
+        algorithme, tasks, num_workers = message
+        try:
+            workers, makespan = SCHEDULERS[algorithme](tasks, num_workers)
+            connexion.send((True, json.dumps({"workers": workers, "makespan": makespan}).encode()))
+        except Exception as e:
+            connexion.send((False, f"{type(e).__name__}: {e}"))
+
+
+class _Ouvrier:
+    """
+    Processus solveur longue durée piloté par un pipe.
+
+    Un travail expiré ou annulé en cours d'exécution tue le processus, qui est
+    aussitôt remplacé : c'est ce qui permet d'imposer une limite de temps.
+    """
+
+    INTERVALLE = 0.05
+
+    def __init__(self, contexte):
+        self._contexte = contexte
+        self._demarrer()
+
+    def _demarrer(self):
+        self.connexion, connexion_fille = self._contexte.Pipe()
+        self.processus = self._contexte.Process(target=_boucle_ouvrier, args=(connexion_fille,), daemon=True)
+        self.processus.start()
+        connexion_fille.close()
+
+    def _redemarrer(self):
+        self.processus.terminate()
+        self.processus.join()
+        self.connexion.close()
+        self._demarrer()
+
+    def executer(self, travail: Travail) -> tuple:
+        """
+        Exécute un travail en respectant sa limite de temps et son annulation
+
+        Returns:
+            Tuple (état final, résultat sérialisé ou message d'erreur)
+        """
+        echeance = time.monotonic() + travail.limite_temps
+        try:
+            self.connexion.send((travail.algorithme, travail.tasks, travail.num_workers))
+            while not self.connexion.poll(self.INTERVALLE):
+                if travail.annulation.is_set():
+                    self._redemarrer()
+                    return ANNULE, None
+                if time.monotonic() >= echeance:
+                    self._redemarrer()
+                    return EXPIRE, f"Limite de temps dépassée ({travail.limite_temps} s)"
+            succes, donnees = self.connexion.recv()
+        except (EOFError, OSError) as e:
+            self._redemarrer()
+            return ECHOUE, f"Processus solveur interrompu: {e}"
+        return (TERMINE, donnees) if succes else (ECHOUE, donnees)
+
+    def arreter(self):
+        try:
+            self.connexion.send(None)
+        except OSError:
+            pass
+        self.processus.join(timeout=1)
+        if self.processus.is_alive():
+            self.processus.terminate()
+
+
+class GestionnaireTravaux:
+    """
+    File de priorité bornée + pool de processus ouvriers.
+
+    Les travaux sont servis par priorité croissante (0 = plus urgent), puis par ordre
+    d'arrivée. Une soumission au-delà de capacite_file lève FileSaturee. Les résultats
+    sont gardés dans un MagasinResultats borné ; l'historique des travaux terminés est
+    limité à max_historique entrées.
+    """
+
+    def __init__(self, processus: int = 2, capacite_file: int = 100,
+                 taille_max_resultats: int = 64 * 1024 * 1024,
+                 limite_temps_defaut: float = 60.0, limite_temps_max: float = 600.0,
+                 max_historique: int = 10000):
+        self.capacite_file = capacite_file
+        self.limite_temps_defaut = limite_temps_defaut
+        self.limite_temps_max = limite_temps_max
+        self.max_historique = max_historique
+        self.pid = os.getpid()
+        self.resultats = MagasinResultats(taille_max_resultats)
+
+        self._file = []
+        self._sequence = itertools.count()
+        self._travaux: "OrderedDict[str, Travail]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._arret = False
+
+        methodes = multiprocessing.get_all_start_methods()
+        # forkserver évite de forker un processus web multi-thread
+        contexte = multiprocessing.get_context("forkserver" if "forkserver" in methodes else "spawn")
+        self._ouvriers = [_Ouvrier(contexte) for _ in range(processus)]
+        self._threads = [
+            threading.Thread(target=self._servir, args=(ouvrier,), daemon=True)
+            for ouvrier in self._ouvriers
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def soumettre(self, algorithme: str, tasks: Dict[str, int], num_workers: int,
+                  priorite: int = 5, limite_temps: float = None) -> Travail:
+        """Met un travail en file ; lève FileSaturee si la file est pleine"""
+        if algorithme not in SCHEDULERS:
+            raise ValueError(f"Algorithme non valide: {algorithme}")
+
+        limite = min(limite_temps or self.limite_temps_defaut, self.limite_temps_max)
+        travail = Travail(algorithme, tasks, num_workers, priorite, limite)
+
+        with self._condition:
+            if len(self._file) >= self.capacite_file:
+                raise FileSaturee(f"File pleine ({self.capacite_file} travaux en attente)")
+            self._travaux[travail.id] = travail
+            heapq.heappush(self._file, (priorite, next(self._sequence), travail.id))
+            self._condition.notify()
+
+        return travail
+
+    def obtenir(self, travail_id: str) -> Optional[Travail]:
+        with self._condition:
+            return self._travaux.get(travail_id)
+
+    def position(self, travail_id: str) -> Optional[int]:
+        """Rang du travail dans la file d'attente (0 = prochain servi), ou None"""
+        with self._condition:
+            entrees = sorted(self._file)
+        for rang, (_, _, identifiant) in enumerate(entrees):
+            if identifiant == travail_id:
+                return rang
+        return None
+
+    def annuler(self, travail_id: str) -> Optional[Travail]:
+        """
+        Annule un travail (sans effet s'il est déjà terminé)
+
+        Un travail en attente est retiré de la file immédiatement ; un travail en cours
+        passe à l'état annulé dès que son processus solveur a été arrêté.
+        """
+        with self._condition:
+            travail = self._travaux.get(travail_id)
+            if travail is None or travail.etat in ETATS_FINAUX:
+                return travail
+            travail.annulation.set()
+            if travail.etat == EN_ATTENTE:
+                self._file = [e for e in self._file if e[2] != travail_id]
+                heapq.heapify(self._file)
+                self._terminer(travail, ANNULE, None)
+        return travail
+
+    def resultat(self, travail_id: str) -> Optional[bytes]:
+        return self.resultats.obtenir(travail_id)
+
+    def _terminer(self, travail: Travail, etat: str, donnees):
+        """Enregistre l'issue d'un travail (appelé avec self._condition acquis)"""
+        travail.etat = etat
+        travail.fin = time.time()
+        travail.tasks = None  # libère la mémoire des tâches
+
+        if etat == TERMINE:
+            for evince in self.resultats.ajouter(travail.id, donnees):
+                self._travaux.pop(evince, None)
+        elif donnees is not None:
+            travail.erreur = donnees
+
+        # Historique borné : on oublie les plus anciens travaux terminés
+        while len(self._travaux) > self.max_historique:
+            ancien_id, ancien = next(iter(self._travaux.items()))
+            if ancien.etat not in ETATS_FINAUX:
+                break
+            self._travaux.popitem(last=False)
+            self.resultats.retirer(ancien_id)
+
+    def _servir(self, ouvrier: _Ouvrier):
+        while True:
+            with self._condition:
+                while not self._file and not self._arret:
+                    self._condition.wait()
+                if self._arret:
+                    return
+                _, _, travail_id = heapq.heappop(self._file)
+                travail = self._travaux.get(travail_id)
+                if travail is None or travail.etat != EN_ATTENTE:
+                    continue
+                travail.etat = EN_COURS
+                travail.debut = time.time()
+
+            etat, donnees = ouvrier.executer(travail)
+
+            with self._condition:
+                self._terminer(travail, etat, donnees)
+
+    def statistiques(self) -> Dict:
+        with self._condition:
+            etats = {}
+            for travail in self._travaux.values():
+                etats[travail.etat] = etats.get(travail.etat, 0) + 1
+            return {
+                "en_file": len(self._file),
+                "capacite_file": self.capacite_file,
+                "ouvriers": len(self._ouvriers),
+                "etats": etats,
+                "resultats_octets": self.resultats.taille_octets
+            }
+
+    def arreter(self):
+        """Arrête les threads de service et les processus ouvriers"""
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+        for ouvrier in self._ouvriers:
+            ouvrier.arreter()
@@ -8,6 +8,8 @@ import json
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+from statistiques import calculer_statistiques
+
 
 @dataclass
 class ResultatValidation:
@@ -107,11 +109,11 @@ class InstanceValidator:
         
         # Vérifier la cohérence globale
         if not erreurs and isinstance(plats, list) and isinstance(nombre_commis, int):
-            coherence_warnings = self._verifier_coherence(plats, nombre_commis)
-            avertissements.extend(coherence_warnings)
-            
-            # Calculer les statistiques
+            # Calculer les statistiques (une fois, partagées avec la vérification de cohérence)
             statistiques = self._calculer_statistiques(plats, nombre_commis)
+            
+            coherence_warnings = self._verifier_coherence(plats, nombre_commis, statistiques)
+            avertissements.extend(coherence_warnings)
         
         valide = len(erreurs) == 0
         
@@ -156,13 +158,14 @@ class InstanceValidator:
         
         return erreurs
     
-    def _verifier_coherence(self, plats: List[Dict], nombre_commis: int) -> List[str]:
+    def _verifier_coherence(self, plats: List[Dict], nombre_commis: int, stats: Dict) -> List[str]:
         """
         Vérifie la cohérence globale de l'instance
         
         Args:
             plats: Liste des plats
             nombre_commis: Nombre de commis
+            stats: Statistiques de l'instance (voir calculer_statistiques)
         
         Returns:
             Liste des avertissements
@@ -178,15 +181,11 @@ class InstanceValidator:
             avertissements.append("Tous les plats ont des temps nuls - instance triviale")
         
         # Vérifier l'équilibre charge/commis
-        temps_totaux = [
-            plat.get("temps_epluchage", 0) + plat.get("temps_cuisson", 0)
-            for plat in plats
-        ]
-        temps_total = sum(temps_totaux)
+        temps_total = stats["temps_total_travail"]
         
         if temps_total > 0:
-            charge_moyenne = temps_total / nombre_commis
-            temps_max = max(temps_totaux)
+            charge_moyenne = stats["charge_theorique_par_commis"]
+            temps_max = stats["temps_max_plat"]
             
             if temps_max > charge_moyenne * 2:
                 avertissements.append(
@@ -220,24 +219,8 @@ class InstanceValidator:
         Returns:
             Dictionnaire de statistiques
         """
-        temps_epluchage = [plat.get("temps_epluchage", 0) for plat in plats]
-        temps_cuisson = [plat.get("temps_cuisson", 0) for plat in plats]
-        temps_totaux = [e + c for e, c in zip(temps_epluchage, temps_cuisson)]
-        
-        temps_total = sum(temps_totaux)
-        
-        stats = {
-            "nombre_plats": len(plats),
-            "nombre_commis": nombre_commis,
-            "temps_total_travail": temps_total,
-            "temps_total_epluchage": sum(temps_epluchage),
-            "temps_total_cuisson": sum(temps_cuisson),
-            "temps_moyen_par_plat": temps_total / len(plats) if plats else 0,
-            "temps_max_plat": max(temps_totaux) if temps_totaux else 0,
-            "temps_min_plat": min(temps_totaux) if temps_totaux else 0,
-            "charge_theorique_par_commis": temps_total / nombre_commis if nombre_commis > 0 else 0,
-            "ratio_plats_commis": len(plats) / nombre_commis if nombre_commis > 0 else 0
-        }
+        stats = dict(calculer_statistiques(plats, nombre_commis))
+        temps_total = stats["temps_total_travail"]
         
         # Formater les temps en minutes pour lisibilité
         stats["temps_total_travail_minutes"] = f"{temps_total / 60:.1f} min"